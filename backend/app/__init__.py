@@ -1,2 +1,8 @@
 """YogaFlow Backend API Application."""
+import time
+
 __version__ = "1.0.0"
+
+# Reference point for app.main's startup profile: the package is imported
+# before any of app.main's own imports run
+IMPORT_STARTED_NS = time.perf_counter_ns()
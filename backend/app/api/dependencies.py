@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_database_session
+from app.core.database import get_database_session, get_read_only_session, get_unit_of_work_session
 from app.services.auth_service import get_current_user
 from app.models.user import User
 
@@ -15,32 +15,24 @@ security = HTTPBearer()
 
 # Type aliases for cleaner dependency injection
 DatabaseSession = Annotated[AsyncSession, Depends(get_database_session)]
+ReadOnlyDatabaseSession = Annotated[AsyncSession, Depends(get_read_only_session, scope="function")]
+UnitOfWorkSession = Annotated[AsyncSession, Depends(get_unit_of_work_session, scope="function")]
 
 
-async def get_current_active_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db_session: DatabaseSession
-) -> User:
+async def authenticate_user(token: str, db_session: AsyncSession) -> User:
     """
-    Dependency to get current authenticated user.
+    Resolve the active user for a bearer token.
 
     Args:
-        credentials: HTTP Bearer token credentials
-        db_session: Database session
+        token: JWT access token
+        db_session: Session used to load the user
 
     Returns:
-        User: Current authenticated user
+        User: Authenticated user
 
     Raises:
         HTTPException: If authentication fails or token is blacklisted
-
-    Example:
-        @app.get("/profile")
-        async def get_profile(current_user: User = Depends(get_current_active_user)):
-            return current_user
     """
-    token = credentials.credentials
-
     # Check if token is blacklisted (logout/revoked)
     from app.services.token_blacklist import token_blacklist
     if await token_blacklist.is_blacklisted(token):
@@ -62,8 +54,58 @@ async def get_current_active_user(
     return user
 
 
+async def get_current_active_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db_session: DatabaseSession
+) -> User:
+    """
+    Dependency to get current authenticated user.
+
+    Args:
+        credentials: HTTP Bearer token credentials
+        db_session: Database session
+
+    Returns:
+        User: Current authenticated user
+
+    Raises:
+        HTTPException: If authentication fails or token is blacklisted
+
+    Example:
+        @app.get("/profile")
+        async def get_profile(current_user: User = Depends(get_current_active_user)):
+            return current_user
+    """
+    return await authenticate_user(credentials.credentials, db_session)
+
+
+async def get_read_only_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db_session: ReadOnlyDatabaseSession
+) -> User:
+    """
+    Dependency to get current authenticated user for read-only endpoints.
+
+    Loads the user on the request's read-only session, so an endpoint that
+    also declares ReadOnlyDatabaseSession uses a single session (and one
+    pool checkout) for authentication and its own queries.
+
+    Args:
+        credentials: HTTP Bearer token credentials
+        db_session: Read-only database session shared with the endpoint
+
+    Returns:
+        User: Current authenticated user (do not modify it)
+
+    Raises:
+        HTTPException: If authentication fails or token is blacklisted
+    """
+    return await authenticate_user(credentials.credentials, db_session)
+
+
 # Type alias for current user dependency
 CurrentUser = Annotated[User, Depends(get_current_active_user)]
+ReadOnlyCurrentUser = Annotated[User, Depends(get_read_only_current_user)]
 
 
 async def get_admin_user(current_user: CurrentUser) -> User:
@@ -0,0 +1,159 @@
+"""
+Custom response classes for YogaFlow API routes.
+"""
+import re
+from typing import Callable, Iterator, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# ASGI extension for handing an open file to the server for sendfile()
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the body."""
+    pass
+
+
+class MediaFileResponse(FileResponse):
+    """
+    FileResponse tuned for large media files.
+
+    When the server supports the ASGI zero-copy send extension, full and
+    single-range bodies are handed to the server as an open file and
+    offset, so it can use sendfile() instead of copying through Python.
+    Otherwise the file is streamed in larger chunks than the default,
+    which suits audio seeking (one Range request per seek).
+
+    Only the body transfer differs from FileResponse; range parsing,
+    If-Range and multi-range responses are inherited.
+    """
+
+    chunk_size = 256 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _send_zerocopy(self, send: Send, offset: int, count: int) -> None:
+        file_object = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            await send({
+                "type": ZEROCOPY_EXTENSION,
+                "file": file_object,
+                "offset": offset,
+                "count": count,
+                "more_body": False,
+            })
+        finally:
+            file_object.close()
+
+    async def _handle_simple(self, send: Send, send_header_only: bool, send_pathsend: bool) -> None:
+        if not self._zerocopy or send_header_only or send_pathsend:
+            return await super()._handle_simple(send, send_header_only, send_pathsend)
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._send_zerocopy(send, 0, int(self.headers["content-length"]))
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not self._zerocopy or send_header_only:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+
+        headers = MutableHeaders(raw=list(self.raw_headers))
+        headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": headers.raw})
+        await self._send_zerocopy(send, start, end - start)
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range Range header.
+
+    Multiple ranges and malformed headers are ignored (the full body is
+    served), as RFC 9110 allows.
+
+    Args:
+        range_header: Range header value
+        size: Body size in bytes
+
+    Returns:
+        Optional[tuple[int, int]]: (start, end) with end exclusive, or None
+            to serve the full body
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the body
+    """
+    match = _BYTE_RANGE.match(range_header.strip()) if range_header else None
+    if match is None or match[1] == match[2] == "":
+        return None
+    if match[1] == "":
+        # Suffix range: the last N bytes
+        length = int(match[2])
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size
+    start = int(match[1])
+    end = min(int(match[2]) + 1, size) if match[2] else size
+    if start >= size or end <= start:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def ranged_stream_response(
+    request_headers: Headers,
+    method: str,
+    size: int,
+    iter_range: Callable[[int, int], Iterator[bytes]],
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """
+    Stream a body generated on the fly, with single-range support.
+
+    For bodies that are assembled while sending (so there is no file for
+    FileResponse) but whose size and bytes are deterministic. Full
+    responses use chunked transfer encoding; range responses carry
+    Content-Range and Content-Length. If-Range is honored against the
+    ETag in `headers`.
+
+    Args:
+        request_headers: Request headers
+        method: Request method; HEAD responses have no body
+        size: Total body size in bytes
+        iter_range: Yields the bytes of [start, end) in chunks (may block;
+            it is iterated in a thread)
+        media_type: Content type
+        headers: Extra response headers (ETag, Cache-Control, ...)
+
+    Returns:
+        Response: 200, 206 or 416 response
+    """
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    byte_range = None
+    if_range = request_headers.get("if-range")
+    if if_range is None or if_range == headers.get("ETag"):
+        try:
+            byte_range = parse_byte_range(request_headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        status_code, start, end = 200, 0, size
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+        headers["Content-Length"] = str(end - start)
+
+    if method == "HEAD":
+        headers.setdefault("Content-Length", str(end - start))
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(iter_range(start, end), status_code=status_code, headers=headers, media_type=media_type)
@@ -0,0 +1,51 @@
+"""
+Custom route classes for YogaFlow API routers.
+"""
+from typing import AsyncGenerator, Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+
+def body_size_limited_route(max_body_size: int) -> type[APIRoute]:
+    """
+    Build a route class that rejects request bodies over `max_body_size`.
+
+    The limit is checked against Content-Length before anything is read,
+    and again as body chunks arrive, so an oversized upload is cut off
+    with 413 instead of being spooled to disk by the multipart parser.
+
+    Args:
+        max_body_size: Maximum request body size in bytes
+
+    Returns:
+        type[APIRoute]: Route class for APIRouter(route_class=...)
+    """
+    def too_large() -> HTTPException:
+        return HTTPException(
+            status_code=413,  # Content Too Large
+            detail=f"Request body too large. Maximum size: {max_body_size} bytes"
+        )
+
+    class SizeLimitedRequest(Request):
+        async def stream(self) -> AsyncGenerator[bytes, None]:
+            received = 0
+            async for chunk in super().stream():
+                received += len(chunk)
+                if received > max_body_size:
+                    raise too_large()
+                yield chunk
+
+    class BodySizeLimitedRoute(APIRoute):
+        def get_route_handler(self) -> Callable[[Request], Response]:
+            handler = super().get_route_handler()
+
+            async def limited_handler(request: Request) -> Response:
+                content_length = request.headers.get("content-length")
+                if content_length and content_length.isdigit() and int(content_length) > max_body_size:
+                    raise too_large()
+                return await handler(SizeLimitedRequest(request.scope, request.receive))
+
+            return limited_handler
+
+    return BodySizeLimitedRoute
@@ -16,6 +16,7 @@ from app.models.sequence import Sequence, SequencePose
 from app.models.pose import Pose
 from app.api.dependencies import DatabaseSession, AdminUser
 from app.core.logging_config import logger
+from app.services.catalog_cache import SEQUENCE_CATEGORIES, catalog_cache
 
 router = APIRouter(prefix="/admin/sequences", tags=["Admin - Sequences"])
 
@@ -88,6 +89,7 @@ async def create_sequence(
         db_session.add(sequence_pose)
 
     await db_session.commit()
+    catalog_cache.invalidate(SEQUENCE_CATEGORIES)
 
     # Reload with poses
     query = (
@@ -221,6 +223,7 @@ async def update_sequence(
             db_session.add(sequence_pose)
 
     await db_session.commit()
+    catalog_cache.invalidate(SEQUENCE_CATEGORIES)
 
     # Reload with poses
     query = (
@@ -307,6 +310,7 @@ async def delete_sequence(
     sequence_name = sequence.name
     await db_session.delete(sequence)
     await db_session.commit()
+    catalog_cache.invalidate(SEQUENCE_CATEGORIES)
 
     logger.info(
         "Sequence deleted by admin",
@@ -22,7 +22,7 @@ from app.services.auth_service import (
     request_password_reset,
     reset_password,
 )
-from app.api.dependencies import DatabaseSession, CurrentUser
+from app.api.dependencies import DatabaseSession, CurrentUser, ReadOnlyCurrentUser
 from app.core.logging_config import log_auth_event
 from app.core.rate_limit import auth_rate_limit, limiter
 
@@ -157,7 +157,7 @@ async def logout(
     summary="Get current user",
     description="Get profile information for authenticated user"
 )
-async def get_me(current_user: CurrentUser) -> UserResponse:
+async def get_me(current_user: ReadOnlyCurrentUser) -> UserResponse:
     """
     Get current user profile information.
 
@@ -20,7 +20,7 @@ from app.schemas.practice_history import (
 )
 from app.models.practice_session import PracticeSession, CompletionStatus
 from app.models.sequence import Sequence
-from app.api.dependencies import DatabaseSession, CurrentUser
+from app.api.dependencies import ReadOnlyCurrentUser, ReadOnlyDatabaseSession
 from app.services.practice_history import PracticeHistoryService
 from app.core.logging_config import logger
 from app.core.rate_limit import authenticated_rate_limit
@@ -38,8 +38,8 @@ router = APIRouter(tags=["Practice History"])
 @authenticated_rate_limit
 async def get_history(
     request: Request,
-    current_user: CurrentUser,
-    db_session: DatabaseSession,
+    current_user: ReadOnlyCurrentUser,
+    db_session: ReadOnlyDatabaseSession,
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page (max 100)"),
     status_filter: Optional[CompletionStatus] = Query(None, alias="status", description="Filter by completion status"),
@@ -132,8 +132,8 @@ async def get_history(
 @authenticated_rate_limit
 async def get_stats(
     request: Request,
-    current_user: CurrentUser,
-    db_session: DatabaseSession,
+    current_user: ReadOnlyCurrentUser,
+    db_session: ReadOnlyDatabaseSession,
 ) -> PracticeStatisticsResponse:
     """
     Get comprehensive practice statistics.
@@ -179,8 +179,8 @@ async def get_stats(
 @authenticated_rate_limit
 async def get_calendar(
     request: Request,
-    current_user: CurrentUser,
-    db_session: DatabaseSession,
+    current_user: ReadOnlyCurrentUser,
+    db_session: ReadOnlyDatabaseSession,
     start_date: Optional[datetime] = Query(None, description="Start date for calendar range"),
     end_date: Optional[datetime] = Query(None, description="End date for calendar range"),
 ) -> CalendarResponse:
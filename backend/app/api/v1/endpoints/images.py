@@ -0,0 +1,77 @@
+"""
+Image resizing endpoint for YogaFlow.
+Serves resized variants of content images, a local alternative to a CDN resizer.
+"""
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+
+from app.api.v1.endpoints.media import etag_matches
+from app.core.rate_limit import public_rate_limit
+from app.services.cdn_service import cdn_service
+from app.services.image_resize import (
+    MEDIA_TYPES,
+    ImageResizeError,
+    SourceImageNotFound,
+    get_resized_image,
+)
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+
+@router.get(
+    "/resize/{path:path}",
+    response_class=Response,
+    summary="Get resized image",
+    description="Scale a content image to fit w x h and re-encode it"
+)
+@public_rate_limit
+async def resize_image(
+    request: Request,
+    path: str,
+    w: Optional[int] = Query(None, description="Maximum width in pixels"),
+    h: Optional[int] = Query(None, description="Maximum height in pixels"),
+    fmt: str = Query("jpeg", description="Output format: avif, webp or jpeg"),
+    q: Optional[int] = Query(None, description="Encoder quality, 30-95"),
+) -> Response:
+    """
+    Get a resized variant of an image under content/images.
+
+    The first request encodes the variant in the image process pool and
+    stores it in the disk cache; later requests are served from the cache.
+    w and h are rounded up to the configured derivative widths and q to a
+    multiple of 5. The URL does not change when the source image does, so
+    responses must revalidate; the ETag changes with the source.
+
+    Args:
+        path: Image path relative to content/images
+        w: Maximum width in pixels
+        h: Maximum height in pixels
+        fmt: Output format
+        q: Encoder quality (default per format)
+
+    Returns the encoded image, or 304 if the client's copy is current.
+    """
+    try:
+        name, content = await get_resized_image(path, w, h, fmt, q)
+    except SourceImageNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    except ImageResizeError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(error)
+        )
+
+    headers = {
+        "Cache-Control": cdn_service.get_cache_control_header("revalidate"),
+        "ETag": f'"{Path(name).stem}"',
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    # Served from memory: the cache file can be evicted at any time, and
+    # variants are small (at most the largest derivative width)
+    return Response(content=content, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,131 @@
+"""
+Media serving endpoints for YogaFlow.
+Serves content images, audio and video with range requests, strong ETags and
+long-lived caching for content-hashed URLs.
+"""
+import os
+import stat
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.api.responses import MediaFileResponse
+from app.core.config import settings
+from app.services.asset_manifest import asset_manifest
+from app.services.cdn_service import cdn_service
+
+router = APIRouter(tags=["Media"])
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (and doesn't set q=0)."""
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+async def _stat_file(path: Path) -> Optional[os.stat_result]:
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+async def serve_media(request: Request, directory: str, path: str, asset_type: str) -> Response:
+    """
+    Serve a file from a content media directory.
+
+    Content-hashed paths (see AssetManifest.resolve) whose file still
+    matches the manifest are served with the asset type's immutable
+    Cache-Control; plain paths must revalidate,
+    which is cheap with the manifest's SHA-256 ETags. A precompressed
+    .gz variant is served when the manifest lists one and the client
+    accepts gzip.
+
+    Args:
+        request: Incoming request
+        directory: Content subdirectory ('images', 'audio' or 'videos')
+        path: Requested path within the directory
+        asset_type: Asset type for CDNService.get_cache_control_header
+
+    Returns:
+        Response: File, partial content or 304 response
+    """
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="File not found"
+    )
+    # Dotfiles (.audio-cache.json, .tts-journal*.jsonl, ...) are internal
+    if any(segment.startswith(".") for segment in path.split("/")):
+        raise not_found
+
+    logical_path, hashed = asset_manifest.resolve(f"{directory}/{path}")
+    base = (Path(settings.content_directory) / directory).resolve()
+    file_path = (Path(settings.content_directory) / logical_path).resolve()
+    stat_result = await _stat_file(file_path) if file_path.is_relative_to(base) else None
+    if stat_result is None:
+        raise not_found
+
+    # A file changed since the manifest was built no longer has the
+    # content its hashed URL names, so it must not be cached as immutable
+    entry = asset_manifest.entry(logical_path, stat_result)
+    hashed = hashed and entry is not None
+    headers = {
+        "Cache-Control": cdn_service.get_cache_control_header(asset_type if hashed else "revalidate"),
+    }
+    serve_path, serve_stat = file_path, stat_result
+    if entry is not None:
+        etag_suffix = ""
+        if entry["encodings"]:
+            headers["Vary"] = "Accept-Encoding"
+            gzip_path = file_path.with_name(f"{file_path.name}.gz")
+            gzip_stat = await _stat_file(gzip_path) if "gzip" in entry["encodings"] else None
+            if gzip_stat is not None and accepts_gzip(request.headers.get("accept-encoding", "")):
+                serve_path, serve_stat = gzip_path, gzip_stat
+                headers["Content-Encoding"] = "gzip"
+                etag_suffix = "-gzip"
+        headers["ETag"] = f'"{entry["sha256"][:32]}{etag_suffix}"'
+
+    response = MediaFileResponse(
+        serve_path,
+        headers=headers,
+        media_type=guess_type(logical_path)[0],
+        stat_result=serve_stat,
+    )
+    if etag_matches(request.headers.get("if-none-match"), response.headers["etag"]):
+        not_modified = {**headers, "ETag": response.headers["etag"]}
+        not_modified.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=not_modified)
+    return response
+
+
+@router.api_route("/images/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_image(request: Request, path: str) -> Response:
+    """Serve a content image."""
+    return await serve_media(request, "images", path, "image")
+
+
+@router.api_route("/audio/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_audio(request: Request, path: str) -> Response:
+    """Serve a content audio file (supports Range requests for seeking)."""
+    return await serve_media(request, "audio", path, "audio")
+
+
+@router.api_route("/videos/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_video(request: Request, path: str) -> Response:
+    """Serve a content video file."""
+    return await serve_media(request, "videos", path, "video")
@@ -4,7 +4,7 @@ Handles CRUD operations, search, and filtering for yoga poses.
 """
 from typing import Optional
 from fastapi import APIRouter, status, HTTPException, Query, Request, Response
-from sqlalchemy import select, or_, func
+from sqlalchemy import Select, select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.pose import (
@@ -14,13 +14,59 @@ from app.schemas.pose import (
     PoseListResponse,
 )
 from app.models.pose import Pose, PoseCategory, DifficultyLevel
-from app.api.dependencies import DatabaseSession, AdminUser
+from app.api.dependencies import AdminUser, ReadOnlyDatabaseSession, UnitOfWorkSession
 from app.core.logging_config import logger
 from app.core.rate_limit import public_rate_limit, authenticated_rate_limit
 
 router = APIRouter(prefix="/poses", tags=["Poses"])
 
 
+def build_pose_list_query(
+    search: Optional[str] = None,
+    category: Optional[PoseCategory] = None,
+    difficulty: Optional[DifficultyLevel] = None,
+    target_area: Optional[str] = None,
+) -> Select:
+    """
+    Build the filtered pose query used by the list endpoint.
+
+    Args:
+        search: Substring of the English or Sanskrit name
+        category: Pose category
+        difficulty: Difficulty level
+        target_area: Target body area
+
+    Returns:
+        Select: Query without pagination or ordering
+    """
+    query = select(Pose)
+
+    # Apply search filter
+    if search:
+        search_pattern = f"%{search}%"
+        query = query.where(
+            or_(
+                Pose.name_english.ilike(search_pattern),
+                Pose.name_sanskrit.ilike(search_pattern)
+            )
+        )
+
+    # Apply category filter
+    if category:
+        query = query.where(Pose.category == category)
+
+    # Apply difficulty filter
+    if difficulty:
+        query = query.where(Pose.difficulty_level == difficulty)
+
+    # Apply target area filter
+    if target_area:
+        # JSON contains query for target_areas array
+        query = query.where(Pose.target_areas.contains([target_area]))
+
+    return query
+
+
 @router.get(
     "",
     response_model=PoseListResponse,
@@ -32,7 +78,7 @@ router = APIRouter(prefix="/poses", tags=["Poses"])
 async def list_poses(
     request: Request,
     response: Response,
-    db_session: DatabaseSession,
+    db_session: ReadOnlyDatabaseSession,
     page: Optional[int] = Query(None, ge=1, description="Page number (starts at 1) - for page-based pagination"),
     page_size: Optional[int] = Query(None, ge=1, le=100, description="Number of items per page (max 100) - for page-based pagination"),
     offset: Optional[int] = Query(None, ge=0, description="Number of items to skip - for offset-based pagination (infinite scroll)"),
@@ -76,31 +122,7 @@ async def list_poses(
         pagination_offset = (current_page - 1) * current_page_size
         pagination_limit = current_page_size
 
-    # Build query
-    query = select(Pose)
-
-    # Apply search filter
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Pose.name_english.ilike(search_pattern),
-                Pose.name_sanskrit.ilike(search_pattern)
-            )
-        )
-
-    # Apply category filter
-    if category:
-        query = query.where(Pose.category == category)
-
-    # Apply difficulty filter
-    if difficulty:
-        query = query.where(Pose.difficulty_level == difficulty)
-
-    # Apply target area filter
-    if target_area:
-        # JSON contains query for target_areas array
-        query = query.where(Pose.target_areas.contains([target_area]))
+    query = build_pose_list_query(search, category, difficulty, target_area)
 
     # Get total count
     count_query = select(func.count()).select_from(query.subquery())
@@ -131,10 +153,12 @@ async def list_poses(
         page=current_page,
         page_size=current_page_size,
         filters={
-            "search": search,
-            "category": category.value if category else None,
-            "difficulty": difficulty.value if difficulty else None,
-            "target_area": target_area
+            name: value for name, value in (
+                ("search", search),
+                ("category", category.value if category else None),
+                ("difficulty", difficulty.value if difficulty else None),
+                ("target_area", target_area),
+            ) if value is not None
         }
     )
 
@@ -161,7 +185,7 @@ async def list_poses(
 async def get_pose(
     request: Request,
     pose_id: int,
-    db_session: DatabaseSession
+    db_session: ReadOnlyDatabaseSession
 ) -> PoseResponse:
     """
     Get detailed information about a specific pose.
@@ -202,7 +226,7 @@ async def get_pose(
 async def get_related_poses(
     request: Request,
     pose_id: int,
-    db_session: DatabaseSession
+    db_session: ReadOnlyDatabaseSession
 ) -> dict:
     """
     Get related poses for a specific pose.
@@ -301,7 +325,7 @@ async def get_related_poses(
 async def create_pose(
     request: Request,
     pose_data: PoseCreate,
-    db_session: DatabaseSession,
+    db_session: UnitOfWorkSession,
     admin_user: AdminUser
 ) -> PoseResponse:
     """
@@ -336,7 +360,7 @@ async def create_pose(
     )
 
     db_session.add(new_pose)
-    await db_session.commit()
+    await db_session.flush()
     await db_session.refresh(new_pose)
 
     logger.info(
@@ -361,7 +385,7 @@ async def update_pose(
     request: Request,
     pose_id: int,
     pose_data: PoseUpdate,
-    db_session: DatabaseSession,
+    db_session: UnitOfWorkSession,
     admin_user: AdminUser
 ) -> PoseResponse:
     """
@@ -387,7 +411,7 @@ async def update_pose(
     for field, value in update_data.items():
         setattr(pose, field, value)
 
-    await db_session.commit()
+    await db_session.flush()
     await db_session.refresh(pose)
 
     logger.info(
@@ -411,7 +435,7 @@ async def update_pose(
 async def delete_pose(
     request: Request,
     pose_id: int,
-    db_session: DatabaseSession,
+    db_session: UnitOfWorkSession,
     admin_user: AdminUser
 ) -> None:
     """
@@ -435,7 +459,7 @@ async def delete_pose(
 
     pose_name = pose.name_english
     await db_session.delete(pose)
-    await db_session.commit()
+    await db_session.flush()
 
     logger.info(
         "Pose deleted",
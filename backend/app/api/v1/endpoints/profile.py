@@ -7,9 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.schemas.user import UserResponse, UserUpdate, PasswordChange
-from app.api.dependencies import DatabaseSession, CurrentUser
+from app.api.dependencies import DatabaseSession, CurrentUser, ReadOnlyCurrentUser
 from app.models.user import User, ExperienceLevel
-from app.core.security import verify_password, hash_password, validate_password_strength
+from app.core.security import verify_password_async, hash_password_async, validate_password_strength
 from app.core.logging_config import logger
 from app.core.rate_limit import authenticated_rate_limit, auth_rate_limit
 
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/profile", tags=["Profile"])
     description="Get current user's profile information"
 )
 @authenticated_rate_limit
-async def get_profile(request: Request, current_user: CurrentUser) -> UserResponse:
+async def get_profile(request: Request, current_user: ReadOnlyCurrentUser) -> UserResponse:
     """
     Get current user profile information.
 
@@ -154,7 +154,7 @@ async def change_password(
     Returns success message on completion.
     """
     # Verify current password
-    if not verify_password(password_change.current_password, current_user.password_hash):
+    if not await verify_password_async(password_change.current_password, current_user.password_hash):
         logger.warning(
             f"Password change failed - incorrect current password",
             extra={"user_id": current_user.user_id, "email": current_user.email}
@@ -177,7 +177,7 @@ async def change_password(
         )
 
     # Update password
-    current_user.password_hash = hash_password(password_change.new_password)
+    current_user.password_hash = await hash_password_async(password_change.new_password)
     await db_session.commit()
 
     logger.info(f"Password changed successfully for user: {current_user.email}")
@@ -3,8 +3,10 @@ Sequence API endpoints for YogaFlow.
 Handles CRUD operations, search, and filtering for practice sequences.
 """
 from typing import Optional
-from fastapi import APIRouter, status, HTTPException, Query, Request
-from sqlalchemy import select, func, or_
+
+import anyio
+from fastapi import APIRouter, status, HTTPException, Query, Request, Response
+from sqlalchemy import Select, select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -19,13 +21,121 @@ from app.schemas.sequence import (
 )
 from app.models.sequence import Sequence, SequencePose, FocusArea, YogaStyle
 from app.models.pose import DifficultyLevel
-from app.api.dependencies import DatabaseSession
+from app.api.dependencies import ReadOnlyDatabaseSession
+from app.api.responses import ranged_stream_response
+from app.api.v1.endpoints.media import etag_matches
 from app.core.logging_config import logger
 from app.core.rate_limit import public_rate_limit
+from app.services.catalog_cache import SEQUENCE_CATEGORIES, catalog_cache
+from app.services.cdn_service import cdn_service
+from app.services.tts import DEFAULT_VOICE, VOICES, MissingClipsError
+from app.services.tts.assembly import sequence_assembler, sequence_script_fields, sequence_segments
+from app.services.tts.mp3 import MP3FormatError
 
 router = APIRouter(prefix="/sequences", tags=["Sequences"])
 
 
+def build_sequence_list_query(
+    search: Optional[str] = None,
+    difficulty: Optional[DifficultyLevel] = None,
+    focus_area: Optional[FocusArea] = None,
+    style: Optional[YogaStyle] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    preset_only: Optional[bool] = None,
+) -> Select:
+    """
+    Build the filtered (Sequence, pose_count) query used by the list endpoint.
+
+    Args:
+        search: Substring of the sequence name
+        difficulty: Difficulty level
+        focus_area: Focus area
+        style: Yoga style
+        min_duration: Minimum duration in minutes
+        max_duration: Maximum duration in minutes
+        preset_only: Only preset (True) or only user-created (False) sequences
+
+    Returns:
+        Select: Query without pagination or ordering
+    """
+    query = select(
+        Sequence,
+        func.count(SequencePose.sequence_pose_id).label("pose_count")
+    ).outerjoin(SequencePose).group_by(Sequence.sequence_id)
+
+    # Apply search filter
+    if search:
+        search_pattern = f"%{search}%"
+        query = query.where(Sequence.name.ilike(search_pattern))
+
+    # Apply difficulty filter
+    if difficulty:
+        query = query.where(Sequence.difficulty_level == difficulty)
+
+    # Apply focus area filter
+    if focus_area:
+        query = query.where(Sequence.focus_area == focus_area)
+
+    # Apply style filter
+    if style:
+        query = query.where(Sequence.style == style)
+
+    # Apply duration filters
+    if min_duration:
+        query = query.where(Sequence.duration_minutes >= min_duration)
+    if max_duration:
+        query = query.where(Sequence.duration_minutes <= max_duration)
+
+    # Apply preset filter
+    if preset_only is not None:
+        query = query.where(Sequence.is_preset == preset_only)
+
+    return query
+
+
+def build_sequence_response(sequence: Sequence) -> SequenceResponse:
+    """
+    Build the detail response for a sequence with its poses loaded.
+
+    Args:
+        sequence: Sequence with sequence_poses and their poses loaded
+
+    Returns:
+        SequenceResponse: Sequence details with full pose details
+    """
+    # Build response with pose details
+    pose_responses = []
+    total_duration_seconds = 0
+
+    for sequence_pose in sequence.sequence_poses:
+        pose_response = SequencePoseResponse(
+            sequence_pose_id=sequence_pose.sequence_pose_id,
+            pose_id=sequence_pose.pose_id,
+            position_order=sequence_pose.position_order,
+            duration_seconds=sequence_pose.duration_seconds,
+            pose=sequence_pose.pose
+        )
+        pose_responses.append(pose_response)
+        total_duration_seconds += sequence_pose.duration_seconds
+
+    return SequenceResponse(
+        sequence_id=sequence.sequence_id,
+        name=sequence.name,
+        description=sequence.description,
+        difficulty_level=sequence.difficulty_level,
+        duration_minutes=sequence.duration_minutes,
+        focus_area=sequence.focus_area,
+        style=sequence.style,
+        is_preset=sequence.is_preset,
+        created_by=sequence.created_by,
+        created_at=sequence.created_at,
+        updated_at=sequence.updated_at,
+        poses=pose_responses,
+        total_duration_seconds=total_duration_seconds
+    )
+
+
 @router.get(
     "",
     response_model=SequenceListResponse,
@@ -36,7 +146,7 @@ router = APIRouter(prefix="/sequences", tags=["Sequences"])
 @public_rate_limit
 async def list_sequences(
     request: Request,
-    db_session: DatabaseSession,
+    db_session: ReadOnlyDatabaseSession,
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page (max 100)"),
     search: Optional[str] = Query(None, description="Search by sequence name"),
@@ -63,38 +173,9 @@ async def list_sequences(
 
     Returns paginated list of sequences with total count and page information.
     """
-    # Build base query with pose count
-    query = select(
-        Sequence,
-        func.count(SequencePose.sequence_pose_id).label("pose_count")
-    ).outerjoin(SequencePose).group_by(Sequence.sequence_id)
-
-    # Apply search filter
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.where(Sequence.name.ilike(search_pattern))
-
-    # Apply difficulty filter
-    if difficulty:
-        query = query.where(Sequence.difficulty_level == difficulty)
-
-    # Apply focus area filter
-    if focus_area:
-        query = query.where(Sequence.focus_area == focus_area)
-
-    # Apply style filter
-    if style:
-        query = query.where(Sequence.style == style)
-
-    # Apply duration filters
-    if min_duration:
-        query = query.where(Sequence.duration_minutes >= min_duration)
-    if max_duration:
-        query = query.where(Sequence.duration_minutes <= max_duration)
-
-    # Apply preset filter
-    if preset_only is not None:
-        query = query.where(Sequence.is_preset == preset_only)
+    query = build_sequence_list_query(
+        search, difficulty, focus_area, style, min_duration, max_duration, preset_only
+    )
 
     # Get total count before pagination
     count_subquery = query.subquery()
@@ -136,13 +217,15 @@ async def list_sequences(
         page=page,
         page_size=page_size,
         filters={
-            "search": search,
-            "difficulty": difficulty.value if difficulty else None,
-            "focus_area": focus_area.value if focus_area else None,
-            "style": style.value if style else None,
-            "min_duration": min_duration,
-            "max_duration": max_duration,
-            "preset_only": preset_only
+            name: value for name, value in (
+                ("search", search),
+                ("difficulty", difficulty.value if difficulty else None),
+                ("focus_area", focus_area.value if focus_area else None),
+                ("style", style.value if style else None),
+                ("min_duration", min_duration),
+                ("max_duration", max_duration),
+                ("preset_only", preset_only),
+            ) if value is not None
         }
     )
 
@@ -165,7 +248,7 @@ async def list_sequences(
 @public_rate_limit
 async def get_sequence_categories(
     request: Request,
-    db_session: DatabaseSession
+    db_session: ReadOnlyDatabaseSession
 ) -> SequenceCategoriesResponse:
     """
     Get sequences grouped by various categories.
@@ -177,64 +260,13 @@ async def get_sequence_categories(
     - By duration ranges (0-15, 16-30, 31-45, 46+ minutes)
 
     Useful for displaying category filters and sequence distribution.
+    Served from the catalog cache.
     """
-    # Get counts by difficulty
-    difficulty_query = select(
-        Sequence.difficulty_level,
-        func.count(Sequence.sequence_id).label("count")
-    ).group_by(Sequence.difficulty_level)
-    result = await db_session.execute(difficulty_query)
-    by_difficulty = {
-        row.difficulty_level.value if hasattr(row.difficulty_level, 'value') else row.difficulty_level: row.count
-        for row in result
-    }
-
-    # Get counts by focus area
-    focus_query = select(
-        Sequence.focus_area,
-        func.count(Sequence.sequence_id).label("count")
-    ).group_by(Sequence.focus_area)
-    result = await db_session.execute(focus_query)
-    by_focus_area = {
-        row.focus_area.value if hasattr(row.focus_area, 'value') else row.focus_area: row.count
-        for row in result
-    }
-
-    # Get counts by style
-    style_query = select(
-        Sequence.style,
-        func.count(Sequence.sequence_id).label("count")
-    ).group_by(Sequence.style)
-    result = await db_session.execute(style_query)
-    by_style = {
-        row.style.value if hasattr(row.style, 'value') else row.style: row.count
-        for row in result
-    }
-
-    # Get counts by duration ranges
-    duration_ranges = {
-        "0-15": (0, 15),
-        "16-30": (16, 30),
-        "31-45": (31, 45),
-        "46+": (46, 999)
-    }
-    by_duration = {}
-    for range_name, (min_dur, max_dur) in duration_ranges.items():
-        duration_query = select(func.count(Sequence.sequence_id)).where(
-            Sequence.duration_minutes >= min_dur,
-            Sequence.duration_minutes <= max_dur
-        )
-        result = await db_session.execute(duration_query)
-        by_duration[range_name] = result.scalar() or 0
+    categories = await catalog_cache.get(SEQUENCE_CATEGORIES, db_session)
 
     logger.info("Sequence categories retrieved")
 
-    return SequenceCategoriesResponse(
-        by_difficulty=by_difficulty,
-        by_focus_area=by_focus_area,
-        by_style=by_style,
-        by_duration=by_duration
-    )
+    return SequenceCategoriesResponse(**categories)
 
 
 @router.get(
@@ -306,7 +338,7 @@ async def get_styles(request: Request) -> StylesResponse:
 async def get_sequence(
     request: Request,
     sequence_id: int,
-    db_session: DatabaseSession
+    db_session: ReadOnlyDatabaseSession
 ) -> SequenceResponse:
     """
     Get detailed information about a specific sequence.
@@ -338,35 +370,92 @@ async def get_sequence(
             detail=f"Sequence with ID {sequence_id} not found"
         )
 
-    # Build response with pose details
-    pose_responses = []
-    total_duration_seconds = 0
+    logger.info("Sequence retrieved", sequence_id=sequence_id, name=sequence.name)
 
-    for sequence_pose in sequence.sequence_poses:
-        pose_response = SequencePoseResponse(
-            sequence_pose_id=sequence_pose.sequence_pose_id,
-            pose_id=sequence_pose.pose_id,
-            position_order=sequence_pose.position_order,
-            duration_seconds=sequence_pose.duration_seconds,
-            pose=sequence_pose.pose
+    return build_sequence_response(sequence)
+
+
+@router.api_route(
+    "/{sequence_id}/audio/stream",
+    methods=["GET", "HEAD"],
+    status_code=status.HTTP_200_OK,
+    summary="Stream guided audio for a sequence",
+    description="Continuous guided-practice audio assembled on the fly from narration clips and silence",
+    response_class=Response,
+    responses={200: {"content": {"audio/mpeg": {}}}, 206: {"description": "Partial content"}},
+)
+@public_rate_limit
+async def stream_sequence_audio(
+    request: Request,
+    sequence_id: int,
+    db_session: ReadOnlyDatabaseSession,
+    voice: str = Query(DEFAULT_VOICE, description=f"Narration voice ({', '.join(VOICES)})"),
+) -> Response:
+    """
+    Stream a sequence's guided-practice track.
+
+    The track follows the sequence's position_order: intro narration, then
+    for each pose its transition narration and a silent hold of
+    duration_seconds, then the outro. It is assembled while streaming from
+    cached clips (see SequenceAssembler), so nothing is buffered and the
+    first bytes go out immediately regardless of length. The byte layout
+    is deterministic, so Range requests (seeking, resuming) are supported.
+
+    Args:
+        sequence_id: Unique identifier of the sequence
+        voice: Narration voice
+
+    Returns:
+        Response: Streaming MP3 (200 or 206), 304 if the ETag matches
+    """
+    if voice not in VOICES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown voice '{voice}'. Available: {', '.join(VOICES)}"
         )
-        pose_responses.append(pose_response)
-        total_duration_seconds += sequence_pose.duration_seconds
 
-    logger.info("Sequence retrieved", sequence_id=sequence_id, name=sequence.name)
+    query = (
+        select(Sequence)
+        .where(Sequence.sequence_id == sequence_id)
+        .options(
+            selectinload(Sequence.sequence_poses).selectinload(SequencePose.pose)
+        )
+    )
+    result = await db_session.execute(query)
+    sequence = result.scalar_one_or_none()
 
-    return SequenceResponse(
-        sequence_id=sequence.sequence_id,
-        name=sequence.name,
-        description=sequence.description,
-        difficulty_level=sequence.difficulty_level,
-        duration_minutes=sequence.duration_minutes,
-        focus_area=sequence.focus_area,
-        style=sequence.style,
-        is_preset=sequence.is_preset,
-        created_by=sequence.created_by,
-        created_at=sequence.created_at,
-        updated_at=sequence.updated_at,
-        poses=pose_responses,
-        total_duration_seconds=total_duration_seconds
+    if not sequence:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sequence with ID {sequence_id} not found"
+        )
+
+    segments = sequence_segments(sequence_script_fields(sequence))
+    try:
+        # Stats and reads clip headers, so keep it off the event loop
+        plan = await anyio.to_thread.run_sync(sequence_assembler.plan, segments, VOICES[voice])
+    except (MissingClipsError, MP3FormatError) as error:
+        logger.warning("Sequence audio unavailable", sequence_id=sequence_id, voice=voice, error=str(error))
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audio has not been generated for this sequence"
+        )
+
+    headers = {
+        "ETag": f'"{plan.key[:32]}"',
+        "Cache-Control": cdn_service.get_cache_control_header("revalidate"),
+        "X-Content-Duration": f"{plan.duration:.1f}",
+        # Pass chunks straight through nginx instead of spooling the response
+        "X-Accel-Buffering": "no",
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return ranged_stream_response(
+        request.headers,
+        request.method,
+        plan.size,
+        plan.iter_chunks,
+        "audio/mpeg",
+        headers,
     )
@@ -4,15 +4,27 @@ Handles image uploads with validation and optimization.
 """
 from fastapi import APIRouter, status, HTTPException, UploadFile, File
 from fastapi.responses import FileResponse
-from pathlib import Path
 
 from app.schemas.upload import ImageUploadResponse
-from app.services.upload_service import save_image, ImageUploadError, delete_image
+from app.services.upload_service import (
+    MAX_FILE_SIZE,
+    ImageUploadError,
+    delete_image,
+    resolve_image_path,
+    save_image,
+)
 from app.api.dependencies import AdminUser
-from app.core.config import settings
+from app.api.routing import body_size_limited_route
 from app.core.logging_config import logger
 
-router = APIRouter(prefix="/upload", tags=["Upload"])
+# Room for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+router = APIRouter(
+    prefix="/upload",
+    tags=["Upload"],
+    route_class=body_size_limited_route(MAX_FILE_SIZE + MULTIPART_OVERHEAD),
+)
 
 
 @router.post(
@@ -38,18 +50,15 @@ async def upload_image(
     - Resize to max 2000px dimension
     - Compression with quality optimization
 
+    The original is stored before responding; optimization runs in the
+    background and the URL serves the original until it completes.
+    Size and dimensions in the response describe the original.
+
     Returns URL to access the uploaded image.
     """
     try:
-        # Read file data
-        file_data = await file.read()
-
-        # Save and optimize image
-        url, saved_filename, file_size, width, height, image_format = await save_image(
-            filename=file.filename or "image.jpg",
-            content_type=file.content_type or "image/jpeg",
-            file_data=file_data
-        )
+        # Stream to disk and queue optimization
+        url, saved_filename, file_size, width, height, image_format = await save_image(file)
 
         logger.info(
             "Image uploaded",
@@ -95,9 +104,9 @@ async def get_image(filename: str) -> FileResponse:
 
     Returns uploaded image file.
     """
-    file_path = Path(settings.upload_directory) / "images" / filename
+    file_path = resolve_image_path(filename)
 
-    if not file_path.exists():
+    if file_path is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Image not found"
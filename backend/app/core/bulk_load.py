@@ -0,0 +1,204 @@
+"""
+Bulk row loading for imports, seed scripts and backfills.
+
+On PostgreSQL with asyncpg, rows are streamed with COPY
+(copy_records_to_table), which is an order of magnitude faster than
+INSERT for large loads. Elsewhere (SQLite in development and tests) rows
+are inserted with chunked executemany. Either way the load runs inside
+the caller's transaction, so it commits or rolls back with it.
+
+COPY bypasses SQLAlchemy's statement compilation, so values are passed
+through the column types' bind processors (JSON serialization, enum
+names) and Python-side column defaults are filled in here. ORM events and
+validators don't run; pass plain column values.
+"""
+import time
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping, Union
+
+from sqlalchemy import Column, Table, func, insert, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.logging_config import logger
+
+# Rows per COPY or executemany round trip
+DEFAULT_CHUNK_SIZE = 10_000
+
+Target = Union[Table, type]
+
+
+def _table(target: Target) -> Table:
+    """Accept a Table or a mapped model class."""
+    return getattr(target, "__table__", target)
+
+
+def _chunks(rows: Iterable[Mapping[str, Any]], size: int) -> Iterator[list[Mapping[str, Any]]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _uses_copy(connection: AsyncConnection) -> bool:
+    return connection.dialect.name == "postgresql" and connection.dialect.driver == "asyncpg"
+
+
+def _python_defaults(table: Table, names: list[str]) -> list[Column]:
+    """Columns missing from the rows that have a Python-side default to fill in."""
+    return [
+        column for column in table.columns
+        if column.name not in names and column.default is not None
+        and (column.default.is_scalar or column.default.is_callable)
+    ]
+
+
+def _default_value(column: Column) -> Any:
+    if column.default.is_scalar:
+        return column.default.arg
+    # SQLAlchemy wraps callables to take an execution context; ours ignore it
+    return column.default.arg(None)
+
+
+class _CopyEncoder:
+    """Turns row mappings into COPY records for a fixed column list."""
+
+    def __init__(self, dialect: Dialect, table: Table, names: list[str]):
+        self.names = names
+        self.defaults = _python_defaults(table, names)
+        self.columns = names + [column.name for column in self.defaults]
+        self.processors = [
+            table.c[name].type.dialect_impl(dialect).bind_processor(dialect) for name in self.columns
+        ]
+
+    def records(self, chunk: list[Mapping[str, Any]]) -> list[tuple]:
+        records = []
+        for row in chunk:
+            values = [row[name] for name in self.names]
+            values.extend(_default_value(column) for column in self.defaults)
+            records.append(tuple(
+                processor(value) if processor is not None and value is not None else value
+                for processor, value in zip(self.processors, values)
+            ))
+        return records
+
+
+async def _copy(connection: AsyncConnection, table: Table, encoder: _CopyEncoder, chunk: list) -> None:
+    raw = await connection.get_raw_connection()
+    driver_connection = raw.driver_connection
+    if not driver_connection.is_in_transaction():
+        # SQLAlchemy's asyncpg adapter sends BEGIN lazily with the first
+        # statement; without one, COPY would autocommit on its own
+        await connection.exec_driver_sql("SELECT 1")
+    await driver_connection.copy_records_to_table(
+        table.name,
+        schema_name=table.schema,
+        columns=encoder.columns,
+        records=encoder.records(chunk),
+    )
+
+
+async def _reserve_keys(connection: AsyncConnection, table: Table, column: Column, count: int) -> list[int]:
+    """Take `count` values from the primary key's sequence."""
+    sequence = func.pg_get_serial_sequence(table.fullname, column.name)
+    result = await connection.execute(select(func.nextval(sequence)).select_from(func.generate_series(1, count)))
+    return list(result.scalars())
+
+
+def _primary_key(table: Table) -> Column:
+    columns = list(table.primary_key.columns)
+    if len(columns) != 1:
+        raise ValueError(f"{table.name} must have a single-column primary key to return keys")
+    return columns[0]
+
+
+async def bulk_insert(
+    connection: AsyncConnection,
+    target: Target,
+    rows: Iterable[Mapping[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert many rows as fast as the database allows.
+
+    Rows are consumed lazily in chunks, so a generator of millions of rows
+    loads in bounded memory.
+
+    Args:
+        connection: Connection, inside the transaction the rows belong to
+            (e.g. `await session.connection()`)
+        target: Table or mapped model class
+        rows: Column name -> value mappings, all with the same keys
+        chunk_size: Rows per round trip
+
+    Returns:
+        int: Number of rows inserted
+    """
+    table = _table(target)
+    started = time.perf_counter()
+    count = 0
+    encoder = None
+    for chunk in _chunks(rows, chunk_size):
+        if _uses_copy(connection):
+            encoder = encoder or _CopyEncoder(connection.dialect, table, list(chunk[0]))
+            await _copy(connection, table, encoder, chunk)
+        else:
+            await connection.execute(insert(table), chunk)
+        count += len(chunk)
+
+    _log_load(connection, table, count, started)
+    return count
+
+
+async def bulk_insert_returning_keys(
+    connection: AsyncConnection,
+    target: Target,
+    rows: Iterable[Mapping[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list:
+    """
+    Insert many rows and return their generated primary keys.
+
+    On PostgreSQL the keys are reserved from the table's sequence first and
+    copied with the rows, since COPY can't return them.
+
+    Args:
+        connection: Connection, inside the transaction the rows belong to
+        target: Table or mapped model class with a single-column primary key
+        rows: Column name -> value mappings without the primary key
+        chunk_size: Rows per round trip
+
+    Returns:
+        list: Primary keys, in the order of `rows`
+    """
+    table = _table(target)
+    primary_key = _primary_key(table)
+    started = time.perf_counter()
+    keys = []
+    encoder = None
+    for chunk in _chunks(rows, chunk_size):
+        if _uses_copy(connection):
+            chunk_keys = await _reserve_keys(connection, table, primary_key, len(chunk))
+            chunk = [{**row, primary_key.name: key} for row, key in zip(chunk, chunk_keys)]
+            encoder = encoder or _CopyEncoder(connection.dialect, table, list(chunk[0]))
+            await _copy(connection, table, encoder, chunk)
+        else:
+            result = await connection.execute(
+                insert(table).returning(primary_key, sort_by_parameter_order=True), chunk
+            )
+            chunk_keys = list(result.scalars())
+        keys.extend(chunk_keys)
+
+    _log_load(connection, table, len(keys), started)
+    return keys
+
+
+def _log_load(connection: AsyncConnection, table: Table, count: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    logger.debug(
+        "Bulk load",
+        table=table.name,
+        rows=count,
+        method="copy" if _uses_copy(connection) else "executemany",
+        duration_ms=round(elapsed * 1000, 2),
+        rows_per_second=round(count / elapsed) if elapsed > 0 else None,
+    )
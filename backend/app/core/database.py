@@ -2,24 +2,247 @@
 Database configuration and session management for YogaFlow.
 Uses SQLAlchemy async for non-blocking database operations.
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import hashlib
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import db_pool_checked_out, db_pool_checkout_wait_seconds, route_template
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,  # Log SQL queries in debug mode
-    future=True,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
-)
 
-# Create async session factory
+class QueryStats:
+    """
+    SQL statistics for a request (or any other scope, such as a test block).
+
+    Stats nest: statements recorded on a child are also counted on its
+    parents, so a test can put a budget around several requests.
+    """
+
+    __slots__ = ("count", "duration_ms", "parent", "scope")
+
+    def __init__(self, parent: Optional["QueryStats"] = None, scope: Optional[dict] = None):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.parent = parent
+        self.scope = scope
+
+    def record(self, duration_ms: float) -> None:
+        """Record one executed statement on this scope and its parents."""
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.duration_ms += duration_ms
+            stats = stats.parent
+
+
+# Statistics for the current request, set by RequestLoggingMiddleware
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request executes too many statements."""
+
+
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_IN_LIST_PATTERN = re.compile(r"\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|\$\d+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """
+    Normalize a SQL statement so identical query shapes group together.
+
+    Literals become '?', IN lists collapse to 'IN (...)' and whitespace
+    is collapsed.
+
+    Args:
+        statement: SQL statement text
+
+    Returns:
+        tuple[str, str]: (short fingerprint hash, normalized statement)
+    """
+    normalized = _IN_LIST_PATTERN.sub("IN (...)", statement)
+    normalized = _LITERAL_PATTERN.sub("?", normalized)
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    return digest, normalized
+
+
+def instrument_engine(async_engine: AsyncEngine, name: str) -> None:
+    """
+    Attach metrics hooks to an engine.
+
+    Records pool checkout wait time, checked-out connections, and the
+    number and duration of statements executed per request. Statements
+    slower than SLOW_QUERY_THRESHOLD_MS are logged with their fingerprint
+    and route.
+
+    Args:
+        async_engine: Engine to instrument
+        name: Engine label for metrics (e.g. 'primary')
+    """
+    sync_engine = async_engine.sync_engine
+    pool = sync_engine.pool
+    do_get = pool._do_get
+
+    def timed_do_get():
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - start, engine=name)
+
+    pool._do_get = timed_do_get
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checked_out.inc(engine=name)
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec(engine=name)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_execute(connection, cursor, statement, parameters, context, executemany):
+        _finish_statement_timer(connection, statement, name)
+
+    event.listen(sync_engine, "before_cursor_execute", _start_statement_timer)
+    event.listen(sync_engine, "handle_error", _discard_statement_timer)
+
+
+def _start_statement_timer(connection, cursor, statement, parameters, context, executemany) -> None:
+    connection.info.setdefault("query_start_ns", []).append(time.perf_counter_ns())
+
+
+def _finish_statement_timer(connection, statement: str, engine_name: str) -> None:
+    """Count a finished statement on the request's stats, logging it if slow."""
+    duration_ms = (time.perf_counter_ns() - connection.info["query_start_ns"].pop()) / 1_000_000
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(duration_ms)
+    if duration_ms >= settings.slow_query_threshold_ms:
+        _log_slow_query(statement, duration_ms, stats, engine_name)
+
+
+def _log_slow_query(statement: str, duration_ms: float, stats: Optional[QueryStats], engine_name: str) -> None:
+    fingerprint, normalized = fingerprint_statement(statement)
+    logger.warning(
+        "Slow query",
+        duration_ms=round(duration_ms, 2),
+        fingerprint=fingerprint,
+        statement=normalized[:1000],
+        route=route_template(stats.scope) if stats is not None and stats.scope else None,
+        engine=engine_name,
+    )
+
+
+def _discard_statement_timer(exception_context) -> None:
+    # Drop the start time pushed for the failed statement
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_ns"):
+        connection.info["query_start_ns"].pop()
+
+
+# "direct": app pools connections to PostgreSQL itself
+# "pgbouncer": an external transaction-mode pooler sits in between
+CONNECTION_MODES = frozenset({"direct", "pgbouncer"})
+
+
+def _prepared_statement_name() -> str:
+    # Unique names so statements never collide on a shared PgBouncer backend
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(database_url: str) -> dict:
+    """
+    Build create_async_engine keyword arguments from settings.
+
+    Pool sizing only applies to server databases; SQLite keeps the
+    dialect's default pool.
+
+    With DB_CONNECTION_MODE=pgbouncer (transaction pooling), connections
+    are not pooled in-process (PgBouncer does that) and asyncpg's
+    prepared statement caches are disabled, since a cached statement may
+    not exist on the next server connection. In direct mode the asyncpg
+    statement cache is sized by DB_STATEMENT_CACHE_SIZE.
+
+    Args:
+        database_url: Database URL the engine will connect to
+
+    Returns:
+        dict: Keyword arguments for create_async_engine
+
+    Raises:
+        ValueError: If DB_CONNECTION_MODE is not recognized
+    """
+    options = {
+        "echo": settings.debug,  # Log SQL queries in debug mode
+    }
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    mode = settings.db_connection_mode.lower()
+    if mode not in CONNECTION_MODES:
+        raise ValueError(f"DB_CONNECTION_MODE must be one of {sorted(CONNECTION_MODES)}, got '{mode}'")
+    uses_asyncpg = url.get_driver_name() == "asyncpg"
+
+    if mode == "pgbouncer":
+        options["poolclass"] = NullPool
+        if uses_asyncpg:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+            }
+        return options
+
+    options.update(
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if uses_asyncpg:
+        options["connect_args"] = {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    return options
+
+
+def create_database_engine(database_url: str, name: str) -> AsyncEngine:
+    """
+    Create and instrument an async engine.
+
+    Args:
+        database_url: Database URL to connect to
+        name: Engine label for metrics and logs (e.g. 'primary')
+
+    Returns:
+        AsyncEngine: Configured engine
+    """
+    async_engine = create_async_engine(database_url, **engine_options(database_url))
+    instrument_engine(async_engine, name)
+    return async_engine
+
+
+# Create async engines. Reads go to the replica when one is configured.
+engine = create_database_engine(settings.database_url, "primary")
+if settings.database_replica_url:
+    replica_engine = create_database_engine(settings.database_replica_url, "replica")
+else:
+    replica_engine = engine
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -27,18 +250,60 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Requests with these methods never write, so they can read from the replica
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Raised when code tries to flush changes through a read-only session."""
+
+
+class ReadOnlySession(Session):
+    """Session class for read-only sessions; flushing is rejected."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise ReadOnlySessionError("Cannot write through a read-only database session")
+
+
+# Read-only sessions use the replica, with READ ONLY transactions on PostgreSQL
+ReadOnlySessionLocal = async_sessionmaker(
+    replica_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
 
 # Base class for models
 Base = declarative_base()
 
 
-async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_database_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database sessions.
 
     Provides async context manager for database operations.
     Ensures proper cleanup even if exceptions occur.
 
+    Read-only requests (GET/HEAD/OPTIONS) use the read replica when
+    DATABASE_REPLICA_URL is set; all other requests use the primary.
+    Replica reads may lag the primary slightly.
+
+    Args:
+        request: Current request, used to route reads to the replica
+
     Yields:
         AsyncSession: SQLAlchemy async database session
 
@@ -48,7 +313,8 @@ async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
             result = await db.execute(select(User))
             return result.scalars().all()
     """
-    async with AsyncSessionLocal() as session:
+    session_factory = ReplicaSessionLocal if request.method in READ_ONLY_METHODS else AsyncSessionLocal
+    async with session_factory() as session:
         try:
             yield session
             await session.commit()
@@ -60,6 +326,49 @@ async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_only_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only database sessions.
+
+    Reads from the replica (when configured) inside a read-only
+    transaction. Nothing is committed: closing the session ends the
+    transaction and returns the connection to the pool. Declare with
+    Depends(..., scope="function") so the connection is released as soon
+    as the endpoint returns rather than after the response is sent.
+
+    Yields:
+        AsyncSession: Session that rejects flushes
+    """
+    async with ReadOnlySessionLocal() as session:
+        try:
+            yield session
+        except Exception as error:
+            logger.error("Database session error", error=str(error), exc_info=True)
+            raise
+
+
+async def get_unit_of_work_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for write sessions with unit-of-work semantics.
+
+    The endpoint runs inside one transaction on the primary. It is
+    committed when the endpoint returns and rolled back if it raises, so
+    endpoints should flush (not commit) to get generated keys. Declare
+    with Depends(..., scope="function") so a failed commit is reported
+    to the client instead of happening after the response is sent.
+
+    Yields:
+        AsyncSession: Session with an open transaction
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            async with session.begin():
+                yield session
+        except Exception as error:
+            logger.error("Database session error", error=str(error), exc_info=True)
+            raise
+
+
 async def init_database() -> None:
     """
     Initialize database tables.
@@ -84,4 +393,6 @@ async def close_database() -> None:
     all connections are properly closed.
     """
     await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
@@ -0,0 +1,189 @@
+"""
+Health checks for YogaFlow.
+
+/health/live only proves the process is serving requests. /health/ready
+checks the dependencies a worker needs before it should receive traffic:
+database reachability and pool saturation, Redis round trip, catalog cache
+warmth and event loop lag.
+
+Readiness statuses:
+- ready: all checks pass
+- degraded: serving, but something is impaired (e.g. Redis down and the
+  in-memory fallback is active, pool nearly exhausted, loop lagging)
+- not_ready: database unreachable, caches cold, or shutting down
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+READY = "ready"
+DEGRADED = "degraded"
+NOT_READY = "not_ready"
+
+
+class HealthState:
+    """Process-wide flags that affect readiness."""
+
+    def __init__(self):
+        self.shutting_down = False
+
+
+# Global health state instance
+health_state = HealthState()
+
+
+def pool_status(async_engine: AsyncEngine) -> dict:
+    """
+    Describe connection pool usage.
+
+    Args:
+        async_engine: Engine whose pool to inspect
+
+    Returns:
+        dict: Checked-out connections, capacity and saturation (0-1), when
+        the pool type tracks them
+    """
+    pool = async_engine.sync_engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        # e.g. NullPool behind PgBouncer: nothing to saturate in-process
+        return {"pool": type(pool).__name__}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    return {
+        "pool": type(pool).__name__,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+async def _select_one(async_engine: AsyncEngine) -> None:
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_database(async_engine: AsyncEngine) -> dict:
+    """
+    Run SELECT 1 and report round-trip time and pool usage.
+
+    Args:
+        async_engine: Engine to check
+
+    Returns:
+        dict: Check result with a 'status' key
+    """
+    result = pool_status(async_engine)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_select_one(async_engine), settings.health_check_timeout_seconds)
+    except Exception as error:
+        result.update(status=NOT_READY, error=str(error) or type(error).__name__)
+        return result
+
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    saturated = result.get("saturation", 0) >= settings.health_pool_saturation_threshold
+    result["status"] = DEGRADED if saturated else READY
+    return result
+
+
+async def check_redis() -> dict:
+    """
+    Ping Redis and report whether the in-memory fallbacks are in use.
+
+    Returns:
+        dict: Check result with a 'status' key
+    """
+    from app.core.rate_limit import limiter
+    from app.services.token_blacklist import token_blacklist
+
+    try:
+        latency_ms = await asyncio.wait_for(token_blacklist.ping(), settings.health_check_timeout_seconds)
+    except asyncio.TimeoutError:
+        latency_ms = None
+
+    rate_limit_fallback = getattr(limiter.store, "degraded", False)
+    result = {"rate_limit_fallback": rate_limit_fallback}
+    if latency_ms is None:
+        # The app keeps serving: token revocation is skipped and rate
+        # limits fall back to per-worker buckets
+        result.update(status=DEGRADED, error="unavailable")
+        return result
+
+    result["latency_ms"] = round(latency_ms, 2)
+    result["status"] = DEGRADED if rate_limit_fallback else READY
+    return result
+
+
+async def measure_event_loop_lag() -> float:
+    """
+    Measure how long a ready callback waits to run on the event loop.
+
+    Returns:
+        float: Lag in milliseconds
+    """
+    start = time.perf_counter()
+    await asyncio.sleep(0)
+    return (time.perf_counter() - start) * 1000
+
+
+def check_event_loop(lag_ms: float) -> dict:
+    """
+    Classify event loop lag.
+
+    Args:
+        lag_ms: Measured lag in milliseconds
+
+    Returns:
+        dict: Check result with a 'status' key
+    """
+    status = DEGRADED if lag_ms >= settings.health_loop_lag_threshold_ms else READY
+    return {"status": status, "lag_ms": round(lag_ms, 2)}
+
+
+def check_catalog_cache() -> dict:
+    """
+    Report whether the catalog cache has been prewarmed.
+
+    Returns:
+        dict: Check result with a 'status' key
+    """
+    from app.services.catalog_cache import catalog_cache
+
+    return {"status": READY if catalog_cache.warm else NOT_READY, "warm": catalog_cache.warm}
+
+
+async def readiness(async_engine: AsyncEngine, lag_ms: Optional[float] = None) -> dict:
+    """
+    Run all readiness checks concurrently.
+
+    Args:
+        async_engine: Primary database engine
+        lag_ms: Event loop lag to report; measured now when None
+
+    Returns:
+        dict: Overall 'status' plus per-check results under 'checks'
+    """
+    if lag_ms is None:
+        lag_ms = await measure_event_loop_lag()
+    database, redis = await asyncio.gather(check_database(async_engine), check_redis())
+    checks = {
+        "database": database,
+        "redis": redis,
+        "catalog_cache": check_catalog_cache(),
+        "event_loop": check_event_loop(lag_ms),
+    }
+
+    statuses = {check["status"] for check in checks.values()}
+    if health_state.shutting_down or NOT_READY in statuses:
+        status = NOT_READY
+    elif DEGRADED in statuses:
+        status = DEGRADED
+    else:
+        status = READY
+    return {"status": status, "shutting_down": health_state.shutting_down, "checks": checks}
@@ -7,13 +7,179 @@ Per CLAUDE.md requirements:
 - Structured logging for easy parsing and analysis
 """
 import logging
+import queue
+import random
 import sys
-from typing import Any
+import threading
+from typing import Any, Optional, TextIO
 import structlog
-from structlog.types import FilteringBoundLogger
+from structlog.types import EventDict, FilteringBoundLogger, WrappedLogger
 
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, default: Any = None, **_: Any) -> str:
+    """Serialize with orjson, matching json.dumps' str return type."""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class EventSampler:
+    """
+    Structlog processor that samples high-volume info/debug events.
+
+    Rates map event names to the fraction of events to keep. Kept events
+    carry a `sample_rate` field so aggregators can re-weight counts.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = rates
+        self.sampled_out = 0
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        if method_name not in ("debug", "info"):
+            return event_dict
+
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None:
+            return event_dict
+
+        if random.random() >= rate:
+            self.sampled_out += 1
+            raise structlog.DropEvent
+
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class BatchingLogHandler(logging.Handler):
+    """
+    Non-blocking logging handler backed by a bounded queue.
+
+    emit() only enqueues the record; a background thread formats records
+    (running the structlog renderer) and writes them to the stream in
+    batches. When the queue is full, records are dropped and counted, and
+    the drop count is reported in the log stream itself.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        poll_interval: float = 0.5,
+        start: bool = True,
+    ):
+        super().__init__()
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._stop = object()
+        self._thread = threading.Thread(target=self._drain, name="log-sink", daemon=True)
+        if start:
+            self.start()
+
+    @property
+    def stream(self) -> TextIO:
+        # Resolved lazily so stdout replacement (e.g. test capture) is honored
+        return self._stream or sys.stdout
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                record = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stopping = record is self._stop
+            if not stopping:
+                batch.append(record)
+            while len(batch) < self.batch_size and not stopping:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is self._stop:
+                    stopping = True
+                else:
+                    batch.append(record)
+
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self.format(record))
+            except Exception:
+                self.handleError(record)
+
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            lines.append(self.format(logging.LogRecord(
+                name=__name__,
+                level=logging.WARNING,
+                pathname=__file__,
+                lineno=0,
+                msg="Log events dropped (queue full): %d since last report, %d total",
+                args=(dropped - self._reported_dropped, dropped),
+                exc_info=None,
+            )))
+            self._reported_dropped = dropped
+
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            # Nothing sensible to log to; stdout is gone (e.g. interpreter exit)
+            pass
+
+    def flush(self) -> None:
+        """Best-effort wait for queued records to be written."""
+        if self._thread.is_alive():
+            deadline = 50
+            while not self._queue.empty() and deadline:
+                threading.Event().wait(0.01)
+                deadline -= 1
+
+    def close(self) -> None:
+        """Drain remaining records and stop the writer thread."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._stop, timeout=1.0)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=2.0)
+        super().close()
+
+
+# Set by setup_logging(); exposed for metrics and shutdown
+event_sampler: Optional[EventSampler] = None
+log_handler: Optional[logging.Handler] = None
+
 
 def setup_logging() -> FilteringBoundLogger:
     """
@@ -26,45 +192,70 @@ def setup_logging() -> FilteringBoundLogger:
     - Timestamp inclusion
     - Log level filtering
     - Exception tracking
+    - Non-blocking, batched output from a background thread (LOG_ASYNC)
+    - Sampling of high-volume events (LOG_SAMPLE_RATES)
 
     Returns:
         FilteringBoundLogger: Configured logger instance
     """
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper(), logging.INFO),
-    )
+    global event_sampler, log_handler
+
+    log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
     # Shared processors for all configurations
     shared_processors = [
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
     ]
 
-    # Configure structlog
+    # Rendering runs in the handler (off the event loop when LOG_ASYNC is on)
     if settings.log_format == "json":
         # JSON output for production
-        processors = shared_processors + [
-            structlog.processors.dict_tracebacks,
-            structlog.processors.JSONRenderer(),
-        ]
+        if orjson is not None:
+            renderer = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        else:
+            renderer = structlog.processors.JSONRenderer()
+        render_processors = [structlog.processors.dict_tracebacks, renderer]
     else:
         # Console output for development
-        processors = shared_processors + [
-            structlog.dev.ConsoleRenderer(),
-        ]
+        render_processors = [structlog.dev.ConsoleRenderer()]
 
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors + [structlog.processors.format_exc_info],
+        processors=[structlog.stdlib.ProcessorFormatter.remove_processors_meta] + render_processors,
+    )
+
+    if settings.log_async:
+        handler: logging.Handler = BatchingLogHandler(
+            max_queue_size=settings.log_queue_size,
+            batch_size=settings.log_batch_size,
+        )
+    else:
+        handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(formatter)
+
+    # Configure standard library logging
+    root_logger = logging.getLogger()
+    if log_handler is not None:
+        root_logger.removeHandler(log_handler)
+        log_handler.close()
+    root_logger.addHandler(handler)
+    root_logger.setLevel(log_level)
+    log_handler = handler
+
+    event_sampler = EventSampler(settings.log_sample_rates_map)
+
+    # Configure structlog. Exceptions are formatted here, on the calling
+    # thread, so no traceback objects cross into the writer thread.
     structlog.configure(
-        processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, settings.log_level.upper(), logging.INFO)
-        ),
+        processors=[event_sampler] + shared_processors + [
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
@@ -73,6 +264,19 @@ def setup_logging() -> FilteringBoundLogger:
     return structlog.get_logger()
 
 
+def shutdown_logging() -> None:
+    """
+    Flush the background log writer; it keeps running.
+
+    Should be called on application shutdown. The writer is not stopped
+    here because the server keeps logging after the app shuts down;
+    logging.shutdown() at interpreter exit closes the handler, which
+    writes any remaining records and stops the thread.
+    """
+    if log_handler is not None:
+        log_handler.flush()
+
+
 # Global logger instance
 logger: FilteringBoundLogger = setup_logging()
 
@@ -0,0 +1,122 @@
+"""
+Event loop watchdog for YogaFlow.
+
+A task on the event loop ticks every LOOP_WATCHDOG_INTERVAL_MS and records
+how late each tick ran (event loop lag). A separate thread watches those
+ticks: when none has run for LOOP_STALL_THRESHOLD_MS the loop is blocked,
+so the thread captures the loop thread's current stack, which points at
+the synchronous call holding it, and logs it with the running task.
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import event_loop_lag_seconds, event_loop_stalls_total
+
+# Innermost frames kept when logging a blocked stack
+MAX_STACK_FRAMES = 25
+
+
+class EventLoopWatchdog:
+    """
+    Measures event loop lag and reports stalls with the blocking stack.
+
+    Args:
+        interval_seconds: Tick interval
+        stall_threshold_seconds: Time without a tick before a stall is reported
+    """
+
+    def __init__(self, interval_seconds: float, stall_threshold_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.stall_threshold_seconds = stall_threshold_seconds
+        self.lag_seconds = 0.0
+        self.stalls = 0
+        self._last_tick = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the watchdog has been started and not stopped."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start ticking on the running loop and watching from a thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopping.clear()
+        self._task = self._loop.create_task(self._tick(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Event loop watchdog started",
+            interval_ms=self.interval_seconds * 1000,
+            stall_threshold_ms=self.stall_threshold_seconds * 1000,
+        )
+
+    async def stop(self) -> None:
+        """Stop the tick task and the watcher thread."""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds * 2)
+            self._thread = None
+
+    async def _tick(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            self.lag_seconds = max(0.0, time.perf_counter() - start - self.interval_seconds)
+            self._last_tick = time.monotonic()
+            event_loop_lag_seconds.observe(self.lag_seconds)
+
+    def _watch(self) -> None:
+        reported_tick = None
+        while not self._stopping.wait(self.interval_seconds):
+            last_tick = self._last_tick
+            stalled_for = time.monotonic() - last_tick - self.interval_seconds
+            # Report each stall once, while the loop is still blocked
+            if stalled_for >= self.stall_threshold_seconds and last_tick != reported_tick:
+                reported_tick = last_tick
+                self._report_stall(stalled_for)
+
+    def _report_stall(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=MAX_STACK_FRAMES) if frame is not None else []
+
+        # Reading the current task from another thread is racy, but the
+        # loop is blocked, so it cannot change underneath us
+        task = asyncio.current_task(self._loop) if self._loop is not None else None
+        coroutine = getattr(task.get_coro(), "__qualname__", None) if task is not None else None
+
+        self.stalls += 1
+        event_loop_stalls_total.inc()
+        logger.warning(
+            "Event loop stall detected",
+            stalled_ms=round(stalled_for * 1000, 1),
+            task=task.get_name() if task is not None else None,
+            coroutine=coroutine,
+            stack="".join(stack),
+        )
+
+
+# Global watchdog instance
+loop_watchdog = EventLoopWatchdog(
+    interval_seconds=settings.loop_watchdog_interval_ms / 1000,
+    stall_threshold_seconds=settings.loop_stall_threshold_ms / 1000,
+)
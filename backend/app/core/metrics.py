@@ -0,0 +1,374 @@
+"""
+In-process metrics registry for YogaFlow.
+Exposes Prometheus text format at /metrics.
+
+Metrics are plain counters, gauges and histograms keyed by label values.
+Under multiple workers, set METRICS_MULTIPROC_DIR: each worker periodically
+writes a JSON snapshot there and /metrics merges all snapshots, so any
+worker can answer a scrape with totals for the whole process group.
+The directory should be emptied before the workers start.
+"""
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for small counts (e.g. queries per request)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests that matched no route, to bound label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _label_key(labelnames: tuple[str, ...], labels: dict[str, str]) -> tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class for a named metric with a fixed set of label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable copy of the current values."""
+
+    @abstractmethod
+    def render(self, samples: dict) -> list[str]:
+        """Render snapshot samples as Prometheus text lines."""
+
+    @staticmethod
+    def merge(target: dict, samples: dict) -> None:
+        """Add snapshot samples from another worker into `target`."""
+        for key, value in samples.items():
+            target[key] = target.get(key, 0) + value
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {json.dumps(key): value for key, value in self._values.items()}
+
+    def render(self, samples: dict) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(zip(self.labelnames, json.loads(key)))} {_format_value(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down. Merged across workers by summing."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label key -> [bucket counts..., sum, count]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[index] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        data = self._values.get(_label_key(self.labelnames, labels))
+        return int(data[-1]) if data else 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {json.dumps(key): list(data) for key, data in self._values.items()}
+
+    @staticmethod
+    def merge(target: dict, samples: dict) -> None:
+        for key, data in samples.items():
+            existing = target.get(key)
+            if existing is None:
+                target[key] = list(data)
+            else:
+                target[key] = [a + b for a, b in zip(existing, data)]
+
+    def render(self, samples: dict) -> list[str]:
+        lines = []
+        for key, data in sorted(samples.items()):
+            labels = list(zip(self.labelnames, json.loads(key)))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, data):
+                cumulative += bucket_count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [le])} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(data[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together.
+
+    Supports multi-worker aggregation through snapshot files when a
+    directory is configured.
+    """
+
+    def __init__(self, multiproc_dir: Optional[str] = None, stale_after_seconds: float = 60.0):
+        self._metrics: dict[str, Metric] = {}
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.stale_after_seconds = stale_after_seconds
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        """Snapshot every metric in this process."""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    @property
+    def _snapshot_path(self) -> Path:
+        return self.multiproc_dir / f"metrics_{os.getpid()}.json"
+
+    def write_snapshot(self) -> None:
+        """Write this worker's snapshot for other workers to merge."""
+        if self.multiproc_dir is None:
+            return
+        self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self._snapshot_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"written_at": time.time(), "metrics": self.snapshot()}))
+        temp_path.replace(self._snapshot_path)
+
+    def _collect(self) -> dict:
+        if self.multiproc_dir is None:
+            return self.snapshot()
+
+        self.write_snapshot()
+        merged: dict[str, dict] = {name: {} for name in self._metrics}
+        now = time.time()
+        for path in self.multiproc_dir.glob("metrics_*.json"):
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            # Dead workers keep contributing counters and histograms, but
+            # their gauges (in-flight requests etc.) no longer apply
+            stale = now - data.get("written_at", 0) > self.stale_after_seconds
+            for name, samples in data.get("metrics", {}).items():
+                metric = self._metrics.get(name)
+                if metric is None or (stale and isinstance(metric, Gauge)):
+                    continue
+                metric.merge(merged[name], samples)
+        return merged
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        collected = self._collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            lines.extend(metric.render(collected.get(name, {})))
+        return "\n".join(lines) + "\n"
+
+    async def run_snapshot_writer(self, interval_seconds: float) -> None:
+        """Background task: periodically write this worker's snapshot."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.write_snapshot)
+            except OSError:
+                # Snapshot dir unavailable; the next scrape will retry
+                pass
+
+
+# Global registry instance
+registry = MetricsRegistry(
+    multiproc_dir=settings.metrics_multiproc_dir,
+    stale_after_seconds=settings.metrics_snapshot_interval_seconds * 6,
+)
+
+# HTTP
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+)
+
+# Database
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ("engine",),
+)
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ("engine",),
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+
+# Caches
+cache_requests_total = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit or miss)",
+    ("cache", "result"),
+)
+
+# Password hashing
+bcrypt_pool_queue_depth = registry.gauge(
+    "bcrypt_pool_queue_depth",
+    "bcrypt jobs waiting for a worker thread",
+)
+bcrypt_duration_seconds = registry.histogram(
+    "bcrypt_duration_seconds",
+    "Time spent hashing or verifying passwords, excluding queue wait",
+    ("operation",),
+)
+
+# Event loop
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a watchdog tick was due and when it ran",
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked longer than the stall threshold",
+)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Get the matched route template for a request.
+
+    Args:
+        scope: ASGI scope after routing
+
+    Returns:
+        str: Route template including any include_router prefix
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+
+    # Newer FastAPI versions resolve included routers lazily, leaving the
+    # include prefix on the include context instead of the route path
+    included_router = scope.get("fastapi", {}).get("included_router")
+    prefix = getattr(getattr(included_router, "include_context", None), "prefix", "")
+    if prefix and not route.path.startswith(prefix):
+        return prefix + route.path
+    return route.path
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """
+    Count a cache lookup.
+
+    Args:
+        cache: Cache name
+        hit: Whether the lookup was served from the cache
+    """
+    cache_requests_total.inc(cache=cache, result="hit" if hit else "miss")
@@ -4,10 +4,6 @@ Integrates Sentry for error tracking and performance monitoring.
 """
 import logging
 from typing import Optional
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
 
 from app.core.config import settings
 
@@ -18,6 +14,9 @@ def init_sentry() -> None:
 
     Only initializes if SENTRY_DSN is configured in environment.
     Integrates with FastAPI, SQLAlchemy, and logging.
+
+    sentry_sdk is imported here rather than at module level because it is
+    slow to import and unused when Sentry is disabled.
     """
     # Check if Sentry is configured
     sentry_dsn: Optional[str] = getattr(settings, 'sentry_dsn', None)
@@ -26,6 +25,11 @@ def init_sentry() -> None:
         logging.info("Sentry DSN not configured. Error tracking disabled.")
         return
 
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+    from sentry_sdk.integrations.logging import LoggingIntegration
+
     # Configure integrations
     integrations = [
         FastApiIntegration(transaction_style="endpoint"),
@@ -106,6 +110,8 @@ def capture_exception(error: Exception, context: Optional[dict] = None) -> None:
         error: The exception to capture
         context: Additional context dictionary to include
     """
+    import sentry_sdk
+
     if context:
         with sentry_sdk.push_scope() as scope:
             for key, value in context.items():
@@ -124,6 +130,8 @@ def capture_message(message: str, level: str = "info", context: Optional[dict] =
         level: Message level (debug, info, warning, error, fatal)
         context: Additional context dictionary to include
     """
+    import sentry_sdk
+
     if context:
         with sentry_sdk.push_scope() as scope:
             for key, value in context.items():
@@ -1,19 +1,234 @@
 """
 Rate limiting configuration for YogaFlow API.
-Uses slowapi for request rate limiting with Redis or in-memory storage.
+
+Implements GCRA (generic cell rate algorithm) token buckets. Each bucket is a
+single "theoretical arrival time" (TAT) per key, which gives smooth refill
+without the 2x bursts that fixed windows allow at window edges.
+
+Storage:
+- Redis (when REDIS_HOST is set): an atomic Lua script evaluated server-side,
+  so every worker shares the same buckets.
+- In-memory: per-process fallback for development, tests, and when Redis
+  is unreachable.
+
+Responses carry the standard RateLimit-* headers
+(draft-ietf-httpapi-ratelimit-headers).
 """
-from fastapi import Request, Response, HTTPException
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+import functools
+import inspect
+import math
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 from app.core.logging_config import logger
 
 
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    A rate limit policy: `limit` requests per `period` seconds.
+
+    `burst` is how many requests may be made back-to-back from an idle
+    bucket. It defaults to `limit`, matching the old per-window budget.
+    """
+    limit: int
+    period: int
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds between requests at the sustained rate."""
+        return self.period / self.limit
+
+    @property
+    def delay_tolerance(self) -> float:
+        """How far ahead of now the TAT may run before requests are denied."""
+        return self.emission_interval * (self.burst or self.limit)
+
+    @property
+    def policy(self) -> str:
+        """RateLimit-Policy header value, e.g. '5;w=60'."""
+        return f"{self.limit};w={self.period}"
+
+    def __str__(self) -> str:
+        return f"{self.limit}/{self.period}s"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a single GCRA check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self, rate: RateLimit) -> list[tuple[bytes, bytes]]:
+        """Build RateLimit-* header tuples for the response."""
+        headers = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-remaining", str(self.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset_after)).encode()),
+            (b"ratelimit-policy", rate.policy.encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+def _gcra_result(rate: RateLimit, allowed: bool, tat_offset: float, retry_after: float) -> RateLimitResult:
+    """
+    Build a result from the TAT offset (TAT minus now) after the check.
+    """
+    interval = rate.emission_interval
+    remaining = int((rate.delay_tolerance - tat_offset) // interval) if allowed else 0
+    return RateLimitResult(
+        allowed=allowed,
+        limit=rate.limit,
+        remaining=max(0, remaining),
+        reset_after=max(0.0, tat_offset),
+        retry_after=retry_after,
+    )
+
+
+class MemoryRateLimitStore:
+    """
+    In-process GCRA store.
+
+    Buckets are only shared between requests handled by the same worker
+    process. Checks are synchronous, so they are atomic on the event loop.
+    """
+
+    # Sweep expired buckets once the table grows past this many keys
+    SWEEP_THRESHOLD = 10_000
+
+    def __init__(self):
+        self._tats: dict[str, float] = {}
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        """Record a request against `key` and return the GCRA outcome."""
+        now = time.monotonic()
+        tat_offset = max(self._tats.get(key, now) - now, 0.0)
+        # Compare offsets rather than absolute times to avoid float drift
+        overshoot = tat_offset + rate.emission_interval - rate.delay_tolerance
+
+        if overshoot > 0:
+            return _gcra_result(rate, False, tat_offset, overshoot)
+
+        new_offset = tat_offset + rate.emission_interval
+        self._tats[key] = now + new_offset
+        if len(self._tats) > self.SWEEP_THRESHOLD:
+            self._sweep(now)
+        return _gcra_result(rate, True, new_offset, 0.0)
+
+    def _sweep(self, now: float) -> None:
+        """Drop buckets that have fully refilled."""
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+
+    def reset(self) -> None:
+        """Clear all buckets (used by tests)."""
+        self._tats.clear()
+
+
+# Atomic GCRA check. Uses the Redis server clock so all workers agree on "now".
+# Returns {allowed, tat_offset, retry_after}; floats are returned as strings
+# because Redis truncates Lua numbers to integers.
+GCRA_LUA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]))
+local offset = 0
+if tat ~= nil and tat > now then
+    offset = tat - now
+end
+local overshoot = offset + interval - tolerance
+if overshoot > 0 then
+    return {0, tostring(offset), tostring(overshoot)}
+end
+offset = offset + interval
+redis.call('SET', KEYS[1], tostring(now + offset), 'PX', math.ceil(offset * 1000))
+return {1, tostring(offset), '0'}
+"""
+
+
+class RedisRateLimitStore:
+    """
+    Redis-backed GCRA store shared by all workers.
+
+    Falls back to a per-process memory store if Redis errors, so an outage
+    degrades limits to per-worker rather than disabling them.
+    """
+
+    def __init__(self, redis_url: str, fallback: MemoryRateLimitStore):
+        self._redis_url = redis_url
+        self._fallback = fallback
+        self._redis = None
+        self._script = None
+        self._degraded = False
+
+    @property
+    def degraded(self) -> bool:
+        """Whether the last request fell back to the in-memory store."""
+        return self._degraded
+
+    def _get_script(self):
+        if self._script is None:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self._redis_url, decode_responses=True)
+            self._script = self._redis.register_script(GCRA_LUA_SCRIPT)
+        return self._script
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitResult:
+        """Record a request against `key` and return the GCRA outcome."""
+        try:
+            allowed, tat_offset, retry_after = await self._get_script()(
+                keys=[key],
+                args=[rate.emission_interval, rate.delay_tolerance],
+            )
+        except Exception as error:
+            if not self._degraded:
+                logger.warning(
+                    "Redis rate limit store unavailable - using in-memory fallback",
+                    error=str(error),
+                )
+                self._degraded = True
+            return await self._fallback.hit(key, rate)
+
+        if self._degraded:
+            logger.info("Redis rate limit store recovered")
+            self._degraded = False
+        return _gcra_result(rate, bool(int(allowed)), float(tat_offset), float(retry_after))
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+            self._script = None
+
+
+class RateLimitExceeded(Exception):
+    """Raised by a rate limit decorator when a bucket is empty."""
+
+    def __init__(self, rate: RateLimit, result: RateLimitResult, message: str):
+        super().__init__(message)
+        self.rate = rate
+        self.result = result
+        self.detail = message
+        self.limit = rate.limit
+        self.retry_after = max(1, math.ceil(result.retry_after))
+
+
 def get_identifier(request: Request) -> str:
     """
     Get unique identifier for rate limiting.
@@ -35,7 +250,7 @@ def get_identifier(request: Request) -> str:
         # Take the first IP from the chain (original client)
         return forwarded.split(",")[0].strip()
 
-    return get_remote_address(request) or "unknown"
+    return request.client.host if request.client else "unknown"
 
 
 def get_ip_address(request: Request) -> str:
@@ -46,67 +261,161 @@ def get_ip_address(request: Request) -> str:
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
         return forwarded.split(",")[0].strip()
-    return get_remote_address(request) or "unknown"
+    return request.client.host if request.client else "unknown"
 
 
-# Create limiter with identifier function
-limiter = Limiter(
-    key_func=get_identifier,
-    default_limits=[],  # No default limit - apply per-route
-    storage_uri=f"redis://{settings.redis_host}:{settings.redis_port}" if hasattr(settings, 'redis_host') and settings.redis_host else "memory://",
-    strategy="fixed-window",
-)
+class Limiter:
+    """
+    Applies GCRA rate limits to route handlers via decorators.
+
+    Decorated handlers must accept a `request: Request` parameter. The
+    outcome is stored on `request.state.rate_limit` so that
+    RateLimitHeadersMiddleware can add RateLimit-* headers to the response.
+    """
+
+    def __init__(self, redis_host: Optional[str] = None, redis_url: Optional[str] = None):
+        self.memory_store = MemoryRateLimitStore()
+        if redis_host and redis_url:
+            self.store = RedisRateLimitStore(redis_url, fallback=self.memory_store)
+        else:
+            self.store = self.memory_store
+        self.enabled = True
+
+    def limit(
+        self,
+        rate: RateLimit,
+        scope: str,
+        key_func: Callable[[Request], str] = get_identifier,
+        error_message: str = "Too many requests. Please slow down.",
+    ) -> Callable[[Callable[..., Awaitable]], Callable[..., Awaitable]]:
+        """
+        Build a decorator that enforces `rate` per `key_func(request)`.
+
+        Args:
+            rate: Rate limit policy
+            scope: Bucket namespace, so different limits don't share buckets
+            key_func: Function returning the client identifier
+            error_message: Message returned in the 429 response
+
+        Returns:
+            Decorator for async route handlers
+        """
+        def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(
+                    f"Rate limited endpoint '{func.__name__}' must accept a 'request: Request' parameter"
+                )
 
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request: Request = kwargs["request"]
+                if self.enabled:
+                    key = f"ratelimit:{scope}:{key_func(request)}"
+                    result = await self.store.hit(key, rate)
+                    request.state.rate_limit = (rate, result)
+                    if not result.allowed:
+                        raise RateLimitExceeded(rate, result, error_message)
+                return await func(*args, **kwargs)
 
-def custom_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+            return wrapper
+
+        return decorator
+
+    def reset(self) -> None:
+        """Clear in-process buckets (used by tests)."""
+        self.memory_store.reset()
+
+    async def close(self) -> None:
+        """Release store resources on shutdown."""
+        if isinstance(self.store, RedisRateLimitStore):
+            await self.store.close()
+
+
+class RateLimitHeadersMiddleware:
+    """
+    ASGI middleware that appends RateLimit-* headers to rate limited responses.
+
+    Reads the outcome recorded by Limiter on the request state when the
+    response starts, so handlers don't need a `response` parameter.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                outcome = state.get("rate_limit")
+                if outcome is not None:
+                    rate, result = outcome
+                    message["headers"] = list(message.get("headers", [])) + result.headers(rate)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# Policies come from settings so they can be tuned per environment
+AUTH_RATE = RateLimit(limit=settings.rate_limit_auth_per_minute, period=60)
+PUBLIC_RATE = RateLimit(limit=settings.rate_limit_public_per_minute, period=60)
+AUTHENTICATED_RATE = RateLimit(limit=settings.rate_limit_authenticated_per_hour, period=3600)
+
+# Create limiter, sharing buckets through Redis when it is configured
+limiter = Limiter(redis_host=settings.redis_host, redis_url=settings.redis_url)
+
+
+def custom_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
     """
     Custom handler for rate limit exceeded errors.
     Returns a JSON response with rate limit information.
     """
-    response_body = {
-        "error": "rate_limit_exceeded",
-        "message": "Too many requests. Please slow down.",
-        "detail": str(exc.detail),
-        "retry_after": exc.retry_after if hasattr(exc, 'retry_after') else None
-    }
-
     logger.warning(
         "Rate limit exceeded",
         client_ip=get_ip_address(request),
         path=request.url.path,
         method=request.method,
+        limit=str(exc.rate),
     )
 
-    return Response(
-        content=str(response_body).replace("'", '"'),
+    # RateLimit-* and Retry-After headers are added by RateLimitHeadersMiddleware
+    return JSONResponse(
         status_code=HTTP_429_TOO_MANY_REQUESTS,
-        media_type="application/json",
-        headers={
-            "Retry-After": str(exc.retry_after) if hasattr(exc, 'retry_after') and exc.retry_after else "60",
-            "X-RateLimit-Limit": str(exc.limit) if hasattr(exc, 'limit') else "",
-        }
+        content={
+            "error": "rate_limit_exceeded",
+            "message": "Too many requests. Please slow down.",
+            "detail": exc.detail,
+            "retry_after": exc.retry_after,
+        },
     )
 
 
 # Rate limit decorators for different endpoint types
 
-# Auth endpoints: 5 requests per minute (strict to prevent brute force)
+# Auth endpoints: strict per-IP limit to prevent brute force
 auth_rate_limit = limiter.limit(
-    "5/minute",
+    AUTH_RATE,
+    scope="auth",
     key_func=get_ip_address,
     error_message="Too many authentication attempts. Please wait before trying again."
 )
 
-# Public API endpoints: 100 requests per minute
+# Public API endpoints: per-IP limit
 public_rate_limit = limiter.limit(
-    "100/minute",
+    PUBLIC_RATE,
+    scope="public",
     key_func=get_ip_address,
     error_message="Too many requests. Please slow down."
 )
 
-# Authenticated user endpoints: 1000 requests per hour
+# Authenticated user endpoints: hourly per-user limit
 authenticated_rate_limit = limiter.limit(
-    "1000/hour",
+    AUTHENTICATED_RATE,
+    scope="authenticated",
     key_func=get_identifier,
     error_message="Hourly request limit exceeded. Please try again later."
 )
@@ -121,10 +430,13 @@ def setup_rate_limiting(app):
     """
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, custom_rate_limit_exceeded_handler)
+    app.add_middleware(RateLimitHeadersMiddleware)
 
     logger.info(
         "Rate limiting configured",
-        auth_limit="5/minute",
-        public_limit="100/minute",
-        authenticated_limit="1000/hour"
+        algorithm="gcra",
+        store="redis" if isinstance(limiter.store, RedisRateLimitStore) else "memory",
+        auth_limit=str(AUTH_RATE),
+        public_limit=str(PUBLIC_RATE),
+        authenticated_limit=str(AUTHENTICATED_RATE)
     )
@@ -7,13 +7,19 @@ Security Requirements (REQ-NF-SEC-*):
 - JWT tokens for session management
 - Secure password validation
 """
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import bcrypt_duration_seconds, bcrypt_pool_queue_depth
+
+T = TypeVar("T")
 
 # Password hashing context with bcrypt
 # Work factor set to 12 (minimum per REQ-NF-SEC-002)
@@ -64,6 +70,67 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+# Dedicated threads for bcrypt, which releases the GIL while hashing.
+# Keeps ~250ms hashes off the event loop without starving the default
+# executor used by other blocking work.
+bcrypt_executor = ThreadPoolExecutor(
+    max_workers=settings.bcrypt_pool_size,
+    thread_name_prefix="bcrypt",
+)
+
+
+async def _run_in_bcrypt_pool(operation: str, func: Callable[..., T], *args) -> T:
+    """
+    Run a bcrypt function on the bcrypt pool, recording queue depth.
+
+    Args:
+        operation: Metric label ('hash' or 'verify')
+        func: Function to run
+        *args: Arguments for func
+
+    Returns:
+        The function's return value
+    """
+    bcrypt_pool_queue_depth.inc()
+
+    def job() -> T:
+        bcrypt_pool_queue_depth.dec()
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            bcrypt_duration_seconds.observe(time.perf_counter() - start, operation=operation)
+
+    return await asyncio.get_running_loop().run_in_executor(bcrypt_executor, job)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the bcrypt thread pool.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        str: Hashed password
+    """
+    return await _run_in_bcrypt_pool("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the bcrypt thread pool.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored password hash
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    return await _run_in_bcrypt_pool("verify", verify_password, plain_password, hashed_password)
+
+
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
     Validate password meets security requirements.
@@ -0,0 +1,66 @@
+"""
+Startup profiling for YogaFlow.
+Measures how long each startup phase (imports, app setup, init steps) takes.
+"""
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+from app.core.logging_config import logger
+
+T = TypeVar("T")
+
+
+class StartupProfiler:
+    """
+    Records the duration of named startup phases in milliseconds.
+
+    Phases may overlap (e.g. init steps run concurrently), so their sum
+    can exceed the total.
+    """
+
+    def __init__(self, started_ns: Optional[int] = None):
+        self.started_ns = started_ns if started_ns is not None else time.perf_counter_ns()
+        self.phases: dict[str, float] = {}
+
+    def record(self, name: str, start_ns: int) -> None:
+        """
+        Record a phase that started at `start_ns` and ends now.
+
+        Args:
+            name: Phase name
+            start_ns: time.perf_counter_ns() value when the phase started
+        """
+        self.phases[name] = round((time.perf_counter_ns() - start_ns) / 1_000_000, 2)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as phase `name`."""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start_ns)
+
+    async def run(self, name: str, awaitable: Awaitable[T]) -> T:
+        """
+        Await `awaitable`, timing it as phase `name`.
+
+        Args:
+            name: Phase name
+            awaitable: Init step to run
+
+        Returns:
+            The awaitable's result
+        """
+        with self.phase(name):
+            return await awaitable
+
+    @property
+    def total_ms(self) -> float:
+        """Milliseconds since profiling started."""
+        return round((time.perf_counter_ns() - self.started_ns) / 1_000_000, 2)
+
+    def report(self) -> None:
+        """Log the total startup time and each phase."""
+        logger.info("Startup profile", total_ms=self.total_ms, phases=self.phases)
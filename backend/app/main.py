@@ -2,18 +2,26 @@
 Main FastAPI application for YogaFlow backend.
 Entry point for the API server.
 """
+import asyncio
+import time
 from contextlib import asynccontextmanager
-from pathlib import Path
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app import IMPORT_STARTED_NS
 from app.core.config import settings
-from app.core.database import init_database, close_database
-from app.core.logging_config import logger
+from app.core.database import ReadOnlySessionLocal, engine, init_database, close_database
+from app.core.health import NOT_READY, health_state, readiness
+from app.core.loop_watchdog import loop_watchdog
+from app.core.logging_config import logger, shutdown_logging
 from app.core.monitoring import init_sentry
+from app.core.startup import StartupProfiler
+from app.core import metrics
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.request_logging import RequestLoggingMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.error_handler import (
@@ -22,13 +30,18 @@ from app.middleware.error_handler import (
     general_exception_handler,
 )
 from app.core.rate_limit import setup_rate_limiting, limiter, custom_rate_limit_exceeded_handler
-from app.api.v1.endpoints import auth, poses, upload, sequences, sessions, history, profile
+from app.api.v1.endpoints import auth, poses, upload, sequences, sessions, history, profile, images, media
+from app.services.image_manifest import derivatives_directory, image_manifest
 try:
     from app.api.v1.admin import sequences as admin_sequences
     HAS_ADMIN_SEQUENCES = True
 except ImportError:
     HAS_ADMIN_SEQUENCES = False
 
+startup_profiler = StartupProfiler(started_ns=IMPORT_STARTED_NS)
+startup_profiler.record("imports", IMPORT_STARTED_NS)
+_app_setup_started_ns = time.perf_counter_ns()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,29 +52,82 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting YogaFlow API", version=settings.app_version, environment=settings.environment)
 
-    # Initialize monitoring (Sentry)
-    init_sentry()
+    from app.services.asset_manifest import asset_manifest
+    from app.services.token_blacklist import init_token_blacklist
+
+    # Independent init steps run concurrently: monitoring (Sentry, in a
+    # thread since its import and setup are blocking), token blacklist
+    # (Redis), the asset and image manifests and, in development only, table
+    # creation. Other environments manage the schema with Alembic. The
+    # manifests (the asset manifest is built in memory in development) are
+    # ready before serving, so URL and media lookups never read them on the
+    # event loop.
 
-    # Initialize database
-    await init_database()
+    init_steps = [
+        startup_profiler.run("sentry", asyncio.to_thread(init_sentry)),
+        startup_profiler.run("token_blacklist", init_token_blacklist()),
+        startup_profiler.run("asset_manifest", asset_manifest.prepare()),
+        startup_profiler.run("image_manifest", image_manifest.prepare()),
+    ]
+    if settings.environment == "development":
+        init_steps.append(startup_profiler.run("create_all", init_database()))
+    with startup_profiler.phase("init"):
+        await asyncio.gather(*init_steps)
 
-    # Initialize token blacklist (Redis)
-    from app.services.token_blacklist import init_token_blacklist
-    await init_token_blacklist()
+    # Measure event loop lag and log stacks of blocking calls
+    if settings.loop_watchdog_enabled:
+        loop_watchdog.start()
 
-    logger.info("Application startup complete")
+    # Prewarm caches in the background; /health/ready reports not_ready
+    # until this finishes so load balancers skip cold workers
+    from app.services.catalog_cache import catalog_cache
+    prewarm_task = asyncio.create_task(catalog_cache.prewarm(ReadOnlySessionLocal))
+
+    # Share metrics between workers via snapshot files
+    snapshot_task = None
+    if settings.metrics_enabled and settings.metrics_multiproc_dir:
+        snapshot_task = asyncio.create_task(
+            metrics.registry.run_snapshot_writer(settings.metrics_snapshot_interval_seconds)
+        )
+
+    # Derivatives generated by other workers
+    manifest_refresh_task = None
+    if settings.image_manifest_refresh_seconds > 0:
+        manifest_refresh_task = asyncio.create_task(
+            image_manifest.run_refresher(settings.image_manifest_refresh_seconds)
+        )
+
+    logger.info("Application startup complete", startup_ms=startup_profiler.total_ms)
+    if settings.startup_profile:
+        startup_profiler.report()
 
     yield
 
     # Shutdown
     logger.info("Shutting down YogaFlow API")
+    health_state.shutting_down = True
+    prewarm_task.cancel()
+
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    if manifest_refresh_task is not None:
+        manifest_refresh_task.cancel()
 
     # Close token blacklist
     from app.services.token_blacklist import close_token_blacklist
     await close_token_blacklist()
 
+    # Close rate limit store (Redis connection pool, if any)
+    await limiter.close()
+
+    # Let queued image jobs finish, then stop the image process pool
+    from app.services.upload_service import shutdown_image_pool
+    await shutdown_image_pool()
+
+    await loop_watchdog.stop()
     await close_database()
     logger.info("Application shutdown complete")
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -93,7 +159,11 @@ app.add_middleware(
 # Security headers middleware
 app.add_middleware(SecurityHeadersMiddleware, environment=settings.environment)
 
-# Request logging middleware
+# Metrics middleware
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Request logging middleware (outermost; owns the per-request query stats)
 app.add_middleware(RequestLoggingMiddleware)
 
 # Exception handlers
@@ -112,11 +182,17 @@ app.include_router(profile.router, prefix=settings.api_v1_prefix)
 if HAS_ADMIN_SEQUENCES:
     app.include_router(admin_sequences.router, prefix=settings.api_v1_prefix)
 
-# Mount static files for development (images, etc.)
-content_dir = Path(__file__).parent.parent.parent / "content"
-if content_dir.exists():
-    app.mount("/images", StaticFiles(directory=str(content_dir / "images")), name="images")
-    logger.info("Static files mounted", path=str(content_dir / "images"))
+# Media routes (/images, /audio) come last; more specific image routes first
+app.include_router(images.router)
+# Responsive derivatives are generated at runtime
+app.mount(
+    "/images/derivatives",
+    StaticFiles(directory=str(derivatives_directory()), check_dir=False),
+    name="image_derivatives",
+)
+app.include_router(media.router)
+
+startup_profiler.record("app_setup", _app_setup_started_ns)
 
 
 @app.get("/", tags=["Root"])
@@ -151,6 +227,57 @@ async def health_check():
     }
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness_check():
+    """
+    Liveness probe.
+
+    Does no I/O, so it only fails if the process cannot serve requests.
+    Dependency problems show up in /health/ready instead.
+
+    Returns:
+        dict: Liveness status
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness probe.
+
+    Checks database reachability and pool saturation, Redis round trip,
+    catalog cache warmth and event loop lag. Returns 503 while not ready
+    (cold caches, database down, shutting down); degraded states such as
+    Redis being down with fallbacks active still return 200.
+
+    Returns:
+        JSONResponse: Overall status and per-check details
+    """
+    # Prefer the watchdog's continuous measurement over a one-off probe
+    lag_ms = loop_watchdog.lag_seconds * 1000 if loop_watchdog.running else None
+    report = await readiness(engine, lag_ms=lag_ms)
+    status_code = 503 if report["status"] == NOT_READY else 200
+    return JSONResponse(report, status_code=status_code)
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics_endpoint() -> Response:
+        """
+        Prometheus metrics endpoint.
+
+        Returns:
+            Response: Metrics in Prometheus text exposition format
+        """
+        if metrics.registry.multiproc_dir:
+            # Merging worker snapshots reads files; keep it off the event loop
+            content = await asyncio.to_thread(metrics.registry.render)
+        else:
+            content = metrics.registry.render()
+        return Response(content=content, media_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
 
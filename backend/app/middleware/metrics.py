@@ -0,0 +1,64 @@
+"""
+Metrics middleware for YogaFlow.
+Records per-route latency, in-flight requests and queries per request.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import QueryStats, current_query_stats
+from app.core.metrics import (
+    db_queries_per_request,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    route_template,
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request metrics.
+
+    Latency is labelled with the route template (e.g. /api/v1/poses/{pose_id})
+    rather than the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        # Reuse the request's stats when RequestLoggingMiddleware set them
+        query_stats = current_query_stats.get()
+        token = None
+        if query_stats is None:
+            query_stats = QueryStats(scope=scope)
+            token = current_query_stats.set(query_stats)
+        http_requests_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            if token is not None:
+                current_query_stats.reset(token)
+
+            route_path = route_template(scope)
+            http_request_duration_seconds.observe(
+                (time.perf_counter_ns() - start_ns) / 1e9,
+                method=scope["method"],
+                route=route_path,
+                status=str(status_code),
+            )
+            db_queries_per_request.observe(query_stats.count, route=route_path)
@@ -3,15 +3,18 @@ Request logging middleware for YogaFlow.
 Logs all HTTP requests with timing information.
 """
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
-from app.core.logging_config import log_request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.config import settings
+from app.core.database import QueryBudgetExceeded, QueryStats, current_query_stats
+from app.core.logging_config import log_request, logger
+from app.core.metrics import route_template
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+
+class RequestLoggingMiddleware:
     """
-    Middleware to log all HTTP requests with timing.
+    Pure ASGI middleware to log all HTTP requests with timing.
 
     Logs:
     - HTTP method
@@ -19,37 +22,85 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     - Status code
     - Response time in milliseconds
     - Client IP (if available)
+    - SQL statement count and total DB time
+
+    DB totals are also returned in a Server-Timing header. Requests that
+    exceed QUERY_BUDGET_PER_REQUEST are logged, and raise
+    QueryBudgetExceeded when QUERY_BUDGET_STRICT is on so tests fail.
+
+    Implemented as raw ASGI rather than BaseHTTPMiddleware so responses
+    are streamed straight through without extra tasks or memory streams.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request and log details.
 
         Args:
-            request: Incoming request
-            call_next: Next middleware/route handler
-
-        Returns:
-            Response from next handler
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        query_stats = QueryStats(parent=current_query_stats.get(), scope=scope)
+        token = current_query_stats.set(query_stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                server_timing = (
+                    f'db;dur={query_stats.duration_ms:.2f};desc="{query_stats.count} queries", '
+                    f"app;dur={elapsed_ms:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", server_timing.encode("latin-1"))
+                ]
+            await send(message)
 
-        # Process request
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
 
-        # Calculate duration
-        duration_ms = (time.time() - start_time) * 1000
+            # Calculate duration
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
+            # Get client IP
+            client = scope.get("client")
+            client_ip = client[0] if client else "unknown"
 
-        # Log request
-        log_request(
-            method=request.method,
-            path=str(request.url.path),
-            status_code=response.status_code,
-            duration_ms=round(duration_ms, 2),
-            client_ip=client_ip
-        )
+            # Log request
+            log_request(
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=round(duration_ms, 2),
+                client_ip=client_ip,
+                db_queries=query_stats.count,
+                db_time_ms=round(query_stats.duration_ms, 2),
+            )
 
-        return response
+        budget = settings.query_budget_per_request
+        if budget and query_stats.count > budget:
+            route = route_template(scope)
+            logger.warning(
+                "Query budget exceeded",
+                route=route,
+                method=scope["method"],
+                db_queries=query_stats.count,
+                budget=budget,
+            )
+            if settings.query_budget_strict:
+                raise QueryBudgetExceeded(
+                    f"{scope['method']} {route} executed {query_stats.count} queries (budget {budget})"
+                )
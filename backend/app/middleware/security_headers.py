@@ -2,14 +2,82 @@
 Security headers middleware for YogaFlow API.
 Adds security headers to all responses.
 """
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+def build_security_headers(environment: str) -> list[tuple[bytes, bytes]]:
     """
-    Middleware to add security headers to all responses.
+    Build the security header list for an environment.
+
+    Args:
+        environment: Deployment environment (production enables HSTS and strict CSP)
+
+    Returns:
+        list[tuple[bytes, bytes]]: Raw ASGI header tuples
+    """
+    headers = {
+        # Prevent MIME type sniffing
+        "X-Content-Type-Options": "nosniff",
+        # Prevent clickjacking
+        "X-Frame-Options": "DENY",
+        # XSS Protection
+        "X-XSS-Protection": "1; mode=block",
+        # Referrer policy
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+
+    # HSTS (HTTP Strict Transport Security) - Production only
+    if environment == "production":
+        # Force HTTPS for 1 year, include subdomains
+        headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+
+    # Content Security Policy
+    # Production: Strict CSP without unsafe directives
+    # Development: More permissive for development tools
+    if environment == "production":
+        csp_directives = [
+            "default-src 'self'",
+            "script-src 'self'",  # No unsafe-inline or unsafe-eval in production
+            "style-src 'self'",  # No unsafe-inline in production
+            "img-src 'self' data: https:",  # Allow images from HTTPS and data URIs
+            "font-src 'self' data:",
+            "connect-src 'self'",  # API calls to same origin only
+            "frame-ancestors 'none'",  # Prevent embedding in iframes
+            "base-uri 'self'",
+            "form-action 'self'",
+            "upgrade-insecure-requests"  # Upgrade HTTP to HTTPS
+        ]
+    else:
+        # Development CSP - more permissive for hot reload, etc.
+        csp_directives = [
+            "default-src 'self'",
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Dev tools need this
+            "style-src 'self' 'unsafe-inline'",
+            "img-src 'self' data: https:",
+            "font-src 'self' data:",
+            "connect-src 'self' ws: wss:",  # WebSocket for hot reload
+            "frame-ancestors 'none'",
+            "base-uri 'self'",
+            "form-action 'self'"
+        ]
+    headers["Content-Security-Policy"] = "; ".join(csp_directives)
+
+    # Permissions Policy (formerly Feature-Policy)
+    permissions_directives = [
+        "geolocation=()",
+        "microphone=()",
+        "camera=()",
+        "payment=()",
+        "usb=()"
+    ]
+    headers["Permissions-Policy"] = ", ".join(permissions_directives)
+
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI middleware to add security headers to all responses.
 
     Headers added:
     - X-Content-Type-Options: Prevent MIME sniffing
@@ -18,72 +86,29 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Strict-Transport-Security: Force HTTPS (production only)
     - Content-Security-Policy: Restrict resource loading
     - Referrer-Policy: Control referrer information
+
+    Header tuples are computed once at startup and injected when the
+    response starts, replacing any same-named headers set by handlers.
     """
 
-    def __init__(self, app, environment: str = "development"):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, environment: str = "development"):
+        self.app = app
         self.environment = environment
+        self.headers = build_security_headers(environment)
+        self.header_names = frozenset(name for name, _ in self.headers)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add security headers to response."""
-        response: Response = await call_next(request)
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # XSS Protection
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # HSTS (HTTP Strict Transport Security) - Production only
-        if self.environment == "production":
-            # Force HTTPS for 1 year, include subdomains
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-
-        # Content Security Policy
-        # Production: Strict CSP without unsafe directives
-        # Development: More permissive for development tools
-        if self.environment == "production":
-            csp_directives = [
-                "default-src 'self'",
-                "script-src 'self'",  # No unsafe-inline or unsafe-eval in production
-                "style-src 'self'",  # No unsafe-inline in production
-                "img-src 'self' data: https:",  # Allow images from HTTPS and data URIs
-                "font-src 'self' data:",
-                "connect-src 'self'",  # API calls to same origin only
-                "frame-ancestors 'none'",  # Prevent embedding in iframes
-                "base-uri 'self'",
-                "form-action 'self'",
-                "upgrade-insecure-requests"  # Upgrade HTTP to HTTPS
-            ]
-        else:
-            # Development CSP - more permissive for hot reload, etc.
-            csp_directives = [
-                "default-src 'self'",
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Dev tools need this
-                "style-src 'self' 'unsafe-inline'",
-                "img-src 'self' data: https:",
-                "font-src 'self' data:",
-                "connect-src 'self' ws: wss:",  # WebSocket for hot reload
-                "frame-ancestors 'none'",
-                "base-uri 'self'",
-                "form-action 'self'"
-            ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        # Permissions Policy (formerly Feature-Policy)
-        permissions_directives = [
-            "geolocation=()",
-            "microphone=()",
-            "camera=()",
-            "payment=()",
-            "usb=()"
-        ]
-        response.headers["Permissions-Policy"] = ", ".join(permissions_directives)
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                existing = message.get("headers", [])
+                message["headers"] = [
+                    header for header in existing if header[0].lower() not in self.header_names
+                ] + self.headers
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,285 @@
+"""
+Content asset manifest for YogaFlow.
+
+Maps logical asset paths under the content directory (e.g.
+'images/poses/warrior-pose.jpg', 'audio/poses/boat-pose.mp3') to their
+SHA-256, size and modification time. Media serving uses it for strong
+ETags and to resolve content-hashed URLs such as
+'images/poses/warrior-pose.3f2a9c1e4b5d.jpg', which can be cached forever.
+
+Build it at deploy time:
+    python -m app.services.asset_manifest
+
+It is loaded once per process at startup (prepare(), awaited before the
+app serves requests) and used by CDNService to generate content-hashed
+URLs. In development a missing manifest is built in memory at startup
+instead. Scripts using it outside the app call load() themselves. Entries whose file has
+changed size or mtime since the build are not used for ETags.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# Content subdirectories served as media
+MEDIA_DIRECTORIES = ("images", "audio", "videos")
+
+# Hex digits of the SHA-256 embedded in hashed URLs
+URL_HASH_LENGTH = 12
+
+# Text formats worth storing gzip variants of; images and audio are
+# already compressed
+COMPRESSIBLE_EXTENSIONS = {".svg", ".json", ".txt", ".vtt", ".css", ".js", ".html", ".md"}
+
+# Don't bother compressing tiny files
+MIN_COMPRESS_SIZE = 1024
+
+_HASHED_PATH = re.compile(rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{URL_HASH_LENGTH}}})(?P<suffix>\.[^./]+)$")
+
+
+def hash_file(path: Path) -> str:
+    """
+    SHA-256 of a file, read in chunks.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_object:
+        for chunk in iter(lambda: file_object.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_name(logical_path: str, digest: str) -> str:
+    """Insert a content hash before the extension: a/b.jpg -> a/b.<hash>.jpg."""
+    path = Path(logical_path)
+    return str(path.with_name(f"{path.stem}.{digest[:URL_HASH_LENGTH]}{path.suffix}"))
+
+
+def write_gzip_variant(path: Path) -> bool:
+    """
+    Write `path`.gz next to a compressible file if it saves space.
+
+    Args:
+        path: Source file
+
+    Returns:
+        bool: True if a variant was written
+    """
+    data = path.read_bytes()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data) * 0.9:
+        return False
+    path.with_name(f"{path.name}.gz").write_bytes(compressed)
+    return True
+
+
+class AssetManifest:
+    """
+    In-memory view of the asset manifest, loaded once.
+
+    Args:
+        root: Content directory (default: CONTENT_DIRECTORY)
+        manifest_path: Manifest file (default: ASSET_MANIFEST_PATH, or
+            asset-manifest.json in the content directory)
+    """
+
+    def __init__(self, root: Optional[Path] = None, manifest_path: Optional[Path] = None):
+        self._root = root
+        self._manifest_path = manifest_path
+        self._assets: Optional[dict[str, dict]] = None
+
+    @property
+    def root(self) -> Path:
+        return self._root or Path(settings.content_directory)
+
+    @property
+    def manifest_path(self) -> Path:
+        if self._manifest_path is not None:
+            return self._manifest_path
+        if settings.asset_manifest_path:
+            return Path(settings.asset_manifest_path)
+        return self.root / "asset-manifest.json"
+
+    @property
+    def loaded(self) -> bool:
+        return self._assets is not None
+
+    @property
+    def assets(self) -> dict[str, dict]:
+        # Never read the file here: lookups run on the event loop
+        return self._assets or {}
+
+    def load(self) -> bool:
+        """
+        Read the manifest file.
+
+        Returns:
+            bool: True if a manifest was loaded
+        """
+        try:
+            data = json.loads(self.manifest_path.read_text())
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as error:
+            logger.warning("Unreadable asset manifest", path=str(self.manifest_path), error=str(error))
+            return False
+        self._assets = data.get("assets", {})
+        logger.info("Asset manifest loaded", path=str(self.manifest_path), assets=len(self._assets))
+        return True
+
+    def build(self, directories: Iterable[str] = MEDIA_DIRECTORIES, precompress: bool = False) -> int:
+        """
+        Hash every asset under the media directories.
+
+        Args:
+            directories: Content subdirectories to include
+            precompress: Also write .gz variants of compressible files
+
+        Returns:
+            int: Number of assets
+        """
+        assets = {}
+        for directory in directories:
+            base = self.root / directory
+            if not base.is_dir():
+                continue
+            for path in sorted(base.rglob("*")):
+                if not path.is_file() or path.name.startswith(".") or path.suffix == ".gz":
+                    continue
+                stat = path.stat()
+                entry = {
+                    "sha256": hash_file(path),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "encodings": [],
+                }
+                gzip_path = path.with_name(f"{path.name}.gz")
+                if path.suffix.lower() in COMPRESSIBLE_EXTENSIONS and stat.st_size >= MIN_COMPRESS_SIZE:
+                    if (precompress and write_gzip_variant(path)) or (not precompress and gzip_path.is_file()):
+                        entry["encodings"].append("gzip")
+                assets[path.relative_to(self.root).as_posix()] = entry
+        self._assets = assets
+        return len(assets)
+
+    def save(self) -> None:
+        """Write the manifest file atomically."""
+        temp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.tmp")
+        temp_path.write_text(json.dumps({"version": 1, "assets": self.assets}, indent=1, sort_keys=True))
+        os.replace(temp_path, self.manifest_path)
+
+    async def prepare(self) -> None:
+        """
+        Load the manifest at startup, building it in memory in development.
+
+        Runs the file work in a thread so startup stays responsive.
+        """
+        if await asyncio.to_thread(self.load):
+            return
+        if settings.environment == "development":
+            count = await asyncio.to_thread(self.build)
+            logger.info("Asset manifest built in memory", assets=count)
+        else:
+            logger.warning("No asset manifest; using stat-based ETags", path=str(self.manifest_path))
+
+    def entry(self, logical_path: str, stat_result: Optional[os.stat_result] = None) -> Optional[dict]:
+        """
+        Get the manifest entry for an asset.
+
+        Args:
+            logical_path: Path relative to the content directory
+            stat_result: Current stat of the file; if given, a stale entry
+                (size or mtime changed since the build) is ignored
+
+        Returns:
+            Optional[dict]: Entry with sha256, size, mtime_ns and encodings
+        """
+        entry = self.assets.get(logical_path.lstrip("/"))
+        if entry is None or stat_result is None:
+            return entry
+        if entry["size"] != stat_result.st_size or entry["mtime_ns"] != stat_result.st_mtime_ns:
+            return None
+        return entry
+
+    def hashed_path(self, logical_path: str) -> Optional[str]:
+        """
+        Get the content-hashed form of an asset path.
+
+        The file is stat'ed so that an asset changed since the manifest was
+        built (e.g. edited in development) gets its plain URL rather than a
+        hashed URL for content it no longer has.
+
+        Args:
+            logical_path: Path relative to the content directory
+
+        Returns:
+            Optional[str]: e.g. 'images/poses/x.3f2a9c1e4b5d.jpg', or None if
+                the asset is not in the manifest or has changed since
+        """
+        logical_path = logical_path.lstrip("/")
+        if logical_path not in self.assets:
+            return None
+        try:
+            stat_result = os.stat(self.root / logical_path)
+        except OSError:
+            return None
+        entry = self.entry(logical_path, stat_result)
+        if entry is None:
+            return None
+        return hashed_name(logical_path, entry["sha256"])
+
+    def resolve(self, path: str) -> tuple[str, bool]:
+        """
+        Map a requested path to its logical path.
+
+        The hash is checked against the manifest only; callers must also
+        confirm the entry is current with entry(logical_path, stat_result)
+        before serving the response as immutable.
+
+        Args:
+            path: Requested path relative to the content directory
+
+        Returns:
+            tuple[str, bool]: (logical path, whether the request used a
+                hashed path matching the manifest)
+        """
+        match = _HASHED_PATH.match(path)
+        if match is not None:
+            logical_path = match["stem"] + match["suffix"]
+            entry = self.entry(logical_path)
+            if entry is not None and entry["sha256"].startswith(match["hash"]):
+                return logical_path, True
+        return path, False
+
+
+# Global asset manifest instance
+asset_manifest = AssetManifest()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the content asset manifest")
+    parser.add_argument(
+        "--no-precompress",
+        action="store_true",
+        help="Don't write .gz variants (e.g. when the content directory is read-only)",
+    )
+    args = parser.parse_args()
+
+    manifest = AssetManifest()
+    total = manifest.build(precompress=not args.no_precompress)
+    manifest.save()
+    total_bytes = sum(entry["size"] for entry in manifest.assets.values())
+    print(f"Wrote {total} assets ({total_bytes / 1024 / 1024:.1f}MB) to {manifest.manifest_path}")
@@ -10,8 +10,8 @@ from fastapi import HTTPException, status
 
 from app.models.user import User
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     validate_password_strength,
     create_access_token,
     create_refresh_token,
@@ -66,7 +66,7 @@ async def register_user(
         )
 
     # Hash password
-    password_hash = hash_password(user_data.password)
+    password_hash = await hash_password_async(user_data.password)
 
     # Generate email verification token
     verification_token = generate_verification_token()
@@ -157,7 +157,7 @@ async def authenticate_user(
                 user.failed_login_attempts = 0
             await db_session.flush()
 
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await verify_password_async(login_data.password, user.password_hash):
         # Failed login - increment attempts (with backward compatibility)
         if user and hasattr(user, 'failed_login_attempts'):
             user.failed_login_attempts += 1
@@ -510,7 +510,7 @@ async def reset_password(
         )
 
     # Update password
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.password_reset_token = None
     user.password_reset_expires = None
     await db_session.flush()
@@ -0,0 +1,175 @@
+"""
+Catalog cache for YogaFlow.
+
+Caches catalog aggregates that only change when admins edit content
+(e.g. sequence counts per category) in process memory. Entries expire
+after CATALOG_CACHE_TTL_SECONDS and are invalidated on admin writes
+(other workers pick up the change when their entry expires).
+The cache is prewarmed on startup; /health/ready waits for that.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import record_cache_access
+from app.models.sequence import Sequence
+
+Loader = Callable[[AsyncSession], Awaitable[Any]]
+
+SEQUENCE_CATEGORIES = "sequence_categories"
+
+# Seconds between prewarm attempts while the database is unavailable
+PREWARM_RETRY_SECONDS = 5.0
+
+
+class CatalogCache:
+    """
+    In-process TTL cache of catalog data, loaded by registered loaders.
+
+    Concurrent misses for the same key share a single load.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._loaders: dict[str, Loader] = {}
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.warm = False
+
+    def register(self, key: str) -> Callable[[Loader], Loader]:
+        """
+        Register the loader for `key`.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decorator registering an async loader taking a session
+        """
+        def decorator(loader: Loader) -> Loader:
+            self._loaders[key] = loader
+            return loader
+
+        return decorator
+
+    async def get(self, key: str, db_session: AsyncSession) -> Any:
+        """
+        Get a cached value, loading it with `db_session` on a miss.
+
+        Args:
+            key: Registered cache key
+            db_session: Session used if the value has to be loaded
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            record_cache_access("catalog", hit=True)
+            return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have loaded it while we waited
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                record_cache_access("catalog", hit=True)
+                return entry[1]
+
+            record_cache_access("catalog", hit=False)
+            value = await self._loaders[key](db_session)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop one entry, or every entry when `key` is None.
+
+        Args:
+            key: Cache key to drop
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def prewarm(self, session_factory: async_sessionmaker) -> None:
+        """
+        Load every registered key, retrying until the database is reachable.
+
+        Args:
+            session_factory: Factory for the sessions used to load entries
+        """
+        start = time.perf_counter()
+        while True:
+            try:
+                async with session_factory() as session:
+                    for key in self._loaders:
+                        self.invalidate(key)
+                        await self.get(key, session)
+                break
+            except Exception as error:
+                logger.warning("Catalog cache prewarm failed - retrying", error=str(error))
+                await asyncio.sleep(PREWARM_RETRY_SECONDS)
+
+        self.warm = True
+        logger.info(
+            "Catalog cache warmed",
+            keys=list(self._loaders),
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+# Global catalog cache instance
+catalog_cache = CatalogCache(ttl_seconds=settings.catalog_cache_ttl_seconds)
+
+
+@catalog_cache.register(SEQUENCE_CATEGORIES)
+async def load_sequence_categories(db_session: AsyncSession) -> dict:
+    """
+    Count sequences by difficulty, focus area, style and duration range.
+
+    Args:
+        db_session: Database session
+
+    Returns:
+        dict: Fields for SequenceCategoriesResponse
+    """
+    grouped = {}
+    for field_name, column in (
+        ("by_difficulty", Sequence.difficulty_level),
+        ("by_focus_area", Sequence.focus_area),
+        ("by_style", Sequence.style),
+    ):
+        result = await db_session.execute(
+            select(column, func.count(Sequence.sequence_id).label("count")).group_by(column)
+        )
+        grouped[field_name] = {_enum_value(row[0]): row.count for row in result}
+
+    duration_ranges = {
+        "0-15": (0, 15),
+        "16-30": (16, 30),
+        "31-45": (31, 45),
+        "46+": (46, 999)
+    }
+    by_duration = {}
+    for range_name, (min_dur, max_dur) in duration_ranges.items():
+        result = await db_session.execute(
+            select(func.count(Sequence.sequence_id)).where(
+                Sequence.duration_minutes >= min_dur,
+                Sequence.duration_minutes <= max_dur
+            )
+        )
+        by_duration[range_name] = result.scalar() or 0
+    grouped["by_duration"] = by_duration
+
+    return grouped
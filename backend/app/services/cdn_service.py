@@ -1,10 +1,16 @@
 """
 CDN service for YogaFlow.
 Handles CDN URL generation for static assets (images, videos).
+
+Assets listed in the asset manifest get content-hashed URLs
+(e.g. /images/poses/warrior-pose.3f2a9c1e4b5d.jpg), so they can be cached
+as immutable and a changed file gets a new URL instead of needing a purge.
+Assets missing from the manifest keep their plain URLs.
 """
 from typing import Optional
 from app.core.config import settings
-from app.core.logging_config import logger
+from app.services.asset_manifest import asset_manifest
+from app.services.image_manifest import DERIVATIVES_URL_PREFIX, image_manifest
 
 
 class CDNService:
@@ -13,64 +19,97 @@ class CDNService:
     Supports local development and production CDN configurations.
     """
 
-    def get_image_url(self, path: str) -> str:
+    def _base_url(self, directory: str) -> str:
+        if not settings.cdn_enabled:
+            return f"/{directory}"
+        return f"{settings.cdn_base_url}/{directory}"
+
+    def _image_base_url(self) -> str:
+        return self._base_url("images")
+
+    def get_image_url(
+        self,
+        path: str,
+        width: Optional[int] = None,
+        image_format: Optional[str] = None,
+    ) -> str:
         """
         Get CDN URL for an image.
 
+        If responsive derivatives exist for the image, the URL points at the
+        smallest one at least `width` pixels wide (the largest when no width
+        is given). Otherwise the source image URL is returned.
+
         Args:
             path: Relative image path (e.g., 'poses/warrior-pose.jpg')
+            width: Optional display width in pixels
+            image_format: Optional derivative format (avif, webp, jpeg)
 
         Returns:
             str: Full CDN URL or local URL if CDN disabled
 
         Examples:
             >>> cdn_service.get_image_url('poses/warrior-pose.jpg')
-            'https://cdn.yogaflow.app/images/poses/warrior-pose.jpg'
+            'https://cdn.yogaflow.app/images/poses/warrior-pose.3f2a9c1e4b5d.jpg'
 
             >>> cdn_service.get_image_url('/poses/warrior-pose.jpg')  # Leading slash ok
-            'https://cdn.yogaflow.app/images/poses/warrior-pose.jpg'
+            'https://cdn.yogaflow.app/images/poses/warrior-pose.3f2a9c1e4b5d.jpg'
         """
         # Remove leading slash if present
         clean_path = path.lstrip('/')
 
-        if not settings.cdn_enabled:
-            return f"/images/{clean_path}"
+        variant = image_manifest.best_fit(clean_path, width=width, image_format=image_format)
+        if variant is not None:
+            return f"{self._image_base_url()}/{DERIVATIVES_URL_PREFIX}/{variant['file']}"
 
-        return f"{settings.cdn_base_url}/images/{clean_path}"
+        return self.get_asset_url(clean_path, "images")
 
     def get_thumbnail_url(
         self,
         path: str,
         width: Optional[int] = None,
-        height: Optional[int] = None
+        height: Optional[int] = None,
+        image_format: Optional[str] = None,
     ) -> str:
         """
         Get CDN URL for image thumbnail with optional resizing.
 
+        Resolves to the smallest pre-generated derivative covering the
+        requested box, falling back to the source image when the image has
+        no derivatives.
+
         Args:
             path: Relative image path
             width: Optional thumbnail width in pixels
             height: Optional thumbnail height in pixels
+            image_format: Optional derivative format (avif, webp, jpeg)
 
         Returns:
             str: Full CDN URL for thumbnail
+        """
+        clean_path = path.lstrip('/')
 
-        Note:
-            Image resizing requires CloudFlare paid plan or custom image processor.
-            For MVP, returns standard image URL.
+        variant = image_manifest.best_fit(clean_path, width=width, height=height, image_format=image_format)
+        if variant is not None:
+            return f"{self._image_base_url()}/{DERIVATIVES_URL_PREFIX}/{variant['file']}"
+
+        return self.get_image_url(clean_path)
+
+    def get_image_srcset(self, path: str, image_format: Optional[str] = None) -> str:
         """
-        # For MVP, return standard image URL
-        # TODO: Implement image resizing when CDN supports it
-        base_url = self.get_image_url(path)
+        Build an HTML srcset attribute value from an image's derivatives.
 
-        if width or height:
-            logger.debug(
-                f"Image resizing requested but not yet implemented: {path}",
-                width=width,
-                height=height
-            )
+        Args:
+            path: Relative image path
+            image_format: Optional derivative format (avif, webp, jpeg)
 
-        return base_url
+        Returns:
+            str: e.g. '<url> 320w, <url> 640w', or '' if there are no derivatives
+        """
+        return ", ".join(
+            f"{self._image_base_url()}/{variant_path} {width}w"
+            for variant_path, width in image_manifest.srcset(path.lstrip('/'), image_format)
+        )
 
     def get_video_url(self, path: str) -> str:
         """
@@ -82,21 +121,17 @@ class CDNService:
         Returns:
             str: Full CDN URL or local URL if CDN disabled
         """
-        # Remove leading slash if present
-        clean_path = path.lstrip('/')
-
-        if not settings.cdn_enabled:
-            return f"/videos/{clean_path}"
-
-        return f"{settings.cdn_base_url}/videos/{clean_path}"
+        return self.get_asset_url(path, "videos")
 
     def get_asset_url(self, path: str, asset_type: str = "static") -> str:
         """
         Get CDN URL for any static asset.
 
+        Uses the content-hashed path when the asset is in the manifest.
+
         Args:
             path: Relative asset path
-            asset_type: Asset type directory (e.g., 'static', 'downloads')
+            asset_type: Asset type directory (e.g., 'static', 'audio', 'downloads')
 
         Returns:
             str: Full CDN URL or local URL if CDN disabled
@@ -104,10 +139,25 @@ class CDNService:
         # Remove leading slash if present
         clean_path = path.lstrip('/')
 
-        if not settings.cdn_enabled:
-            return f"/{asset_type}/{clean_path}"
+        hashed_path = asset_manifest.hashed_path(f"{asset_type}/{clean_path}")
+        if hashed_path is not None:
+            return f"{self._base_url(asset_type)}/{hashed_path.split('/', 1)[1]}"
 
-        return f"{settings.cdn_base_url}/{asset_type}/{clean_path}"
+        return f"{self._base_url(asset_type)}/{clean_path}"
+
+    def get_asset_size(self, path: str, asset_type: str = "static") -> Optional[int]:
+        """
+        Get an asset's size in bytes from the manifest.
+
+        Args:
+            path: Relative asset path
+            asset_type: Asset type directory
+
+        Returns:
+            Optional[int]: Size, or None if the asset is not in the manifest
+        """
+        entry = asset_manifest.entry(f"{asset_type}/{path.lstrip('/')}")
+        return entry["size"] if entry is not None else None
 
     def is_cdn_enabled(self) -> bool:
         """
@@ -123,7 +173,7 @@ class CDNService:
         Get appropriate Cache-Control header for asset type.
 
         Args:
-            asset_type: Type of asset (image, video, static)
+            asset_type: Type of asset (image, video, audio, static, dynamic, revalidate)
 
         Returns:
             str: Cache-Control header value
@@ -131,8 +181,10 @@ class CDNService:
         cache_headers = {
             "image": "public, max-age=31536000, immutable",  # 1 year
             "video": "public, max-age=31536000, immutable",  # 1 year
+            "audio": "public, max-age=31536000, immutable",  # 1 year
             "static": "public, max-age=86400",  # 1 day
             "dynamic": "public, max-age=300",  # 5 minutes
+            "revalidate": "public, no-cache",  # Cache, but check the ETag on every use
         }
 
         return cache_headers.get(asset_type, cache_headers["static"])
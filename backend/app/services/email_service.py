@@ -8,8 +8,6 @@ from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-import aiosmtplib
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
 
 from app.core.config import settings
@@ -23,13 +21,21 @@ class EmailService:
     """
 
     def __init__(self):
-        """Initialize email service with template engine."""
-        # Set up Jinja2 template environment
-        template_dir = Path(__file__).parent.parent / "templates" / "email"
-        self.template_env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        """Initialize email service; the template engine is created on first use."""
+        self.template_dir = Path(__file__).parent.parent / "templates" / "email"
+        self._template_env = None
+
+    @property
+    def template_env(self):
+        """Jinja2 template environment, imported and built on first use."""
+        if self._template_env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+            self._template_env = Environment(
+                loader=FileSystemLoader(str(self.template_dir)),
+                autoescape=select_autoescape(['html', 'xml'])
+            )
+        return self._template_env
 
     async def send_email(
         self,
@@ -82,7 +88,9 @@ class EmailService:
             part2 = MIMEText(html_body, "html")
             message.attach(part2)
 
-            # Send email
+            # Send email (aiosmtplib is only needed once email is actually sent)
+            import aiosmtplib
+
             await aiosmtplib.send(
                 message,
                 hostname=settings.smtp_host,
@@ -0,0 +1,215 @@
+"""
+Manifest of responsive image derivatives for YogaFlow.
+
+Each source image (keyed by its logical path, e.g. 'uploads/<file>.jpg')
+maps to the derivative files generated for it. Every source has its own
+small JSON file under <derivatives dir>/manifests, so concurrent workers
+never overwrite each other's entries.
+
+Entries are loaded once per process at startup (prepare()) and lookups
+only use memory, since they run on the event loop while generating URLs.
+Entries written by other workers are picked up by a periodic refresh
+(run_refresher()) that reads only new files. Scripts using the manifest
+outside the app call load() themselves.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# URL path (under the images root) where derivatives are served
+DERIVATIVES_URL_PREFIX = "derivatives"
+
+# Format used when the caller does not ask for one; every client can decode it
+DEFAULT_FORMAT = "jpeg"
+
+
+class ImageManifest:
+    """
+    Maps logical image paths to their derivatives.
+
+    Args:
+        directory: Directory holding derivative files and the manifests dir
+            (default: derivatives_directory(), resolved on each use)
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._directory = directory
+        self._entries: dict[str, list[dict]] = {}
+        # Manifest file name -> logical path, so refreshes skip known files
+        self._files: dict[str, str] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or derivatives_directory()
+
+    def clear(self) -> None:
+        """Drop the in-memory entries; the next load() re-reads every file."""
+        self._entries.clear()
+        self._files.clear()
+
+    def load(self) -> int:
+        """
+        Read manifest entries from disk, skipping files already loaded.
+
+        Entries whose file was deleted (by another worker) are dropped.
+
+        Returns:
+            int: Number of entries
+        """
+        manifests_dir = self.directory / "manifests"
+        try:
+            names = [entry.name for entry in os.scandir(manifests_dir) if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            names = []
+
+        entries, files = {}, {}
+        for name in names:
+            logical_path = self._files.get(name)
+            if logical_path in self._entries:
+                variants = self._entries[logical_path]
+            else:
+                try:
+                    data = json.loads((manifests_dir / name).read_text())
+                    logical_path, variants = data["path"], data["variants"]
+                except (OSError, ValueError, KeyError) as error:
+                    logger.warning("Unreadable image manifest entry", file=name, error=str(error))
+                    continue
+            entries[logical_path] = variants
+            files[name] = logical_path
+        self._entries, self._files = entries, files
+        return len(entries)
+
+    async def prepare(self) -> None:
+        """Load the entries at startup, in a thread."""
+        count = await asyncio.to_thread(self.load)
+        logger.info("Image manifest loaded", entries=count)
+
+    async def run_refresher(self, interval_seconds: float) -> None:
+        """Background task: periodically pick up entries from other workers."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self.load)
+            except OSError as error:
+                logger.warning("Image manifest refresh failed", error=str(error))
+
+    def _entry_path(self, logical_path: str) -> Path:
+        digest = hashlib.sha1(logical_path.encode()).hexdigest()[:16]
+        return self.directory / "manifests" / f"{digest}.json"
+
+    def record(self, logical_path: str, variants: list[dict]) -> None:
+        """
+        Store the derivatives generated for an image.
+
+        Args:
+            logical_path: Image path relative to the images root
+            variants: Entries from image_processing.generate_responsive_images
+        """
+        from app.services.image_processing import write_atomic
+
+        entry_path = self._entry_path(logical_path)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(entry_path, json.dumps({"path": logical_path, "variants": variants}).encode())
+        self._entries[logical_path] = variants
+        self._files[entry_path.name] = logical_path
+
+    def remove(self, logical_path: str) -> int:
+        """
+        Delete an image's derivative files and manifest entry.
+
+        Args:
+            logical_path: Image path relative to the images root
+
+        Returns:
+            int: Number of derivative files deleted
+        """
+        removed = 0
+        for variant in self.variants(logical_path):
+            path = self.directory / variant["file"]
+            if path.is_file():
+                path.unlink()
+                removed += 1
+        entry_path = self._entry_path(logical_path)
+        entry_path.unlink(missing_ok=True)
+        self._entries.pop(logical_path, None)
+        self._files.pop(entry_path.name, None)
+        return removed
+
+    def variants(self, logical_path: str) -> list[dict]:
+        """
+        Get the derivatives for an image.
+
+        Args:
+            logical_path: Image path relative to the images root
+
+        Returns:
+            list[dict]: Derivative entries, empty if none were generated
+        """
+        # Never read files here: lookups run on the event loop
+        return self._entries.get(logical_path.lstrip("/"), [])
+
+    def best_fit(
+        self,
+        logical_path: str,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        image_format: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Pick the smallest derivative that covers the requested box.
+
+        Args:
+            logical_path: Image path relative to the images root
+            width: Display width in pixels (None = largest available)
+            height: Display height in pixels
+            image_format: Preferred format (default jpeg)
+
+        Returns:
+            Optional[dict]: Derivative entry, or None if there are none
+        """
+        candidates = [
+            variant for variant in self.variants(logical_path)
+            if variant["format"] == (image_format or DEFAULT_FORMAT)
+        ]
+        if not candidates:
+            return None
+        candidates.sort(key=lambda variant: variant["width"])
+        if width is None and height is None:
+            return candidates[-1]
+
+        for variant in candidates:
+            if variant["width"] >= (width or 0) and variant["height"] >= (height or 0):
+                return variant
+        return candidates[-1]
+
+    def srcset(self, logical_path: str, image_format: Optional[str] = None) -> list[tuple[str, int]]:
+        """
+        List (derivative URL path, width) pairs for building a srcset.
+
+        Args:
+            logical_path: Image path relative to the images root
+            image_format: Format to list (default jpeg)
+
+        Returns:
+            list[tuple[str, int]]: Paths relative to the images root, by width
+        """
+        return sorted(
+            (f"{DERIVATIVES_URL_PREFIX}/{variant['file']}", variant["width"])
+            for variant in self.variants(logical_path)
+            if variant["format"] == (image_format or DEFAULT_FORMAT)
+        )
+
+
+def derivatives_directory() -> Path:
+    """Directory where responsive derivatives are written and served from."""
+    return Path(settings.upload_directory) / "images" / DERIVATIVES_URL_PREFIX
+
+
+# Global image manifest instance
+image_manifest = ImageManifest()
@@ -0,0 +1,242 @@
+"""
+CPU-bound image processing for YogaFlow.
+
+Functions here run in worker processes (see upload_service), so this module
+only depends on Pillow and the standard library; it must stay cheap to
+import in a freshly spawned process.
+"""
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from PIL import Image, features
+
+# Encoder settings per derivative format: (Pillow format, file extension, save options)
+DERIVATIVE_FORMATS = {
+    "avif": ("AVIF", "avif", {"quality": 60, "speed": 6}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def read_image_info(path: str) -> Tuple[int, int, str]:
+    """
+    Read dimensions and format from the image header without decoding pixels.
+
+    Args:
+        path: Image file path
+
+    Returns:
+        Tuple of (width, height, format)
+    """
+    with Image.open(path) as image:
+        image.verify()
+        return image.width, image.height, image.format or "JPEG"
+
+
+def optimize(image_data: bytes, max_dimension: int) -> Tuple[bytes, int, int, str]:
+    """
+    Resize an image to fit `max_dimension` and re-encode it compressed.
+
+    Transparent images are flattened onto white so they can be saved as JPEG.
+
+    Args:
+        image_data: Encoded image bytes
+        max_dimension: Maximum width or height in pixels
+
+    Returns:
+        Tuple of (optimized_bytes, width, height, format)
+    """
+    image = Image.open(io.BytesIO(image_data))
+    width, height = image.size
+    image_format = image.format or "JPEG"
+
+    # Convert RGBA to RGB if needed (for JPEG)
+    if image.mode in ("RGBA", "LA", "P"):
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        if image.mode == "P":
+            image = image.convert("RGBA")
+        background.paste(image, mask=image.split()[-1] if image.mode in ("RGBA", "LA") else None)
+        image = background
+
+    # Resize if needed, maintaining aspect ratio
+    if max(width, height) > max_dimension:
+        if width > height:
+            width, height = max_dimension, int(height * (max_dimension / width))
+        else:
+            width, height = int(width * (max_dimension / height)), max_dimension
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    # Compress image
+    output = io.BytesIO()
+    if image_format.upper() in ("JPEG", "JPG"):
+        image.save(output, format="JPEG", quality=85, optimize=True)
+    elif image_format.upper() == "PNG":
+        image.save(output, format="PNG", optimize=True)
+    elif image_format.upper() == "WEBP":
+        image.save(output, format="WEBP", quality=85)
+    else:
+        # Default to JPEG
+        image.save(output, format="JPEG", quality=85, optimize=True)
+        image_format = "JPEG"
+
+    return output.getvalue(), width, height, image_format
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write `data` to `path` via a temp file, fsync and rename.
+
+    Readers never see a partially written file.
+
+    Args:
+        path: Destination path
+        data: File contents
+    """
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, "wb") as file_object:
+        file_object.write(data)
+        file_object.flush()
+        os.fsync(file_object.fileno())
+    os.replace(temp_path, path)
+
+
+def optimize_image_file(source: str, destination: str, max_dimension: int) -> Tuple[int, int, int, str]:
+    """
+    Optimize the image at `source` and write it to `destination`.
+
+    Args:
+        source: Original image path
+        destination: Path for the optimized image
+        max_dimension: Maximum width or height in pixels
+
+    Returns:
+        Tuple of (optimized_size, width, height, format)
+    """
+    data, width, height, image_format = optimize(Path(source).read_bytes(), max_dimension)
+    write_atomic(Path(destination), data)
+    return len(data), width, height, image_format
+
+
+def supported_derivative_formats(requested: Iterable[str]) -> list[str]:
+    """
+    Filter derivative formats down to those this Pillow build can encode.
+
+    Args:
+        requested: Format names (avif, webp, jpeg)
+
+    Returns:
+        list[str]: Supported formats, in the requested order
+    """
+    supported = []
+    for name in requested:
+        if name not in DERIVATIVE_FORMATS:
+            continue
+        if name in ("avif", "webp") and not features.check(name):
+            continue
+        supported.append(name)
+    return supported
+
+
+def generate_responsive_images(
+    source: str,
+    output_dir: str,
+    widths: list[int],
+    formats: list[str],
+) -> list[dict]:
+    """
+    Encode an image at several widths and formats with content-hashed names.
+
+    The source is decoded once. Widths larger than the source are skipped
+    (a source narrower than every width gets one variant at its own width),
+    so images are never upscaled. Files are named
+    '{stem}-{width}w-{hash}.{ext}', so a changed image gets new URLs.
+
+    Args:
+        source: Source image path
+        output_dir: Directory for the derivatives
+        widths: Target widths in pixels
+        formats: Format names from DERIVATIVE_FORMATS
+
+    Returns:
+        list[dict]: One entry per file with file, width, height, format and size
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    stem = Path(source).stem
+
+    with Image.open(source) as opened:
+        image = opened.convert("RGBA" if opened.mode in ("RGBA", "LA", "P") else "RGB")
+
+    # JPEG has no alpha channel; flatten onto white once
+    flat = image
+    if image.mode == "RGBA":
+        flat = Image.new("RGB", image.size, (255, 255, 255))
+        flat.paste(image, mask=image.split()[-1])
+
+    target_widths = [width for width in sorted(set(widths)) if width <= image.width] or [image.width]
+    variants = []
+    for width in target_widths:
+        height = max(1, round(image.height * width / image.width))
+        resized_by_base = {}
+        for name in formats:
+            pillow_format, extension, options = DERIVATIVE_FORMATS[name]
+            base = flat if name == "jpeg" else image
+            resized = resized_by_base.get(id(base))
+            if resized is None:
+                resized = base
+                if width != base.width:
+                    resized = base.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+                resized_by_base[id(base)] = resized
+
+            output = io.BytesIO()
+            resized.save(output, format=pillow_format, **options)
+            data = output.getvalue()
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            filename = f"{stem}-{width}w-{digest}.{extension}"
+            write_atomic(output_path / filename, data)
+            variants.append({
+                "file": filename,
+                "width": width,
+                "height": height,
+                "format": name,
+                "size": len(data),
+            })
+    return variants
+
+
+def resize_to_fit(source: str, width: Optional[int], height: Optional[int], image_format: str, quality: int) -> bytes:
+    """
+    Scale an image to fit a box and encode it.
+
+    Aspect ratio is kept and images are never upscaled; a missing width or
+    height leaves that side unconstrained.
+
+    Args:
+        source: Source image path
+        width: Maximum width in pixels
+        height: Maximum height in pixels
+        image_format: Format name from DERIVATIVE_FORMATS
+        quality: Encoder quality (1-100)
+
+    Returns:
+        bytes: Encoded image
+    """
+    pillow_format, _, options = DERIVATIVE_FORMATS[image_format]
+
+    with Image.open(source) as opened:
+        image = opened.convert("RGBA" if opened.mode in ("RGBA", "LA", "P") else "RGB")
+
+    if image.mode == "RGBA" and image_format == "jpeg":
+        flat = Image.new("RGB", image.size, (255, 255, 255))
+        flat.paste(image, mask=image.split()[-1])
+        image = flat
+
+    image.thumbnail((width or image.width, height or image.height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    output = io.BytesIO()
+    image.save(output, format=pillow_format, **{**options, "quality": quality})
+    return output.getvalue()
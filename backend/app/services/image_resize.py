@@ -0,0 +1,329 @@
+"""
+On-demand image resizing for YogaFlow.
+
+Serves scaled and re-encoded variants of the bundled content images as a
+local stand-in for a CDN resizer. Encoding runs in the image process pool,
+results are kept in a size-bounded disk cache with least-recently-used
+eviction, and concurrent requests for the same variant share one encode.
+"""
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from stat import S_ISREG
+from typing import Awaitable, Callable, Optional
+
+import anyio
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import record_cache_access
+from app.services.upload_service import ALLOWED_EXTENSIONS, MAX_IMAGE_DIMENSION, run_in_image_pool
+
+# Response media type per output format
+MEDIA_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+
+# Encoder quality used when the request does not give one
+DEFAULT_QUALITY = {
+    "avif": 60,
+    "webp": 80,
+    "jpeg": 82,
+}
+
+# Accepted encoder qualities; requests are rounded to QUALITY_STEP so the
+# number of distinct variants per image stays small
+MIN_QUALITY = 30
+MAX_QUALITY = 95
+QUALITY_STEP = 5
+
+
+class ImageResizeError(Exception):
+    """Invalid resize request."""
+    pass
+
+
+class SourceImageNotFound(ImageResizeError):
+    """The requested source image does not exist."""
+    pass
+
+
+class DiskLRUCache:
+    """
+    Size-bounded directory of cached files with LRU eviction.
+
+    Recency is tracked in memory and seeded from file modification times
+    on first use, so each worker process evicts by its own view of access
+    order. Files written by other workers are picked up on lookup. All
+    filesystem calls run in worker threads, off the event loop.
+
+    Args:
+        directory: Cache directory (default: IMAGE_RESIZE_CACHE_DIRECTORY,
+            resolved on first use)
+        max_bytes: Total size to keep (default: IMAGE_RESIZE_CACHE_MAX_MB)
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._load_lock = asyncio.Lock()
+        self._total_bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or Path(settings.image_resize_cache_directory)
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.image_resize_cache_max_mb * 1024 * 1024
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _scan(self) -> OrderedDict[str, int]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        return OrderedDict((name, size) for _, name, size in sorted(files))
+
+    async def _load(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            async with self._load_lock:
+                if self._entries is None:
+                    entries = await anyio.to_thread.run_sync(self._scan)
+                    self._total_bytes = sum(entries.values())
+                    self._entries = entries
+        return self._entries
+
+    async def lookup(self, name: str) -> Optional[Path]:
+        """
+        Get a cached file and mark it most recently used.
+
+        Args:
+            name: Cache file name
+
+        Returns:
+            Optional[Path]: Cached file, or None on a miss
+        """
+        entries = await self._load()
+        path = self.directory / name
+        size = await anyio.to_thread.run_sync(_file_size, path)
+        if size is None:
+            # Evicted by another worker, or never cached
+            self._forget(name)
+            return None
+        if name in entries:
+            entries.move_to_end(name)
+        else:
+            await self._add(name, size)
+        return path
+
+    def _forget(self, name: str) -> None:
+        if self._entries is not None and name in self._entries:
+            self._total_bytes -= self._entries.pop(name)
+
+    async def _add(self, name: str, size: int) -> None:
+        entries = await self._load()
+        self._total_bytes += size - entries.pop(name, 0)
+        entries[name] = size
+        # Keep the newest entry even if it alone exceeds the budget
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            evicted_name, evicted_size = entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            evicted.append(self.directory / evicted_name)
+            logger.debug("Resize cache entry evicted", name=evicted_name, size=evicted_size)
+        if evicted:
+            await anyio.to_thread.run_sync(_unlink_all, evicted)
+
+    async def _fill(self, name: str, produce: Callable[[], Awaitable[bytes]]) -> Path:
+        from app.services.image_processing import write_atomic
+
+        data = await produce()
+        path = self.directory / name
+        await anyio.to_thread.run_sync(write_atomic, path, data)
+        await self._add(name, len(data))
+        return path
+
+    async def get_or_create(self, name: str, produce: Callable[[], Awaitable[bytes]]) -> Path:
+        """
+        Get a cached file, producing it on a miss.
+
+        Concurrent misses for the same name wait on a single call to
+        `produce`. The shared call is shielded, so a client disconnecting
+        does not cancel the work for the others.
+
+        The file can be evicted (by this or another worker) as soon as this
+        returns; use `read_or_create` to get the contents safely.
+
+        Args:
+            name: Cache file name
+            produce: Coroutine function returning the file contents
+
+        Returns:
+            Path: Cached file
+        """
+        path = await self.lookup(name)
+        record_cache_access("image_resize", hit=path is not None)
+        if path is not None:
+            return path
+
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(name, produce))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def read_or_create(self, name: str, produce: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Get a cached file's contents, producing it on a miss.
+
+        If the file is evicted between the lookup and the read, it is
+        produced again once.
+
+        Args:
+            name: Cache file name
+            produce: Coroutine function returning the file contents
+
+        Returns:
+            bytes: File contents
+        """
+        path = await self.get_or_create(name, produce)
+        try:
+            return await anyio.to_thread.run_sync(path.read_bytes)
+        except FileNotFoundError:
+            self._forget(name)
+        path = await self.get_or_create(name, produce)
+        return await anyio.to_thread.run_sync(path.read_bytes)
+
+
+def _file_size(path: Path) -> Optional[int]:
+    """Size of a regular file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size if S_ISREG(stat.st_mode) else None
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def resolve_content_image(path: str) -> Path:
+    """
+    Find a bundled content image by its path under content/images.
+
+    Args:
+        path: Path relative to the images directory
+
+    Returns:
+        Path: Absolute source path
+
+    Raises:
+        SourceImageNotFound: If the path escapes the images directory, is
+            not an image, or does not exist
+    """
+    root = (Path(settings.content_directory) / "images").resolve()
+    source = (root / path).resolve()
+    if not source.is_relative_to(root) or source.suffix.lower() not in ALLOWED_EXTENSIONS or not source.is_file():
+        raise SourceImageNotFound(f"Image not found: {path}")
+    return source
+
+
+def snap_dimension(requested: int) -> int:
+    """
+    Round a requested width or height up to a configured derivative width.
+
+    Any client can pick w and h, so they are limited to
+    IMAGE_DERIVATIVE_WIDTHS (larger requests get the largest) to keep the
+    encodes and cache entries per image bounded.
+
+    Args:
+        requested: Requested dimension in pixels
+
+    Returns:
+        int: Configured width to encode at
+    """
+    widths = settings.image_derivative_widths_list
+    return next((width for width in widths if width >= requested), widths[-1])
+
+
+async def get_resized_image(
+    path: str,
+    width: Optional[int],
+    height: Optional[int],
+    image_format: str = "jpeg",
+    quality: Optional[int] = None,
+) -> tuple[str, bytes]:
+    """
+    Get a resized variant of a content image, encoding it on first request.
+
+    Width and height are rounded up to the configured derivative widths and
+    quality to a multiple of QUALITY_STEP. The cache key covers the
+    source's size and modification time, so an edited source produces new
+    variants and a new cache file name; stale ones age out of the cache.
+
+    Args:
+        path: Path relative to content/images
+        width: Maximum width in pixels
+        height: Maximum height in pixels
+        image_format: Output format (avif, webp or jpeg)
+        quality: Encoder quality (default per format)
+
+    Returns:
+        tuple[str, bytes]: Cache file name of the variant (changes with the
+            source, so usable as an ETag) and the encoded image
+
+    Raises:
+        ImageResizeError: If the parameters are invalid
+        SourceImageNotFound: If the source image does not exist
+    """
+    from app.services.image_processing import resize_to_fit, supported_derivative_formats
+
+    if width is None and height is None:
+        raise ImageResizeError("Give a width (w) or height (h)")
+    for dimension in (width, height):
+        if dimension is not None and not 1 <= dimension <= MAX_IMAGE_DIMENSION:
+            raise ImageResizeError(f"Width and height must be between 1 and {MAX_IMAGE_DIMENSION}")
+    if image_format not in MEDIA_TYPES or not supported_derivative_formats([image_format]):
+        raise ImageResizeError(f"Unsupported format: {image_format}")
+    quality = quality or DEFAULT_QUALITY[image_format]
+    if not MIN_QUALITY <= quality <= MAX_QUALITY:
+        raise ImageResizeError(f"Quality must be between {MIN_QUALITY} and {MAX_QUALITY}")
+
+    width = snap_dimension(width) if width is not None else None
+    height = snap_dimension(height) if height is not None else None
+    quality = round(quality / QUALITY_STEP) * QUALITY_STEP
+
+    def locate_source() -> tuple[Path, os.stat_result]:
+        source = resolve_content_image(path)
+        return source, source.stat()
+
+    source, stat = await anyio.to_thread.run_sync(locate_source)
+    key = f"{source}|{stat.st_mtime_ns}|{stat.st_size}|{width}|{height}|{image_format}|{quality}"
+    name = f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.{image_format}"
+
+    async def produce() -> bytes:
+        logger.info("Resizing image", path=path, width=width, height=height, format=image_format)
+        return await run_in_image_pool(resize_to_fit, str(source), width, height, image_format, quality)
+
+    return name, await resize_cache.read_or_create(name, produce)
+
+
+# Global resize cache instance
+resize_cache = DiskLRUCache()
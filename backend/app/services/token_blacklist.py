@@ -5,6 +5,7 @@ Implements token revocation for logout functionality.
 When a user logs out, their JWT token is added to a blacklist
 to prevent reuse until natural expiration.
 """
+import time
 from typing import Optional
 from datetime import datetime, timedelta
 import redis.asyncio as redis
@@ -43,6 +44,23 @@ class TokenBlacklist:
                 )
                 self._redis = None
 
+    async def ping(self) -> Optional[float]:
+        """
+        Measure the Redis round trip.
+
+        Returns:
+            Optional[float]: Round-trip time in milliseconds, or None if Redis is unavailable
+        """
+        if not self._redis:
+            return None
+        start = time.perf_counter()
+        try:
+            await self._redis.ping()
+        except Exception as error:
+            logger.warning("Redis ping failed", error=str(error))
+            return None
+        return (time.perf_counter() - start) * 1000
+
     async def disconnect(self):
         """Disconnect from Redis"""
         if self._redis:
@@ -0,0 +1,40 @@
+"""
+Text-to-speech generation for pose and sequence narration.
+"""
+from app.services.tts.assembly import MissingClipsError, SequenceAssembler
+from app.services.tts.cache import AudioCache
+from app.services.tts.engine import EngineReport, JobJournal, TTSEngine, TTSJob
+from app.services.tts.limiter import TokenBucket
+from app.services.tts.providers import (
+    ElevenLabsProvider,
+    FakeProvider,
+    ReplicateProvider,
+    RetryableTTSError,
+    TTSError,
+    TTSProvider,
+    TTSRequest,
+    get_provider,
+)
+from app.services.tts.voices import DEFAULT_VOICE, VOICES, Voice
+
+__all__ = [
+    "MissingClipsError",
+    "SequenceAssembler",
+    "AudioCache",
+    "EngineReport",
+    "JobJournal",
+    "TTSEngine",
+    "TTSJob",
+    "TokenBucket",
+    "ElevenLabsProvider",
+    "FakeProvider",
+    "ReplicateProvider",
+    "RetryableTTSError",
+    "TTSError",
+    "TTSProvider",
+    "TTSRequest",
+    "get_provider",
+    "DEFAULT_VOICE",
+    "VOICES",
+    "Voice",
+]
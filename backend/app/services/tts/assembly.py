@@ -0,0 +1,429 @@
+"""
+Sequence audio assembly from cached clips.
+
+A sequence track is built by concatenating short narration clips (intro
+sentences, per-pose transitions, outro) with generated silence: every
+<#n#> pause marker in the scripts becomes n seconds of silence, and each
+pose is followed by a hold of its SequencePose.duration_seconds. Clips are
+stored content-addressed under content/audio/clips, keyed by the request
+fingerprint, so sentences shared between sequences ("Remember to breathe
+deeply and naturally.") are synthesized once per voice, and building a new
+sequence or variant only needs the few clips it doesn't share.
+
+Hold sentences ("Hold this pose for 1 minute and 30 seconds.") are spoken
+from phrase clips ("Hold this pose for", "1 minute", "and", "30 seconds")
+covering every allowed hold, so a variant that only changes hold times
+needs no new clips at all.
+
+Assembly joins MP3 frames without decoding (see mp3.py) and streams to
+disk, so memory use doesn't grow with track length.
+"""
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from app.core.config import settings
+from app.services.tts.cache import AudioCache
+from app.services.tts.engine import TTSJob
+from app.services.tts.mp3 import DEFAULT_HEADER, AudioSpan, MP3FormatError, audio_span, silence_frame_count, silent_frame
+from app.services.tts.scripts import (
+    PAUSE_MARKER,
+    format_pose_transition,
+    format_hold,
+    format_sequence_intro,
+    format_sequence_outro,
+    hold_phrases,
+    hold_vocabulary,
+    slugify,
+)
+from app.services.tts.voices import Voice
+
+CLIPS_DIRECTORY = "clips"
+SEQUENCES_DIRECTORY = "sequences"
+
+# Hex digits of the request fingerprint used in clip filenames
+CLIP_KEY_LENGTH = 24
+
+# Write/read size when copying clip bytes
+CHUNK_SIZE = 256 * 1024
+
+
+class MissingClipsError(Exception):
+    """
+    Clips needed for a track haven't been generated yet.
+
+    Args:
+        texts: Sentences whose clips are missing
+    """
+
+    def __init__(self, texts: list[str]):
+        super().__init__(f"{len(texts)} narration clips have not been generated")
+        self.texts = texts
+
+
+@dataclass(frozen=True)
+class Speech:
+    """A sentence (or run of sentences) spoken in one clip."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class Pause:
+    """Silence, in seconds."""
+
+    seconds: float
+
+
+Segment = Union[Speech, Pause]
+
+
+def split_script(script: str) -> list[Segment]:
+    """
+    Split a script at its pause markers.
+
+    Args:
+        script: Text with <#seconds#> markers
+
+    Returns:
+        list[Segment]: Speech and pauses in order; adjacent pauses merged
+    """
+    segments: list[Segment] = []
+    position = 0
+    for match in PAUSE_MARKER.finditer(script):
+        _append_speech(segments, script[position:match.start()])
+        _append_pause(segments, float(match[1]))
+        position = match.end()
+    _append_speech(segments, script[position:])
+    return segments
+
+
+def _append_speech(segments: list[Segment], text: str) -> None:
+    # Scripts are joined with spaces, which leaves "Pose , or Asana ." behind
+    text = re.sub(r"\s+([,.!?])", r"\1", " ".join(text.split()))
+    if text:
+        segments.append(Speech(text))
+
+
+def _append_pause(segments: list[Segment], seconds: float) -> None:
+    if segments and isinstance(segments[-1], Pause):
+        segments[-1] = Pause(segments[-1].seconds + seconds)
+    elif seconds > 0:
+        segments.append(Pause(seconds))
+
+
+def sequence_segments(sequence: dict) -> list[Segment]:
+    """
+    Segments of a sequence's guided track.
+
+    Args:
+        sequence: Sequence fields plus 'poses' in position order, each with
+            name_english, name_sanskrit and duration (seconds)
+
+    Returns:
+        list[Segment]: Intro, then per pose its transition and hold, then outro
+    """
+    segments = split_script(format_sequence_intro(sequence))
+    poses = sequence["poses"]
+    for number, pose in enumerate(poses, 1):
+        hold = Speech(format_hold(pose["duration"]))
+        for segment in split_script(format_pose_transition(pose, number, len(poses))):
+            if segment == hold:
+                segments.extend(Speech(phrase) for phrase in hold_phrases(pose["duration"]))
+            else:
+                _append_segment(segments, segment)
+        _append_pause(segments, float(pose["duration"]))
+    for segment in split_script(format_sequence_outro()):
+        _append_segment(segments, segment)
+    return segments
+
+
+def sequence_script_fields(sequence) -> dict:
+    """
+    Script fields of a Sequence model, as sequence_segments expects them.
+
+    Args:
+        sequence: Sequence with sequence_poses (and their poses) loaded
+
+    Returns:
+        dict: Sequence fields plus 'poses' in position order
+    """
+    focus_area = sequence.focus_area
+    return {
+        "name": sequence.name,
+        "description": sequence.description,
+        "difficulty_level": sequence.difficulty_level,
+        "duration_minutes": sequence.duration_minutes,
+        "focus_area": getattr(focus_area, "value", focus_area),
+        "poses": [
+            {
+                "name_english": sequence_pose.pose.name_english,
+                "name_sanskrit": sequence_pose.pose.name_sanskrit,
+                "duration": sequence_pose.duration_seconds,
+            }
+            for sequence_pose in sorted(sequence.sequence_poses, key=lambda sp: sp.position_order)
+        ],
+    }
+
+
+def _append_segment(segments: list[Segment], segment: Segment) -> None:
+    if isinstance(segment, Pause):
+        _append_pause(segments, segment.seconds)
+    else:
+        segments.append(segment)
+
+
+@dataclass(frozen=True)
+class FilePart:
+    """Audio frames copied from a clip."""
+
+    path: Path
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class SilencePart:
+    """A run of identical silent frames."""
+
+    frame: bytes
+    count: int
+
+    @property
+    def length(self) -> int:
+        return len(self.frame) * self.count
+
+
+Part = Union[FilePart, SilencePart]
+
+
+class AudioPlan:
+    """
+    Byte layout of an assembled track.
+
+    The size and every part's offset are known up front, which allows
+    streaming any byte range of the track without building it.
+
+    Args:
+        parts: File and silence parts in order
+        bitrate: Bits per second of the clips, for the duration estimate
+    """
+
+    def __init__(self, parts: list[Part], bitrate: int):
+        self.parts = parts
+        self.size = sum(part.length for part in parts)
+        self.bitrate = bitrate
+
+    @property
+    def duration(self) -> float:
+        """Track length in seconds (exact for constant-bitrate clips)."""
+        return self.size * 8 / self.bitrate
+
+    @property
+    def key(self) -> str:
+        """Hash of the layout; changes whenever any clip or pause changes."""
+        layout = [
+            [part.path.name, part.start, part.end] if isinstance(part, FilePart)
+            else ["silence", part.frame[:4].hex(), part.count]
+            for part in self.parts
+        ]
+        return hashlib.sha256(json.dumps(layout).encode()).hexdigest()
+
+    def iter_chunks(self, start: int = 0, end: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the bytes of [start, end) without holding more than a chunk.
+
+        Args:
+            start: First byte offset
+            end: End offset, exclusive (default: end of track)
+            chunk_size: Maximum chunk size
+
+        Yields:
+            bytes: Consecutive chunks of the track
+        """
+        end = self.size if end is None else min(end, self.size)
+        offset = 0
+        for part in self.parts:
+            part_end = offset + part.length
+            if part_end <= start:
+                offset = part_end
+                continue
+            if offset >= end:
+                return
+            first = max(start, offset) - offset
+            last = min(end, part_end) - offset
+            if isinstance(part, FilePart):
+                yield from _read_range(part.path, part.start + first, last - first, chunk_size)
+            else:
+                yield from _silence_range(part, first, last, chunk_size)
+            offset = part_end
+
+    def write(self, path: Path) -> None:
+        """Stream the track to a file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, "wb") as output:
+            for chunk in self.iter_chunks():
+                output.write(chunk)
+        os.replace(temp_path, path)
+
+
+def _read_range(path: Path, offset: int, count: int, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb") as clip:
+        clip.seek(offset)
+        while count > 0:
+            chunk = clip.read(min(chunk_size, count))
+            if not chunk:
+                raise MP3FormatError(f"{path} changed during assembly")
+            count -= len(chunk)
+            yield chunk
+
+
+def _silence_range(part: SilencePart, first: int, last: int, chunk_size: int) -> Iterator[bytes]:
+    frame_length = len(part.frame)
+    # A block of whole frames, reused for every chunk
+    block = part.frame * max(1, chunk_size // frame_length)
+    position = first
+    while position < last:
+        phase = position % frame_length
+        take = min(last - position, len(block) - phase)
+        yield block[phase:phase + take]
+        position += take
+
+
+class SequenceAssembler:
+    """
+    Build sequence tracks from cached narration clips.
+
+    Args:
+        root: Audio directory (default: CONTENT_DIRECTORY/audio)
+        cache: Script-hash cache recording clips and assembled tracks
+    """
+
+    def __init__(self, root: Optional[Path] = None, cache: Optional[AudioCache] = None):
+        self._root = Path(root) if root else None
+        self.cache = cache
+        self._spans: dict[Path, tuple[int, AudioSpan]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root or Path(settings.content_directory) / "audio"
+
+    def clip_path(self, voice: Voice, text: str) -> Path:
+        """Content-addressed path of a sentence's clip in a voice."""
+        key = voice.request(text).fingerprint(voice.provider)
+        return self.root / CLIPS_DIRECTORY / f"{key[:CLIP_KEY_LENGTH]}{voice.suffix}.mp3"
+
+    def output_path(self, sequence: dict, voice: Voice) -> Path:
+        """Where a sequence's assembled track is written."""
+        return self.root / SEQUENCES_DIRECTORY / voice.filename(slugify(sequence["name"]))
+
+    def clip_jobs(self, sequences: list[dict], voice: Voice) -> list[TTSJob]:
+        """
+        TTS jobs for every clip the sequences need, deduplicated.
+
+        Args:
+            sequences: Sequences with poses
+            voice: Narration voice
+
+        Returns:
+            list[TTSJob]: One job per distinct sentence, plus every hold
+                phrase so that changing a hold time never needs a new clip
+        """
+        texts = hold_vocabulary() if sequences else []
+        for sequence in sequences:
+            texts += [segment.text for segment in sequence_segments(sequence) if isinstance(segment, Speech)]
+
+        jobs = {}
+        for text in texts:
+            path = self.clip_path(voice, text)
+            if path not in jobs:
+                key = f"{CLIPS_DIRECTORY}/{path.name}"
+                jobs[path] = TTSJob(key=key, request=voice.request(text), output_path=path)
+        return list(jobs.values())
+
+    def _span(self, path: Path) -> AudioSpan:
+        # Clips are immutable once written (content-addressed), but check size
+        # in case one was regenerated by a --force run
+        size = path.stat().st_size
+        cached = self._spans.get(path)
+        if cached is None or cached[0] != size:
+            cached = (size, audio_span(path))
+            self._spans[path] = cached
+        return cached[1]
+
+    def plan(self, segments: list[Segment], voice: Voice) -> AudioPlan:
+        """
+        Lay out a track.
+
+        Args:
+            segments: Speech and pauses
+            voice: Narration voice
+
+        Returns:
+            AudioPlan: Byte layout of the track
+
+        Raises:
+            MissingClipsError: If any clip hasn't been generated
+            MP3FormatError: If clips are unreadable or formats don't match
+        """
+        missing = [
+            segment.text for segment in segments
+            if isinstance(segment, Speech) and not self.clip_path(voice, segment.text).is_file()
+        ]
+        if missing:
+            raise MissingClipsError(missing)
+
+        spans = {
+            segment: self._span(self.clip_path(voice, segment.text))
+            for segment in segments if isinstance(segment, Speech)
+        }
+        reference = next(iter(spans.values())).header if spans else DEFAULT_HEADER
+        for span in spans.values():
+            if not span.header.compatible_with(reference):
+                raise MP3FormatError("Clips have different sample rates or channel counts")
+        silence = silent_frame(reference)
+
+        parts: list[Part] = []
+        for segment in segments:
+            if isinstance(segment, Speech):
+                span = spans[segment]
+                parts.append(FilePart(self.clip_path(voice, segment.text), span.start, span.end))
+            else:
+                count = silence_frame_count(reference, segment.seconds)
+                if count:
+                    parts.append(SilencePart(silence, count))
+        return AudioPlan(parts, reference.bitrate)
+
+    def assemble(self, sequence: dict, voice: Voice, force: bool = False) -> bool:
+        """
+        Write a sequence's track unless an identical one exists.
+
+        Args:
+            sequence: Sequence with poses
+            voice: Narration voice
+            force: Rebuild even if the cache says the track is current
+
+        Returns:
+            bool: True if the track was (re)written
+        """
+        plan = self.plan(sequence_segments(sequence), voice)
+        output_path = self.output_path(sequence, voice)
+        if not force and self.cache is not None and self.cache.is_current(output_path, plan.key):
+            return False
+        plan.write(output_path)
+        if self.cache is not None:
+            self.cache.record(output_path, plan.key)
+        return True
+
+
+# Global assembler instance, for serving tracks
+sequence_assembler = SequenceAssembler()
@@ -0,0 +1,117 @@
+"""
+Script-hash cache for generated narration.
+
+Records, for every clip under the audio directory, the fingerprint of the
+request that produced it: a hash of the script text, voice, speed, pitch,
+emotion and provider. A clip whose recorded fingerprint matches the
+current request (and whose file is intact) is not regenerated, so editing
+one pose only costs one TTS call per voice.
+
+The manifest lives beside the clips at content/audio/.audio-cache.json and
+is committed with them. Only files listed in it are ever garbage-collected.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+MANIFEST_NAME = ".audio-cache.json"
+
+
+class AudioCache:
+    """
+    Manifest of generated clips keyed by request fingerprint.
+
+    Args:
+        root: Audio directory (default: CONTENT_DIRECTORY/audio)
+        manifest_path: Manifest file (default: .audio-cache.json in root)
+    """
+
+    def __init__(self, root: Optional[Path] = None, manifest_path: Optional[Path] = None):
+        self.root = Path(root or Path(settings.content_directory) / "audio")
+        self.manifest_path = Path(manifest_path or self.root / MANIFEST_NAME)
+        self._entries: Optional[dict[str, dict]] = None
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.manifest_path.read_text()).get("clips", {})
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as error:
+                logger.warning("Unreadable audio cache manifest", path=str(self.manifest_path), error=str(error))
+                self._entries = {}
+        return self._entries
+
+    def name(self, path: Path) -> str:
+        """Manifest name of a clip: its path relative to the audio directory."""
+        return Path(path).relative_to(self.root).as_posix()
+
+    def is_current(self, path: Path, key: str) -> bool:
+        """
+        Check whether a clip was generated from this exact request.
+
+        Args:
+            path: Clip file
+            key: Request fingerprint
+
+        Returns:
+            bool: True if the recorded key matches and the file is intact
+        """
+        entry = self.entries.get(self.name(path))
+        if entry is None or entry["key"] != key:
+            return False
+        try:
+            return Path(path).stat().st_size == entry["size"]
+        except FileNotFoundError:
+            return False
+
+    def record(self, path: Path, key: str) -> None:
+        """
+        Record that a clip was generated from a request, and save.
+
+        Saved on every call so an interrupted run keeps what it finished.
+
+        Args:
+            path: Clip file (must exist)
+            key: Request fingerprint
+        """
+        self.entries[self.name(path)] = {"key": key, "size": Path(path).stat().st_size}
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.tmp")
+        temp_path.write_text(json.dumps({"version": 1, "clips": self.entries}, indent=1, sort_keys=True))
+        os.replace(temp_path, self.manifest_path)
+
+    def collect_garbage(self, live_paths: Iterable[Path], dry_run: bool = False) -> list[str]:
+        """
+        Delete cached clips that no current job produces.
+
+        Only clips listed in the manifest are considered, so hand-placed
+        files (e.g. voice tests) are never touched.
+
+        Args:
+            live_paths: Output paths of every current job
+            dry_run: Report orphans without deleting them
+
+        Returns:
+            list[str]: Names of orphaned clips
+        """
+        live = {self.name(path) for path in live_paths}
+        orphans = sorted(name for name in self.entries if name not in live)
+        if dry_run or not orphans:
+            return orphans
+
+        for name in orphans:
+            (self.root / name).unlink(missing_ok=True)
+            del self.entries[name]
+        self.save()
+        logger.info("Removed orphaned audio clips", count=len(orphans))
+        return orphans
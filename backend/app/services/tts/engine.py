@@ -0,0 +1,287 @@
+"""
+Concurrent text-to-speech generation engine.
+
+Runs a batch of TTS jobs through a bounded pool of asyncio workers that
+share one pooled httpx.AsyncClient and one token bucket per provider.
+Transient failures are retried with jittered exponential backoff (or the
+provider's Retry-After). Completed jobs are appended to a JSONL journal so
+an interrupted run can be resumed without regenerating finished clips, and
+an optional AudioCache skips clips whose script and voice are unchanged.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+from app.core.logging_config import logger
+from app.services.tts.cache import AudioCache
+from app.services.tts.limiter import TokenBucket
+from app.services.tts.providers import RetryableTTSError, TTSError, TTSProvider, TTSRequest
+
+
+@dataclass
+class TTSJob:
+    """One clip to generate: a unique key, the request and where to write it."""
+
+    key: str
+    request: TTSRequest
+    output_path: Path
+
+
+@dataclass
+class EngineReport:
+    """Outcome of an engine run."""
+
+    generated: int = 0
+    skipped: int = 0
+    retries: int = 0
+    failed: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Clips generated per second."""
+        return self.generated / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class JobJournal:
+    """
+    Append-only JSONL record of finished jobs.
+
+    Each line holds a job key, its request fingerprint and its status.
+    A job counts as done on resume only if its latest line is 'done' with
+    the same fingerprint, so edited scripts are regenerated.
+
+    Args:
+        path: Journal file
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> dict[str, str]:
+        """
+        Read completed jobs.
+
+        Returns:
+            dict[str, str]: Job key -> fingerprint, for jobs whose latest
+                entry is 'done'
+        """
+        completed = {}
+        try:
+            with open(self.path) as journal_file:
+                for line in journal_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted write
+                        continue
+                    if entry.get("status") == "done":
+                        completed[entry["key"]] = entry["fingerprint"]
+                    else:
+                        completed.pop(entry.get("key"), None)
+        except FileNotFoundError:
+            pass
+        return completed
+
+    def record(self, key: str, fingerprint: str, status: str, error: Optional[str] = None) -> None:
+        """
+        Append a job outcome and flush it to disk.
+
+        Args:
+            key: Job key
+            fingerprint: Request fingerprint
+            status: 'done' or 'failed'
+            error: Failure reason
+        """
+        entry = {"key": key, "fingerprint": fingerprint, "status": status}
+        if error:
+            entry["error"] = error
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as journal_file:
+            journal_file.write(json.dumps(entry) + "\n")
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+    def reset(self) -> None:
+        """Forget all recorded jobs."""
+        self.path.unlink(missing_ok=True)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename so an interrupted run never leaves partial clips."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+class TTSEngine:
+    """
+    Generate TTS clips concurrently with rate limiting, retries and resume.
+
+    Args:
+        provider: Provider adapter
+        concurrency: Worker count (default: the provider's default)
+        journal: Journal for resuming interrupted runs
+        cache: Script-hash cache; jobs whose clip is current are skipped,
+            and generated clips are recorded in it
+        force: Regenerate clips even if the cache says they are current
+            (they are still recorded, so the next run skips them)
+        max_attempts: Attempts per job before it is marked failed
+        backoff_base: First retry delay in seconds, doubled per attempt
+        backoff_max: Cap on the retry delay in seconds
+        timeout: HTTP timeout in seconds (long clips take a while)
+        on_progress: Called with (job, status, report) after each job,
+            where status is 'done' or 'failed'
+    """
+
+    def __init__(
+        self,
+        provider: TTSProvider,
+        concurrency: Optional[int] = None,
+        journal: Optional[JobJournal] = None,
+        cache: Optional[AudioCache] = None,
+        force: bool = False,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        timeout: float = 300.0,
+        on_progress: Optional[Callable[[TTSJob, str, EngineReport], None]] = None,
+    ):
+        self.provider = provider
+        self.concurrency = max(1, concurrency or provider.default_concurrency)
+        self.journal = journal
+        self.cache = cache
+        self.force = force
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.limiter = TokenBucket(provider.requests_per_second, provider.burst)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Delay before retrying after a failed attempt.
+
+        Exponential with "full jitter" so workers that failed together
+        don't retry together.
+
+        Args:
+            attempt: 1-based number of the attempt that failed
+
+        Returns:
+            float: Seconds to wait
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    async def run(self, jobs: Iterable[TTSJob], resume: bool = False) -> EngineReport:
+        """
+        Generate every job's clip.
+
+        Args:
+            jobs: Jobs to run
+            resume: Skip jobs the journal records as done (same fingerprint,
+                output still present); otherwise the journal is reset.
+                Jobs current in the cache are skipped either way, unless
+                the engine was created with force.
+
+        Returns:
+            EngineReport: Counts, failures and timing
+        """
+        report = EngineReport()
+        started = time.perf_counter()
+
+        completed = {}
+        if self.journal is not None:
+            if resume:
+                completed = self.journal.load()
+            else:
+                self.journal.reset()
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            fingerprint = job.request.fingerprint(self.provider.name)
+            if completed.get(job.key) == fingerprint and job.output_path.exists():
+                report.skipped += 1
+            elif not self.force and self.cache is not None and self.cache.is_current(job.output_path, fingerprint):
+                report.skipped += 1
+            else:
+                queue.put_nowait((job, fingerprint))
+
+        workers = min(self.concurrency, queue.qsize())
+        if workers:
+            limits = httpx.Limits(max_connections=workers * 2, max_keepalive_connections=workers)
+            async with httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True) as client:
+                await asyncio.gather(*(self._worker(client, queue, report) for _ in range(workers)))
+
+        report.elapsed = time.perf_counter() - started
+        logger.info(
+            "TTS run finished",
+            provider=self.provider.name,
+            generated=report.generated,
+            skipped=report.skipped,
+            failed=len(report.failed),
+            retries=report.retries,
+            elapsed=round(report.elapsed, 2),
+        )
+        return report
+
+    async def _worker(self, client: httpx.AsyncClient, queue: asyncio.Queue, report: EngineReport) -> None:
+        while True:
+            try:
+                job, fingerprint = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                audio = await self._synthesize(client, job, report)
+                await asyncio.to_thread(write_atomic, job.output_path, audio)
+                if self.cache is not None:
+                    self.cache.record(job.output_path, fingerprint)
+            except (TTSError, httpx.HTTPError, OSError) as error:
+                logger.error("TTS job failed", key=job.key, error=str(error))
+                report.failed.append(job.key)
+                status = "failed"
+                if self.journal is not None:
+                    self.journal.record(job.key, fingerprint, status, error=str(error))
+            else:
+                report.generated += 1
+                status = "done"
+                if self.journal is not None:
+                    self.journal.record(job.key, fingerprint, status)
+
+            if self.on_progress is not None:
+                self.on_progress(job, status, report)
+
+    async def _synthesize(self, client: httpx.AsyncClient, job: TTSJob, report: EngineReport) -> bytes:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await self.provider.synthesize(client, job.request, self.limiter)
+            except (RetryableTTSError, httpx.TransportError) as error:
+                if attempt == self.max_attempts:
+                    raise
+                retry_after = getattr(error, "retry_after", None)
+                if retry_after is not None:
+                    # Hold every worker, not just this one, until the provider is ready
+                    self.limiter.pause(retry_after)
+                    delay = retry_after
+                else:
+                    delay = self.backoff_delay(attempt)
+                report.retries += 1
+                logger.warning(
+                    "TTS request failed, retrying",
+                    key=job.key,
+                    attempt=attempt,
+                    delay=round(delay, 2),
+                    error=str(error),
+                )
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
@@ -0,0 +1,58 @@
+"""
+Client-side rate limiting for TTS provider APIs.
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by all workers calling one provider.
+
+    Tokens refill at `rate` per second up to `capacity`; each API call takes
+    one. When the provider answers 429 with Retry-After, pause() holds every
+    caller until that time instead of letting each worker hit the limit.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        # The lock queues callers in FIFO order, so waits are fair
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for `seconds` (e.g. after a 429).
+
+        Args:
+            seconds: How long to hold all callers
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        # Start refilling from empty once the pause ends
+        self._tokens = 0.0
+        self._updated = self._paused_until
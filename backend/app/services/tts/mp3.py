@@ -0,0 +1,237 @@
+"""
+Minimal MPEG audio (MP3) frame handling for lossless concatenation.
+
+MP3 files can be joined at frame boundaries without decoding, provided
+tags and encoder info frames (Xing/Info/VBRI) are dropped from all but the
+output. Silence is produced as "null" frames: a frame header followed by
+all-zero side information, which every decoder plays as digital silence.
+Only Layer III is supported, which is what every TTS provider returns.
+"""
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+# Layer III bitrates (kbps) by bitrate index: MPEG-1, then MPEG-2/2.5
+_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000),  # MPEG-2.5
+}
+_MONO = 3
+
+# Bytes of tag/junk to scan for the first frame before giving up
+_SYNC_SEARCH_LIMIT = 64 * 1024
+
+
+class MP3FormatError(ValueError):
+    """File is not a usable MPEG Layer III stream."""
+    pass
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Parsed 4-byte MPEG audio frame header."""
+
+    version_bits: int  # 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    bitrate_index: int
+    sample_rate_index: int
+    padding: bool
+    protected: bool  # CRC follows the header
+    channel_mode: int
+    raw: bytes
+
+    @property
+    def bitrate(self) -> int:
+        """Bitrate in bits per second."""
+        table = _BITRATES[1] if self.version_bits == 3 else _BITRATES[2]
+        return table[self.bitrate_index] * 1000
+
+    @property
+    def sample_rate(self) -> int:
+        return _SAMPLE_RATES[self.version_bits][self.sample_rate_index]
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.channel_mode == _MONO else 2
+
+    @property
+    def samples_per_frame(self) -> int:
+        return 1152 if self.version_bits == 3 else 576
+
+    @property
+    def frame_length(self) -> int:
+        """Frame size in bytes, including the header."""
+        coefficient = 144 if self.version_bits == 3 else 72
+        return coefficient * self.bitrate // self.sample_rate + int(self.padding)
+
+    @property
+    def side_info_length(self) -> int:
+        if self.version_bits == 3:
+            return 17 if self.channels == 1 else 32
+        return 9 if self.channels == 1 else 17
+
+    @property
+    def frame_duration(self) -> float:
+        """Seconds of audio per frame."""
+        return self.samples_per_frame / self.sample_rate
+
+    def compatible_with(self, other: "FrameHeader") -> bool:
+        """Whether frames of both headers can be played back to back."""
+        return (self.version_bits, self.sample_rate_index, self.channels) == (
+            other.version_bits, other.sample_rate_index, other.channels,
+        )
+
+
+def parse_header(data: bytes) -> FrameHeader:
+    """
+    Parse a Layer III frame header.
+
+    Args:
+        data: At least 4 bytes starting at a frame sync
+
+    Returns:
+        FrameHeader: Parsed header
+
+    Raises:
+        MP3FormatError: If the bytes aren't a valid Layer III header
+    """
+    if len(data) < 4 or data[0] != 0xFF or (data[1] & 0xE0) != 0xE0:
+        raise MP3FormatError("No frame sync")
+    version_bits = (data[1] >> 3) & 0x03
+    layer_bits = (data[1] >> 1) & 0x03
+    bitrate_index = data[2] >> 4
+    sample_rate_index = (data[2] >> 2) & 0x03
+    if version_bits == 1 or layer_bits != 1:
+        raise MP3FormatError("Not MPEG Layer III")
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        raise MP3FormatError("Unsupported bitrate or sample rate")
+    return FrameHeader(
+        version_bits=version_bits,
+        bitrate_index=bitrate_index,
+        sample_rate_index=sample_rate_index,
+        padding=bool((data[2] >> 1) & 0x01),
+        protected=not (data[1] & 0x01),
+        channel_mode=data[3] >> 6,
+        raw=bytes(data[:4]),
+    )
+
+
+def _id3v2_length(data: bytes) -> int:
+    """Size of a leading ID3v2 tag (header, syncsafe body, optional footer)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(frame: bytes, header: FrameHeader) -> bool:
+    """Whether a frame is a Xing/Info/VBRI encoder info frame rather than audio."""
+    offset = 4 + (2 if header.protected else 0) + header.side_info_length
+    return frame[offset:offset + 4] in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+@dataclass(frozen=True)
+class AudioSpan:
+    """Byte range of a file's audio frames, with its first frame header."""
+
+    start: int
+    end: int
+    header: FrameHeader
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    @property
+    def duration(self) -> float:
+        """Approximate duration, exact for constant-bitrate files."""
+        return self.length * 8 / self.header.bitrate
+
+
+def audio_span(path: Path) -> AudioSpan:
+    """
+    Locate the audio frames in an MP3 file.
+
+    Skips a leading ID3v2 tag and encoder info frame, and a trailing ID3v1
+    tag, reading only the head and tail of the file.
+
+    Args:
+        path: MP3 file
+
+    Returns:
+        AudioSpan: Byte range to copy when concatenating
+
+    Raises:
+        MP3FormatError: If no Layer III frame is found
+    """
+    with open(path, "rb") as mp3_file:
+        head = mp3_file.read(10)
+        start = _id3v2_length(head)
+        mp3_file.seek(start)
+        window = mp3_file.read(_SYNC_SEARCH_LIMIT)
+
+        offset = 0
+        while True:
+            offset = window.find(b"\xff", offset)
+            if offset < 0 or offset + 4 > len(window):
+                raise MP3FormatError(f"No MP3 frames in {path}")
+            try:
+                header = parse_header(window[offset:offset + 4])
+            except MP3FormatError:
+                offset += 1
+                continue
+            break
+        start += offset
+
+        mp3_file.seek(start)
+        first_frame = mp3_file.read(header.frame_length)
+        if _is_info_frame(first_frame, header):
+            start += header.frame_length
+
+        end = mp3_file.seek(0, 2)
+        if end >= 128:
+            mp3_file.seek(end - 128)
+            if mp3_file.read(3) == b"TAG":
+                end -= 128
+
+    if end <= start:
+        raise MP3FormatError(f"No MP3 frames in {path}")
+    return AudioSpan(start=start, end=end, header=header)
+
+
+def silent_frame(reference: FrameHeader) -> bytes:
+    """
+    Build a frame of digital silence matching a reference stream.
+
+    Same MPEG version, sample rate, bitrate and channel mode as the
+    reference, without padding or CRC. The zeroed side information means
+    no audio data (and no bit-reservoir use), so it decodes to silence.
+
+    Args:
+        reference: Header of the surrounding audio
+
+    Returns:
+        bytes: One complete frame
+    """
+    header = replace(reference, padding=False, protected=False)
+    raw = bytes((
+        reference.raw[0],
+        reference.raw[1] | 0x01,  # No CRC
+        reference.raw[2] & ~0x02 & 0xFF,  # No padding
+        reference.raw[3],
+    ))
+    return raw + bytes(header.frame_length - 4)
+
+
+def silence_frame_count(reference: FrameHeader, seconds: float) -> int:
+    """Number of frames closest to `seconds` of audio."""
+    return max(0, round(seconds / reference.frame_duration))
+
+
+# Used when a track has no clips to take the format from: Replicate's
+# MiniMax output format (MPEG-1 Layer III, 32kHz, 128kbps, mono)
+DEFAULT_HEADER = parse_header(b"\xff\xfb\x98\xc4")
@@ -0,0 +1,298 @@
+"""
+Text-to-speech provider adapters.
+
+Each provider turns a TTSRequest into MP3 bytes using a shared
+httpx.AsyncClient and the engine's rate limiter for that provider.
+Transient failures (429, 5xx) raise RetryableTTSError so the engine can
+back off and retry; anything else raises TTSError.
+"""
+import asyncio
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.tts.limiter import TokenBucket
+from app.services.tts.scripts import PAUSE_MARKER
+
+
+class TTSError(Exception):
+    """Speech synthesis failed and should not be retried."""
+    pass
+
+
+class RetryableTTSError(TTSError):
+    """
+    Speech synthesis failed transiently (rate limited, server error).
+
+    Args:
+        message: Error description
+        retry_after: Seconds the provider asked us to wait, if any
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class TTSRequest:
+    """Text to synthesize and the voice settings to use."""
+
+    text: str
+    voice_id: str
+    speed: float = 1.0
+    pitch: int = 0
+    emotion: Optional[str] = None
+
+    def fingerprint(self, provider: str) -> str:
+        """
+        Hash of everything that affects the generated audio.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            str: Hex digest
+        """
+        payload = json.dumps({"provider": provider, **asdict(self)}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from datetime import datetime, timezone
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_response(response: httpx.Response) -> httpx.Response:
+    """
+    Raise the right error type for a failed provider response.
+
+    Args:
+        response: Provider API response
+
+    Returns:
+        httpx.Response: The response, if successful
+
+    Raises:
+        RetryableTTSError: On 429 or 5xx
+        TTSError: On other error statuses
+    """
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableTTSError(
+            f"{response.request.url.host} returned {response.status_code}",
+            retry_after=parse_retry_after(response.headers.get("retry-after")),
+        )
+    if response.is_error:
+        raise TTSError(f"{response.request.url.host} returned {response.status_code}: {response.text[:200]}")
+    return response
+
+
+class TTSProvider(ABC):
+    """
+    Base class for TTS provider adapters.
+
+    Class attributes give the provider's default request rate (tokens per
+    second), burst and a sensible worker count.
+    """
+
+    name = "base"
+    requests_per_second = 1.0
+    burst = 1
+    default_concurrency = 4
+
+    def prepare_text(self, text: str) -> str:
+        """Convert <#seconds#> pause markers to the provider's syntax."""
+        return text
+
+    @abstractmethod
+    async def synthesize(self, client: httpx.AsyncClient, request: TTSRequest, limiter: TokenBucket) -> bytes:
+        """
+        Generate speech.
+
+        Args:
+            client: Shared HTTP client
+            request: Text and voice settings
+            limiter: Rate limiter for this provider's API
+
+        Returns:
+            bytes: MP3 audio
+        """
+
+
+class ReplicateProvider(TTSProvider):
+    """
+    MiniMax Speech-02-HD on Replicate.
+
+    Predictions are created with 'Prefer: wait' so short clips usually
+    finish in the create call; longer ones are polled with backoff.
+    """
+
+    name = "replicate"
+    requests_per_second = 5.0
+    burst = 10
+    default_concurrency = 8
+
+    API_BASE = "https://api.replicate.com/v1"
+    MODEL_VERSION = "fdd081f807e655246ef42adbcb3ee9334e7fdc710428684771f90d69992cabb3"
+
+    def __init__(self, api_token: str):
+        self.headers = {"Authorization": f"Bearer {api_token}"}
+
+    async def synthesize(self, client: httpx.AsyncClient, request: TTSRequest, limiter: TokenBucket) -> bytes:
+        await limiter.acquire()
+        response = check_response(await client.post(
+            f"{self.API_BASE}/predictions",
+            headers={**self.headers, "Prefer": "wait=60"},
+            json={
+                "version": self.MODEL_VERSION,
+                "input": {
+                    "text": self.prepare_text(request.text),
+                    "voice_id": request.voice_id,
+                    "emotion": request.emotion or "auto",
+                    "speed": request.speed,
+                    "pitch": request.pitch,
+                    "volume": 1.0,
+                    "audio_format": "mp3",
+                    "sample_rate": 32000,
+                    "bitrate": 128000,
+                    "channel": "mono",
+                },
+            },
+        ))
+        prediction = response.json()
+
+        delay = 0.5
+        while prediction["status"] not in ("succeeded", "failed", "canceled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+            await limiter.acquire()
+            response = check_response(await client.get(
+                f"{self.API_BASE}/predictions/{prediction['id']}",
+                headers=self.headers,
+            ))
+            prediction = response.json()
+
+        if prediction["status"] != "succeeded":
+            raise TTSError(f"Prediction {prediction['status']}: {prediction.get('error')}")
+
+        # Output files are served from Replicate's CDN, outside the API rate limit
+        audio = check_response(await client.get(prediction["output"]))
+        return audio.content
+
+
+class ElevenLabsProvider(TTSProvider):
+    """
+    ElevenLabs text-to-speech.
+
+    Pause markers become <break> tags. Pitch and emotion are not supported
+    by the API; speed is passed through voice settings.
+    """
+
+    name = "elevenlabs"
+    requests_per_second = 2.0
+    burst = 2
+    default_concurrency = 2  # Concurrent request limit on lower-tier plans
+
+    API_BASE = "https://api.elevenlabs.io/v1"
+    MODEL_ID = "eleven_monolingual_v1"
+    VOICE_SETTINGS = {
+        "stability": 0.55,
+        "similarity_boost": 0.80,
+        "style": 0.2,
+        "use_speaker_boost": True,
+    }
+
+    def __init__(self, api_key: str):
+        self.headers = {"xi-api-key": api_key}
+
+    def prepare_text(self, text: str) -> str:
+        return PAUSE_MARKER.sub(lambda match: f'<break time="{match[1]}s" />', text)
+
+    async def synthesize(self, client: httpx.AsyncClient, request: TTSRequest, limiter: TokenBucket) -> bytes:
+        voice_settings = dict(self.VOICE_SETTINGS)
+        if request.speed != 1.0:
+            voice_settings["speed"] = request.speed
+
+        await limiter.acquire()
+        response = check_response(await client.post(
+            f"{self.API_BASE}/text-to-speech/{request.voice_id}",
+            headers=self.headers,
+            json={
+                "text": self.prepare_text(request.text),
+                "model_id": self.MODEL_ID,
+                "voice_settings": voice_settings,
+            },
+        ))
+        return response.content
+
+
+class FakeProvider(TTSProvider):
+    """
+    Offline provider for tests and dry runs.
+
+    Returns deterministic bytes derived from the request instead of audio.
+
+    Args:
+        latency: Seconds each call takes
+        failures: Number of initial calls that fail with a retryable error
+    """
+
+    name = "fake"
+    requests_per_second = 1000.0
+    burst = 1000
+    default_concurrency = 8
+
+    def __init__(self, latency: float = 0.0, failures: int = 0):
+        self.latency = latency
+        self.failures = failures
+        self.calls = 0
+
+    async def synthesize(self, client: httpx.AsyncClient, request: TTSRequest, limiter: TokenBucket) -> bytes:
+        await limiter.acquire()
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.calls <= self.failures:
+            raise RetryableTTSError("Simulated rate limit", retry_after=0.01)
+        return f"FAKE-TTS {request.fingerprint(self.name)}\n".encode()
+
+
+def get_provider(name: str) -> TTSProvider:
+    """
+    Build a provider from settings.
+
+    Args:
+        name: 'replicate', 'elevenlabs' or 'fake'
+
+    Returns:
+        TTSProvider: Configured provider
+
+    Raises:
+        ValueError: If the provider is unknown or its API key is not set
+    """
+    if name == "replicate":
+        if not settings.replicate_api_token:
+            raise ValueError("REPLICATE_API_TOKEN is not set")
+        return ReplicateProvider(settings.replicate_api_token)
+    if name == "elevenlabs":
+        if not settings.elevenlabs_api_key:
+            raise ValueError("ELEVENLABS_API_KEY is not set")
+        return ElevenLabsProvider(settings.elevenlabs_api_key)
+    if name == "fake":
+        return FakeProvider()
+    raise ValueError(f"Unknown TTS provider: {name}")
@@ -0,0 +1,246 @@
+"""
+Narration scripts for pose and sequence audio.
+
+Scripts use MiniMax pause markers, <#seconds#>; providers that use a
+different pause syntax convert them (see TTSProvider.prepare_text).
+"""
+import re
+
+# Pause marker: <#1.5#> is a 1.5 second pause
+PAUSE_MARKER = re.compile(r"<#(\d+(?:\.\d+)?)#>")
+
+
+def slugify(name: str) -> str:
+    """Filename stem for a pose or sequence name: 'Warrior I' -> 'warrior-i'."""
+    return name.lower().replace(' ', '-').replace("'", '')
+
+
+def format_pose_script(pose: dict) -> str:
+    """
+    Format pose instructions into a natural, ASMR-style script.
+
+    Structure:
+    1. Gentle introduction with Sanskrit name
+    2. Step-by-step entry instructions
+    3. Holding cues with breathing
+    4. Exit instructions
+
+    Args:
+        pose: Pose fields (name_english, name_sanskrit, entry_instructions,
+            exit_instructions, holding_cues, breathing_pattern,
+            has_side_variation)
+
+    Returns:
+        str: Script with pause markers
+    """
+    script_parts = []
+
+    # Introduction
+    intro = f"{pose['name_english']}"
+    if pose['name_sanskrit']:
+        intro += f", or in Sanskrit, {pose['name_sanskrit']}"
+    intro += "."
+    script_parts.append(intro)
+    script_parts.append("<#1.5#>")
+
+    # Entry instructions
+    if pose['entry_instructions']:
+        script_parts.append("To enter this pose.")
+        script_parts.append("<#0.8#>")
+        for instruction in pose['entry_instructions']:
+            script_parts.append(instruction)
+            script_parts.append("<#1.2#>")  # Pause between steps for ASMR effect
+
+    # Holding cues
+    if pose['holding_cues']:
+        script_parts.append("As you hold the pose.")
+        script_parts.append("<#0.8#>")
+        script_parts.append(pose['holding_cues'])
+        script_parts.append("<#1.0#>")
+
+    # Breathing
+    if pose['breathing_pattern']:
+        script_parts.append(pose['breathing_pattern'])
+        script_parts.append("<#1.0#>")
+
+    # Exit instructions
+    if pose['exit_instructions']:
+        script_parts.append("To release.")
+        script_parts.append("<#0.8#>")
+        for instruction in pose['exit_instructions']:
+            script_parts.append(instruction)
+            script_parts.append("<#1.0#>")
+
+    # Side variation note
+    if pose['has_side_variation']:
+        script_parts.append("<#0.5#>")
+        script_parts.append("Remember to practice this pose on both sides.")
+
+    return " ".join(script_parts)
+
+
+def format_sequence_intro(sequence: dict) -> str:
+    """
+    Format the sequence introduction.
+
+    Args:
+        sequence: Sequence fields (name, description, difficulty_level,
+            duration_minutes, focus_area)
+
+    Returns:
+        str: Script with pause markers
+    """
+    parts = []
+
+    # Welcome
+    parts.append(f"Welcome to {sequence['name']}.")
+    parts.append("<#1.5#>")
+
+    # Description
+    if sequence['description']:
+        parts.append(sequence['description'])
+        parts.append("<#1.5#>")
+
+    # Duration and level
+    parts.append(
+        f"This {sequence['difficulty_level']} level sequence will take approximately "
+        f"{sequence['duration_minutes']} minutes."
+    )
+    parts.append("<#1.2#>")
+
+    # Focus
+    parts.append(f"We'll be focusing on {sequence['focus_area'].lower()}.")
+    parts.append("<#1.5#>")
+
+    # Preparation
+    parts.append("Find a comfortable space, grab your mat, and let's begin.")
+    parts.append("<#1.0#>")
+    parts.append("Take a moment to center yourself.")
+    parts.append("<#2.0#>")
+    parts.append("When you're ready, we'll move into our first pose.")
+    parts.append("<#1.0#>")
+
+    return " ".join(parts)
+
+
+# Longest pose hold a sequence allows (SequencePoseBase.duration_seconds)
+MAX_HOLD_SECONDS = 600
+
+HOLD_PREFIX = "Hold this pose for"
+
+
+def duration_phrases(seconds_total: int) -> list[str]:
+    """
+    Spoken hold duration as phrases: 90 -> ['1 minute', 'and', '30 seconds'].
+
+    Each phrase is a number with its unit, or 'and', so every hold up to
+    MAX_HOLD_SECONDS is spoken from a small fixed set of phrases.
+    """
+    minutes, seconds = divmod(seconds_total, 60)
+    phrases = []
+    if minutes > 0:
+        phrases.append(f"{minutes} minute{'s' if minutes > 1 else ''}")
+    if seconds > 0 or minutes == 0:
+        if phrases:
+            phrases.append("and")
+        phrases.append(f"{seconds} second{'s' if seconds != 1 else ''}")
+    return phrases
+
+
+def format_duration(seconds_total: int) -> str:
+    """Spoken hold duration: 90 -> '1 minute and 30 seconds'."""
+    return " ".join(duration_phrases(seconds_total))
+
+
+def hold_phrases(seconds_total: int) -> list[str]:
+    """Phrases of the hold sentence: 'Hold this pose for', then the duration."""
+    return [HOLD_PREFIX, *duration_phrases(seconds_total)]
+
+
+def format_hold(seconds_total: int) -> str:
+    """Hold sentence: 90 -> 'Hold this pose for 1 minute and 30 seconds.'"""
+    return " ".join(hold_phrases(seconds_total)) + "."
+
+
+def hold_vocabulary() -> list[str]:
+    """
+    Every phrase a hold sentence can use, for holds up to MAX_HOLD_SECONDS.
+
+    Returns:
+        list[str]: Distinct phrases, in a stable order
+    """
+    phrases: dict[str, None] = {}
+    for seconds_total in range(1, MAX_HOLD_SECONDS + 1):
+        phrases.update(dict.fromkeys(hold_phrases(seconds_total)))
+    return list(phrases)
+
+
+def format_pose_transition(pose: dict, pose_number: int, total_poses: int) -> str:
+    """
+    Format a transition to a pose with timing.
+
+    Args:
+        pose: Pose fields (name_english, name_sanskrit, duration in seconds)
+        pose_number: 1-based position in the sequence
+        total_poses: Number of poses in the sequence
+
+    Returns:
+        str: Script with pause markers
+    """
+    parts = []
+
+    # Pose announcement
+    if pose_number == 1:
+        parts.append(f"Let's begin with {pose['name_english']}")
+    else:
+        parts.append(f"Next, we'll move into {pose['name_english']}")
+
+    # Sanskrit name if available
+    if pose['name_sanskrit']:
+        parts.append(f", or {pose['name_sanskrit']}")
+
+    parts.append(".")
+    parts.append("<#1.0#>")
+
+    parts.append(format_hold(pose['duration']))
+    parts.append("<#0.8#>")
+
+    # Breathing reminder
+    parts.append("Remember to breathe deeply and naturally.")
+    parts.append("<#1.5#>")
+
+    return " ".join(parts)
+
+
+def format_sequence_outro() -> str:
+    """Format the sequence closing."""
+    parts = []
+
+    parts.append("Well done.")
+    parts.append("<#1.5#>")
+    parts.append("You've completed this sequence.")
+    parts.append("<#1.5#>")
+    parts.append("Take a moment to notice how you feel.")
+    parts.append("<#2.0#>")
+    parts.append("Rest in stillness for as long as you like.")
+    parts.append("<#1.5#>")
+    parts.append("Namaste.")
+
+    return " ".join(parts)
+
+
+def format_sequence_script(sequence: dict) -> str:
+    """
+    Format the complete sequence script.
+
+    Args:
+        sequence: Sequence fields plus 'poses', in order
+
+    Returns:
+        str: Script with pause markers
+    """
+    parts = [format_sequence_intro(sequence)]
+    for index, pose in enumerate(sequence['poses'], 1):
+        parts.append(format_pose_transition(pose, index, len(sequence['poses'])))
+    parts.append(format_sequence_outro())
+    return " ".join(parts)
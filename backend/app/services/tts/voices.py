@@ -0,0 +1,49 @@
+"""
+Narration voices and the clip files they produce.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from app.services.tts.providers import TTSRequest
+
+
+@dataclass(frozen=True)
+class Voice:
+    """
+    A narration voice: provider, provider voice ID and delivery settings.
+
+    Args:
+        name: Voice name used by clients and scripts
+        provider: Provider name (see get_provider)
+        voice_id: Provider's voice ID
+        speed: Speech speed multiplier
+        pitch: Pitch shift in semitones
+        emotion: Emotional tone, where supported
+        suffix: Filename suffix of this voice's clips ('-calm' -> x-calm.mp3)
+    """
+
+    name: str
+    provider: str
+    voice_id: str
+    speed: float = 1.0
+    pitch: int = 0
+    emotion: Optional[str] = None
+    suffix: str = ""
+
+    def request(self, text: str) -> TTSRequest:
+        """Build a TTS request for `text` in this voice."""
+        return TTSRequest(text=text, voice_id=self.voice_id, speed=self.speed, pitch=self.pitch, emotion=self.emotion)
+
+    def filename(self, slug: str) -> str:
+        """Clip filename for a pose or sequence slug."""
+        return f"{slug}{self.suffix}.mp3"
+
+
+# MiniMax voices use ASMR-style delivery: 0.8x speed, -2 semitones, calm tone
+VOICES = {
+    "calm": Voice("calm", "replicate", "Calm_Woman", speed=0.8, pitch=-2, emotion="calm", suffix="-calm"),
+    "wise": Voice("wise", "replicate", "Wise_Woman", speed=0.8, pitch=-2, emotion="calm", suffix="-wise"),
+    "voice3": Voice("voice3", "elevenlabs", "zA6D7RyKdc2EClouEMkP"),
+}
+
+DEFAULT_VOICE = "calm"
@@ -1,15 +1,22 @@
 """
 Service for handling file uploads and image processing.
 """
+import asyncio
+import multiprocessing
 import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple
-from PIL import Image
-import io
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+import anyio
+from fastapi import UploadFile
 
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.services.image_manifest import derivatives_directory, image_manifest
+
+T = TypeVar("T")
 
 
 # Allowed image formats
@@ -20,6 +27,15 @@ ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_IMAGE_DIMENSION = 2000  # 2000px max width/height
 
+# Bytes copied from an upload per read
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Process pool for CPU-bound image work, created on first use
+_image_pool: Optional[ProcessPoolExecutor] = None
+
+# Background derivative jobs still running
+_pending_jobs: set[asyncio.Future] = set()
+
 
 class ImageUploadError(Exception):
     """Custom exception for image upload errors."""
@@ -59,140 +75,234 @@ def validate_image_file(filename: str, content_type: str, file_size: int) -> Non
         )
 
 
-def optimize_image(image_data: bytes, max_dimension: int = MAX_IMAGE_DIMENSION) -> Tuple[bytes, int, int, str]:
+def get_image_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool used for CPU-bound image work.
+
+    Workers are spawned (not forked) so they don't inherit the server's
+    threads and locks, and are created on first use.
+
+    Returns:
+        ProcessPoolExecutor: Shared image processing pool
+    """
+    global _image_pool
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(
+            max_workers=settings.image_process_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _image_pool
+
+
+async def run_in_image_pool(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a picklable function from image_processing in the image pool.
+
+    Args:
+        func: Module-level function to run
+        *args: Picklable arguments
+
+    Returns:
+        The function's result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_pool(), func, *args)
+
+
+async def shutdown_image_pool(timeout: float = 30.0) -> None:
+    """
+    Wait for pending derivative jobs, then stop the image pool.
+
+    Args:
+        timeout: Seconds to wait for pending jobs
+    """
+    global _image_pool
+    if _pending_jobs:
+        await asyncio.wait(_pending_jobs, timeout=timeout)
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=False, cancel_futures=True)
+        _image_pool = None
+
+
+def _image_dirs() -> Tuple[Path, Path]:
+    """Return (optimized images dir, originals dir), creating them if needed."""
+    images_dir = Path(settings.upload_directory) / "images"
+    originals_dir = images_dir / "originals"
+    originals_dir.mkdir(parents=True, exist_ok=True)
+    return images_dir, originals_dir
+
+
+async def stream_to_file(file: UploadFile, destination: Path, max_size: int = MAX_FILE_SIZE) -> int:
     """
-    Optimize image by resizing and compressing.
+    Copy an upload to `destination` in chunks, enforcing `max_size`.
+
+    The file is fsynced before returning so it survives a crash.
 
     Args:
-        image_data: Raw image bytes
-        max_dimension: Maximum width or height in pixels
+        file: Uploaded file
+        destination: Path to write
+        max_size: Maximum size in bytes
 
     Returns:
-        Tuple of (optimized_bytes, width, height, format)
+        int: Bytes written
 
     Raises:
-        ImageUploadError: If image processing fails
+        ImageUploadError: If the upload exceeds `max_size`
     """
-    try:
-        # Open image
-        image = Image.open(io.BytesIO(image_data))
-
-        # Get original dimensions
-        original_width, original_height = image.size
-        image_format = image.format or "JPEG"
-
-        # Convert RGBA to RGB if needed (for JPEG)
-        if image.mode in ("RGBA", "LA", "P"):
-            # Create white background
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            background.paste(image, mask=image.split()[-1] if image.mode in ("RGBA", "LA") else None)
-            image = background
-
-        # Resize if needed
-        if max(original_width, original_height) > max_dimension:
-            # Calculate new dimensions maintaining aspect ratio
-            if original_width > original_height:
-                new_width = max_dimension
-                new_height = int(original_height * (max_dimension / original_width))
-            else:
-                new_height = max_dimension
-                new_width = int(original_width * (max_dimension / original_height))
-
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            logger.info(
-                "Image resized",
-                original_size=f"{original_width}x{original_height}",
-                new_size=f"{new_width}x{new_height}"
-            )
-        else:
-            new_width, new_height = original_width, original_height
-
-        # Compress image
-        output = io.BytesIO()
-        if image_format.upper() in ("JPEG", "JPG"):
-            image.save(output, format="JPEG", quality=85, optimize=True)
-        elif image_format.upper() == "PNG":
-            image.save(output, format="PNG", optimize=True)
-        elif image_format.upper() == "WEBP":
-            image.save(output, format="WEBP", quality=85)
-        else:
-            # Default to JPEG
-            image.save(output, format="JPEG", quality=85, optimize=True)
-            image_format = "JPEG"
+    size = 0
+    async with await anyio.open_file(destination, "wb") as output:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise ImageUploadError(f"File too large. Maximum size: {max_size / (1024 * 1024)}MB")
+            await output.write(chunk)
+        await output.flush()
+        await anyio.to_thread.run_sync(os.fsync, output.wrapped.fileno())
+    return size
+
+
+def _schedule(coroutine: Awaitable[None]) -> None:
+    """Run a background job, keeping a reference until it finishes."""
+    task = asyncio.ensure_future(coroutine)
+    _pending_jobs.add(task)
+    task.add_done_callback(_pending_jobs.discard)
+
+
+async def generate_derivatives(filename: str) -> None:
+    """
+    Produce the optimized copy and responsive derivatives of a stored original.
 
-        optimized_data = output.getvalue()
+    Both run in the image pool and both read the original, so derivatives
+    are encoded once (not from the already re-encoded optimized copy). The
+    derivatives are recorded in the image manifest under
+    'uploads/<filename>' so CDNService can pick the best-fitting one.
 
-        logger.info(
-            "Image optimized",
-            original_size=len(image_data),
-            optimized_size=len(optimized_data),
-            compression_ratio=f"{len(optimized_data) / len(image_data):.2%}"
-        )
+    Args:
+        filename: Stored image filename
+    """
+    from app.services.image_processing import (
+        generate_responsive_images,
+        optimize_image_file,
+        supported_derivative_formats,
+    )
 
-        return optimized_data, new_width, new_height, image_format
+    images_dir, originals_dir = _image_dirs()
+    try:
+        size, width, height, image_format = await run_in_image_pool(
+            optimize_image_file,
+            str(originals_dir / filename),
+            str(images_dir / filename),
+            MAX_IMAGE_DIMENSION,
+        )
+    except Exception as error:
+        logger.error("Image optimization failed", filename=filename, error=str(error))
+        return
+
+    logger.info(
+        "Image optimized",
+        filename=filename,
+        optimized_size=size,
+        width=width,
+        height=height,
+        format=image_format,
+    )
 
+    try:
+        variants = await run_in_image_pool(
+            generate_responsive_images,
+            str(originals_dir / filename),
+            str(derivatives_directory()),
+            settings.image_derivative_widths_list,
+            supported_derivative_formats(settings.image_derivative_formats_list),
+        )
+        await anyio.to_thread.run_sync(image_manifest.record, f"uploads/{filename}", variants)
     except Exception as error:
-        logger.error("Image optimization failed", error=str(error))
-        raise ImageUploadError(f"Failed to process image: {str(error)}")
+        logger.error("Image derivative generation failed", filename=filename, error=str(error))
+        return
 
+    logger.info("Image derivatives generated", filename=filename, variants=len(variants))
 
-async def save_image(
-    filename: str,
-    content_type: str,
-    file_data: bytes
-) -> Tuple[str, str, int, int, int, str]:
+
+async def save_image(file: UploadFile) -> Tuple[str, str, int, int, int, str]:
     """
-    Save and optimize an uploaded image.
+    Store an uploaded image and queue its optimization.
+
+    The upload is streamed to disk (never held in memory whole) with the
+    size limit enforced as bytes arrive. The original is fsynced and
+    renamed into place, then the response can be sent; the optimized copy
+    is produced in the image process pool afterwards. Until it exists,
+    the original is served at the same URL.
 
     Args:
-        filename: Original filename
-        content_type: MIME type
-        file_data: Raw file bytes
+        file: Uploaded file
 
     Returns:
-        Tuple of (url, saved_filename, file_size, width, height, format)
+        Tuple of (url, saved_filename, file_size, width, height, format) for
+        the stored original
 
     Raises:
-        ImageUploadError: If save fails
+        ImageUploadError: If validation or save fails
     """
-    # Validate file
-    validate_image_file(filename, content_type, len(file_data))
+    from app.services.image_processing import read_image_info
+
+    filename = file.filename or "image.jpg"
+    content_type = file.content_type or "image/jpeg"
 
-    # Optimize image
-    optimized_data, width, height, image_format = optimize_image(file_data)
+    # Validate type up front; size is enforced while streaming
+    validate_image_file(filename, content_type, 0)
 
     # Generate unique filename
     file_ext = Path(filename).suffix.lower()
     unique_filename = f"{uuid.uuid4()}{file_ext}"
 
-    # Create upload directory if it doesn't exist
-    upload_dir = Path(settings.upload_directory) / "images"
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    _, originals_dir = _image_dirs()
+    original_path = originals_dir / unique_filename
+    partial_path = originals_dir / f".{unique_filename}.part"
 
-    # Save file
-    file_path = upload_dir / unique_filename
     try:
-        with open(file_path, "wb") as file_object:
-            file_object.write(optimized_data)
-
-        logger.info(
-            "Image saved",
-            filename=unique_filename,
-            path=str(file_path),
-            size=len(optimized_data)
-        )
-
-        # Generate URL (for MVP, use local file path; in production use CDN)
-        url = f"/uploads/images/{unique_filename}"
-
-        return url, unique_filename, len(optimized_data), width, height, image_format
-
+        file_size = await stream_to_file(file, partial_path)
+        width, height, image_format = await anyio.to_thread.run_sync(read_image_info, str(partial_path))
+        await anyio.to_thread.run_sync(os.replace, partial_path, original_path)
+    except ImageUploadError:
+        partial_path.unlink(missing_ok=True)
+        raise
     except Exception as error:
+        partial_path.unlink(missing_ok=True)
         logger.error("Failed to save image", error=str(error))
         raise ImageUploadError(f"Failed to save image: {str(error)}")
 
+    logger.info(
+        "Image saved",
+        filename=unique_filename,
+        path=str(original_path),
+        size=file_size
+    )
+    _schedule(generate_derivatives(unique_filename))
+
+    # Generate URL (for MVP, use local file path; in production use CDN)
+    url = f"/uploads/images/{unique_filename}"
+
+    return url, unique_filename, file_size, width, height, image_format
+
+
+def resolve_image_path(filename: str) -> Optional[Path]:
+    """
+    Find the file to serve for an uploaded image.
+
+    Args:
+        filename: Stored image filename
+
+    Returns:
+        Optional[Path]: Optimized copy if ready, else the original, else None
+    """
+    if Path(filename).name != filename:
+        return None
+    images_dir = Path(settings.upload_directory) / "images"
+    for path in (images_dir / filename, images_dir / "originals" / filename):
+        if path.is_file():
+            return path
+    return None
+
 
 async def delete_image(filename: str) -> bool:
     """
@@ -205,14 +315,20 @@ async def delete_image(filename: str) -> bool:
         True if deleted successfully, False otherwise
     """
     try:
-        file_path = Path(settings.upload_directory) / "images" / filename
-        if file_path.exists():
-            file_path.unlink()
+        if Path(filename).name != filename:
+            return False
+        images_dir = Path(settings.upload_directory) / "images"
+        deleted = False
+        for file_path in (images_dir / filename, images_dir / "originals" / filename):
+            if file_path.exists():
+                file_path.unlink()
+                deleted = True
+        image_manifest.remove(f"uploads/{filename}")
+        if deleted:
             logger.info("Image deleted", filename=filename)
-            return True
         else:
             logger.warning("Image not found for deletion", filename=filename)
-            return False
+        return deleted
     except Exception as error:
         logger.error("Failed to delete image", filename=filename, error=str(error))
         return False
@@ -3,11 +3,20 @@ Pytest configuration and shared fixtures for YogaFlow tests.
 """
 import asyncio
 import pytest
+from contextlib import contextmanager
 from typing import AsyncGenerator, Generator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import NullPool
 
-from app.core.database import Base, get_database_session
+from app.core.database import (
+    Base,
+    QueryStats,
+    current_query_stats,
+    get_database_session,
+    get_read_only_session,
+    get_unit_of_work_session,
+    instrument_engine,
+)
 from app.core.security import hash_password
 # Import all models to ensure they're registered with Base
 from app.models import *  # noqa: F401, F403
@@ -36,6 +45,7 @@ async def test_engine():
         echo=False,
         poolclass=NullPool,
     )
+    instrument_engine(engine, "test")
 
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
@@ -70,15 +80,59 @@ async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
 
 @pytest.fixture(scope="function", autouse=True)
 async def override_get_db(db_session: AsyncSession):
-    """Override the get_database_session dependency for testing."""
+    """Override the database session dependencies for testing."""
     async def _override_get_db():
         yield db_session
 
     app.dependency_overrides[get_database_session] = _override_get_db
+    app.dependency_overrides[get_read_only_session] = _override_get_db
+    app.dependency_overrides[get_unit_of_work_session] = _override_get_db
     yield
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_rate_limits():
+    """Start every test with empty in-process rate limit buckets."""
+    from app.core.rate_limit import limiter
+
+    limiter.reset()
+    yield
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_catalog_cache():
+    """Start every test with an empty catalog cache."""
+    from app.services.catalog_cache import catalog_cache
+
+    catalog_cache.invalidate()
+    yield
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Assert that a block executes at most `max_queries` SQL statements.
+
+    Usage:
+        with assert_max_queries(2):
+            await async_client.get("/api/v1/poses")
+    """
+    @contextmanager
+    def _assert_max_queries(max_queries: int):
+        stats = QueryStats(parent=current_query_stats.get())
+        token = current_query_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count <= max_queries, (
+            f"Expected at most {max_queries} queries, executed {stats.count}"
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture
 async def test_user(db_session: AsyncSession) -> User:
     """Create a test user."""
@@ -0,0 +1,295 @@
+"""
+Tests for MP3 frame handling and sequence audio assembly.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models.sequence import Sequence, SequencePose
+from app.services.tts import AudioCache, FakeProvider, MissingClipsError, SequenceAssembler, TTSEngine, VOICES
+from app.services.tts.assembly import (
+    Pause,
+    Speech,
+    sequence_assembler,
+    sequence_script_fields,
+    sequence_segments,
+    split_script,
+)
+from app.services.tts.mp3 import audio_span, parse_header, silence_frame_count, silent_frame
+
+# MPEG-1 Layer III, 128kbps, 32kHz, mono: 576-byte frames of 36ms
+HEADER = b"\xff\xfb\x98\xc4"
+FRAME_LENGTH = 576
+
+
+def make_clip(path, frames=10, id3=True, xing=True, id3v1=True):
+    """Write a structurally valid MP3: optional tags and info frame around audio frames."""
+    data = b""
+    if id3:
+        data += b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    if xing:
+        data += HEADER + b"\x00" * 17 + b"Info" + b"\x00" * (FRAME_LENGTH - 25)
+    data += (HEADER + bytes(range(1, 256)) * 3)[:FRAME_LENGTH] * frames
+    if id3v1:
+        data += b"TAG" + b"\x00" * 125
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return data
+
+
+SEQUENCE = {
+    "name": "Morning Flow",
+    "description": "Wake up gently.",
+    "difficulty_level": "beginner",
+    "duration_minutes": 5,
+    "focus_area": "Flexibility",
+    "poses": [
+        {"name_english": "Mountain Pose", "name_sanskrit": "Tadasana", "duration": 30},
+        {"name_english": "Child's Pose", "name_sanskrit": None, "duration": 60},
+    ],
+}
+
+
+def generate_clips(assembler, voice, sequences=(SEQUENCE,)):
+    """Write a fake clip for every sentence the sequences need."""
+    for job in assembler.clip_jobs(list(sequences), voice):
+        make_clip(job.output_path, frames=3)
+
+
+class TestMP3:
+    """Tests for frame parsing and silence frames."""
+
+    def test_parse_header(self):
+        header = parse_header(HEADER)
+        assert header.bitrate == 128000
+        assert header.sample_rate == 32000
+        assert header.channels == 1
+        assert header.frame_length == FRAME_LENGTH
+        assert header.frame_duration == pytest.approx(0.036)
+
+    def test_audio_span_skips_tags_and_info_frame(self, tmp_path):
+        path = tmp_path / "clip.mp3"
+        data = make_clip(path, frames=4)
+
+        span = audio_span(path)
+
+        assert span.length == 4 * FRAME_LENGTH
+        assert data[span.start:span.start + 4] == HEADER
+        assert data[span.end:span.end + 3] == b"TAG"
+
+    def test_audio_span_without_tags(self, tmp_path):
+        path = tmp_path / "clip.mp3"
+        make_clip(path, frames=2, id3=False, xing=False, id3v1=False)
+
+        span = audio_span(path)
+
+        assert (span.start, span.end) == (0, 2 * FRAME_LENGTH)
+
+    def test_silent_frame(self):
+        frame = silent_frame(parse_header(HEADER))
+        assert len(frame) == FRAME_LENGTH
+        assert parse_header(frame).bitrate == 128000
+        assert frame[4:] == bytes(FRAME_LENGTH - 4)
+
+    def test_silence_frame_count(self):
+        assert silence_frame_count(parse_header(HEADER), 36.0) == 1000
+
+
+class TestScriptSegments:
+    """Tests for splitting scripts at pause markers."""
+
+    def test_split_script(self):
+        assert split_script("Welcome. <#1.5#> Breathe in , slowly . <#0.5#><#0.5#> Done.") == [
+            Speech("Welcome."), Pause(1.5), Speech("Breathe in, slowly."), Pause(1.0), Speech("Done."),
+        ]
+
+    def test_sequence_segments_hold_each_pose(self):
+        segments = sequence_segments(SEQUENCE)
+
+        assert segments[0] == Speech("Welcome to Morning Flow.")
+        assert Speech("Let's begin with Mountain Pose, or Tadasana.") in segments
+        # Transition ends with a 1.5s pause, merged with the 30s hold
+        assert Pause(31.5) in segments
+        assert Pause(61.5) in segments
+        assert segments[-1] == Speech("Namaste.")
+
+    def test_sequences_share_clips(self, tmp_path):
+        assembler = SequenceAssembler(tmp_path)
+        other = {**SEQUENCE, "name": "Evening Flow"}
+
+        shared = assembler.clip_jobs([SEQUENCE], VOICES["calm"])
+        both = assembler.clip_jobs([SEQUENCE, other], VOICES["calm"])
+
+        # Only the welcome sentence differs
+        assert len(both) == len(shared) + 1
+
+    def test_hold_spoken_from_phrase_clips(self):
+        segments = sequence_segments(SEQUENCE)
+
+        assert segments[segments.index(Speech("Hold this pose for")) + 1] == Speech("30 seconds")
+        assert Speech("Hold this pose for 30 seconds.") not in segments
+
+    def test_hold_time_variant_needs_no_new_clips(self, tmp_path):
+        assembler = SequenceAssembler(tmp_path)
+        variant = {**SEQUENCE, "poses": [{**pose, "duration": 245} for pose in SEQUENCE["poses"]]}
+
+        paths = {job.output_path for job in assembler.clip_jobs([SEQUENCE], VOICES["calm"])}
+        variant_paths = {job.output_path for job in assembler.clip_jobs([variant], VOICES["calm"])}
+
+        assert variant_paths == paths
+
+
+class TestSequenceAssembler:
+    """Tests for assembling tracks from clips."""
+
+    def test_missing_clips(self, tmp_path):
+        assembler = SequenceAssembler(tmp_path)
+
+        with pytest.raises(MissingClipsError) as error:
+            assembler.assemble(SEQUENCE, VOICES["calm"])
+
+        assert "Welcome to Morning Flow." in error.value.texts
+
+    def test_assembles_clips_and_silence(self, tmp_path):
+        voice = VOICES["calm"]
+        assembler = SequenceAssembler(tmp_path)
+        generate_clips(assembler, voice)
+
+        assert assembler.assemble(SEQUENCE, voice)
+
+        track = assembler.output_path(SEQUENCE, voice).read_bytes()
+        assert len(track) % FRAME_LENGTH == 0
+        # Every frame starts with a header; no tags or info frames in between
+        frames = [track[offset:offset + FRAME_LENGTH] for offset in range(0, len(track), FRAME_LENGTH)]
+        assert all(frame[:2] == HEADER[:2] for frame in frames)
+        assert b"TAG" not in track and b"Info" not in track
+        silent = sum(frame[4:] == bytes(FRAME_LENGTH - 4) for frame in frames)
+        # Both holds plus every scripted pause
+        assert silent * 0.036 > 90
+
+    def test_streams_ranges(self, tmp_path):
+        voice = VOICES["calm"]
+        assembler = SequenceAssembler(tmp_path)
+        generate_clips(assembler, voice)
+        plan = assembler.plan(sequence_segments(SEQUENCE), voice)
+        full = b"".join(plan.iter_chunks(chunk_size=1000))
+
+        assert len(full) == plan.size
+        for start, end in [(0, 10), (575, 1153), (1000, 50000), (plan.size - 7, plan.size)]:
+            assert b"".join(plan.iter_chunks(start, end, chunk_size=333)) == full[start:end]
+
+    def test_unchanged_track_is_not_rebuilt(self, tmp_path):
+        voice = VOICES["calm"]
+        assembler = SequenceAssembler(tmp_path, cache=AudioCache(tmp_path))
+        generate_clips(assembler, voice)
+
+        assert assembler.assemble(SEQUENCE, voice)
+        assert not assembler.assemble(SEQUENCE, voice)
+        assert assembler.assemble({**SEQUENCE, "poses": SEQUENCE["poses"][:1]}, voice)
+
+    async def test_clip_jobs_run_through_engine(self, tmp_path):
+        voice = VOICES["calm"]
+        assembler = SequenceAssembler(tmp_path)
+        jobs = assembler.clip_jobs([SEQUENCE], voice)
+
+        report = await TTSEngine(FakeProvider()).run(jobs)
+
+        assert report.generated == len(jobs)
+        assert all(job.output_path.parent == tmp_path / "clips" for job in jobs)
+
+
+@pytest.fixture
+async def sequence_clips(db_session, test_sequence, tmp_path, monkeypatch):
+    """Content directory with every clip the test sequence needs in the calm voice."""
+    monkeypatch.setattr(settings, "content_directory", str(tmp_path))
+    result = await db_session.execute(
+        select(Sequence)
+        .where(Sequence.sequence_id == test_sequence.sequence_id)
+        .options(selectinload(Sequence.sequence_poses).selectinload(SequencePose.pose))
+    )
+    fields = sequence_script_fields(result.scalar_one())
+    generate_clips(sequence_assembler, VOICES["calm"], [fields])
+    plan = sequence_assembler.plan(sequence_segments(fields), VOICES["calm"])
+    return b"".join(plan.iter_chunks())
+
+
+class TestSequenceAudioStream:
+    """Tests for GET /api/v1/sequences/{id}/audio/stream."""
+
+    async def test_streams_full_track(self, async_client, test_sequence, sequence_clips):
+        response = await async_client.get(f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/mpeg"
+        assert response.headers["accept-ranges"] == "bytes"
+        # Streamed with chunked transfer encoding, not buffered to a known length
+        assert "content-length" not in response.headers
+        assert response.content == sequence_clips
+        # Holds of 60 + 120 + 180 seconds
+        assert float(response.headers["x-content-duration"]) > 360
+
+    async def test_range_request(self, async_client, test_sequence, sequence_clips):
+        url = f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream"
+        size = len(sequence_clips)
+
+        response = await async_client.get(url, headers={"Range": "bytes=1000-4999"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 1000-4999/{size}"
+        assert response.headers["content-length"] == "4000"
+        assert response.content == sequence_clips[1000:5000]
+
+        response = await async_client.get(url, headers={"Range": "bytes=-100"})
+        assert response.status_code == 206
+        assert response.content == sequence_clips[-100:]
+
+        response = await async_client.get(url, headers={"Range": f"bytes={size - 10}-"})
+        assert response.content == sequence_clips[-10:]
+
+    async def test_unsatisfiable_range(self, async_client, test_sequence, sequence_clips):
+        response = await async_client.get(
+            f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream",
+            headers={"Range": f"bytes={len(sequence_clips)}-"},
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(sequence_clips)}"
+
+    async def test_resume_with_if_range(self, async_client, test_sequence, sequence_clips):
+        url = f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream"
+        etag = (await async_client.head(url)).headers["etag"]
+
+        resumed = await async_client.get(url, headers={"Range": "bytes=500-", "If-Range": etag})
+        stale = await async_client.get(url, headers={"Range": "bytes=500-", "If-Range": '"other"'})
+
+        assert resumed.status_code == 206
+        assert resumed.content == sequence_clips[500:]
+        assert stale.status_code == 200
+        assert stale.content == sequence_clips
+
+    async def test_head_and_not_modified(self, async_client, test_sequence, sequence_clips):
+        url = f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream"
+
+        head = await async_client.head(url)
+        assert head.status_code == 200
+        assert head.headers["content-length"] == str(len(sequence_clips))
+        assert head.content == b""
+
+        response = await async_client.get(url, headers={"If-None-Match": head.headers["etag"]})
+        assert response.status_code == 304
+
+    async def test_missing_clips(self, async_client, test_sequence, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "content_directory", str(tmp_path))
+
+        response = await async_client.get(f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream")
+
+        assert response.status_code == 404
+
+    async def test_unknown_sequence_or_voice(self, async_client, test_sequence, sequence_clips):
+        response = await async_client.get("/api/v1/sequences/99999/audio/stream")
+        assert response.status_code == 404
+
+        response = await async_client.get(
+            f"/api/v1/sequences/{test_sequence.sequence_id}/audio/stream?voice=shouty"
+        )
+        assert response.status_code == 400
@@ -0,0 +1,80 @@
+"""
+Tests for bulk row loading.
+"""
+import json
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, func, select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from app.core.bulk_load import _CopyEncoder, bulk_insert, bulk_insert_returning_keys
+from app.models.pose import DifficultyLevel, Pose, PoseCategory
+
+
+def pose_row(number: int) -> dict:
+    """Column values for a pose, without keys or timestamps."""
+    return {
+        "name_english": f"Pose {number}",
+        "category": PoseCategory.STANDING,
+        "difficulty_level": DifficultyLevel.BEGINNER,
+        "description": "Test pose",
+        "instructions": ["Stand", "Breathe"],
+        "image_urls": ["https://example.com/pose.jpg"],
+    }
+
+
+class TestBulkInsert:
+    """Tests for the executemany path used on SQLite."""
+
+    async def test_inserts_in_chunks_with_defaults(self, db_session):
+        rows = (pose_row(number) for number in range(25))
+
+        count = await bulk_insert(await db_session.connection(), Pose, rows, chunk_size=10)
+        await db_session.commit()
+
+        assert count == 25
+        poses = (await db_session.execute(select(Pose).order_by(Pose.pose_id))).scalars().all()
+        assert [pose.name_english for pose in poses] == [f"Pose {number}" for number in range(25)]
+        assert poses[0].instructions == ["Stand", "Breathe"]
+        assert poses[0].category == PoseCategory.STANDING
+        # Python-side defaults still apply
+        assert all(pose.created_at is not None for pose in poses)
+
+    async def test_returning_keys_in_row_order(self, db_session, test_sequence, test_poses):
+        keys = await bulk_insert_returning_keys(
+            await db_session.connection(), Pose, [pose_row(number) for number in range(12)], chunk_size=5
+        )
+
+        assert len(keys) == len(set(keys)) == 12
+        names = dict((await db_session.execute(select(Pose.pose_id, Pose.name_english))).all())
+        assert [names[key] for key in keys] == [f"Pose {number}" for number in range(12)]
+
+    async def test_rolls_back_with_transaction(self, db_session):
+        await bulk_insert(await db_session.connection(), Pose.__table__, [pose_row(1), pose_row(2)])
+        await db_session.rollback()
+
+        assert await db_session.scalar(select(func.count()).select_from(Pose)) == 0
+
+    async def test_returning_keys_needs_single_primary_key(self, db_session):
+        table = Table("pairs", MetaData(), Column("a", Integer, primary_key=True), Column("b", Integer, primary_key=True))
+
+        with pytest.raises(ValueError):
+            await bulk_insert_returning_keys(await db_session.connection(), table, [])
+
+
+class TestCopyEncoder:
+    """Tests for COPY record encoding on PostgreSQL."""
+
+    def test_records_use_bind_processors_and_defaults(self):
+        encoder = _CopyEncoder(asyncpg_dialect(), Pose.__table__, list(pose_row(1)))
+
+        (record,) = encoder.records([pose_row(1)])
+        values = dict(zip(encoder.columns, record))
+
+        # Enums go by name, JSON as serialized text
+        assert values["category"] == "STANDING"
+        assert json.loads(values["instructions"]) == ["Stand", "Breathe"]
+        # Timestamps come from the model's Python defaults
+        assert {"created_at", "updated_at"} <= set(encoder.columns)
+        assert values["created_at"] is not None
+        assert "pose_id" not in encoder.columns
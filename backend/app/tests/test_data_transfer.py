@@ -0,0 +1,119 @@
+"""
+Tests for the NDJSON export/import scripts, SQLite to SQLite.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base
+from app.models.pose import Pose
+from app.models.practice_session import CompletionStatus, PracticeSession
+from app.models.sequence import Sequence, SequencePose
+from app.models.user import User
+from app.tests.conftest import TEST_DATABASE_URL
+from scripts.data_transfer import PROGRESS_TABLE, TransferState
+from scripts.export_data import export_all_data
+from scripts.import_data import import_all_data
+
+MODELS = (User, Pose, Sequence, SequencePose, PracticeSession)
+
+
+@pytest.fixture
+async def export_dir(db_session, test_user, test_sequence, tmp_path):
+    """Export of the test database with a user, a sequence and five practice sessions."""
+    started = datetime(2024, 6, 1, 7, 0)
+    db_session.add_all([
+        PracticeSession(
+            user_id=test_user.user_id,
+            sequence_id=test_sequence.sequence_id,
+            started_at=started + timedelta(days=day),
+            duration_seconds=600 + day,
+            completion_status=CompletionStatus.COMPLETED,
+        )
+        for day in range(5)
+    ])
+    await db_session.commit()
+
+    output_dir = tmp_path / "export"
+    await export_all_data(output_dir, TEST_DATABASE_URL, batch_size=2)
+    return output_dir
+
+
+@pytest.fixture
+async def target(tmp_path):
+    """Empty database with the application schema, and its URL."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'target.db'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine, url
+    await engine.dispose()
+
+
+async def row_counts(engine) -> dict[str, int]:
+    async with engine.connect() as connection:
+        return {
+            model.__tablename__: (await connection.execute(select(func.count()).select_from(model))).scalar_one()
+            for model in MODELS
+        }
+
+
+class TestRoundTrip:
+    """Tests for exporting a database and importing it into another."""
+
+    async def test_round_trip(self, export_dir, target, test_engine):
+        engine, url = target
+
+        await import_all_data(export_dir, url, batch_size=2, resume=False)
+
+        assert await row_counts(engine) == await row_counts(test_engine)
+        async with engine.connect() as connection:
+            # Foreign keys point at the imported rows
+            names = (await connection.execute(
+                select(Pose.name_english)
+                .join(SequencePose, SequencePose.pose_id == Pose.pose_id)
+                .order_by(SequencePose.position_order)
+            )).scalars().all()
+            assert names == ["Mountain Pose", "Downward Dog", "Warrior I"]
+            emails = (await connection.execute(
+                select(User.email).join(PracticeSession, PracticeSession.user_id == User.user_id).distinct()
+            )).scalars().all()
+            assert emails == ["test@example.com"]
+            # Bookkeeping is dropped once the import completes
+            tables = await connection.run_sync(lambda sync: inspect(sync).get_table_names())
+            assert PROGRESS_TABLE not in tables
+
+    async def test_resume_after_uncommitted_batch(self, export_dir, target, test_engine, monkeypatch):
+        engine, url = target
+        record_batch = TransferState.record_batch
+
+        def crash_after_recording(self, table_name, pairs, lines_done):
+            # The state file is written but the batch's transaction never commits
+            record_batch(self, table_name, pairs, lines_done)
+            if table_name == "practice_sessions" and lines_done == 4:
+                raise RuntimeError("Connection lost")
+
+        monkeypatch.setattr(TransferState, "record_batch", crash_after_recording)
+        with pytest.raises(RuntimeError, match="Connection lost"):
+            await import_all_data(export_dir, url, batch_size=2, resume=False)
+        assert (await row_counts(engine))["practice_sessions"] == 2
+
+        monkeypatch.setattr(TransferState, "record_batch", record_batch)
+        await import_all_data(export_dir, url, batch_size=2, resume=True)
+
+        # No batch was inserted twice, not even in tables without a unique key
+        assert await row_counts(engine) == await row_counts(test_engine)
+
+    async def test_resume_with_foreign_state_file(self, export_dir, target):
+        engine, url = target
+        # The target has a committed batch of users that the state file doesn't know about
+        async with engine.begin() as connection:
+            await connection.exec_driver_sql(
+                f"CREATE TABLE {PROGRESS_TABLE} (table_name VARCHAR(255) PRIMARY KEY, lines_done INTEGER NOT NULL)"
+            )
+            await connection.exec_driver_sql(f"INSERT INTO {PROGRESS_TABLE} VALUES ('users', 1)")
+
+        with pytest.raises(RuntimeError, match="start over without --resume"):
+            await import_all_data(export_dir, url, batch_size=2, resume=True)
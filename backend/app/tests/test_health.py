@@ -0,0 +1,118 @@
+"""
+Tests for liveness/readiness probes and the catalog cache.
+"""
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import app.main as main
+from app.core.health import DEGRADED, NOT_READY, READY, health_state, readiness
+from app.services.catalog_cache import CatalogCache, catalog_cache
+
+
+class TestCatalogCache:
+    """Tests for CatalogCache."""
+
+    async def test_second_get_is_a_hit(self):
+        """Values are loaded once and then served from memory."""
+        cache = CatalogCache(ttl_seconds=60)
+        calls = []
+
+        @cache.register("numbers")
+        async def load_numbers(db_session):
+            calls.append(db_session)
+            return [1, 2, 3]
+
+        assert await cache.get("numbers", "session") == [1, 2, 3]
+        assert await cache.get("numbers", "session") == [1, 2, 3]
+        assert len(calls) == 1
+
+        cache.invalidate("numbers")
+        await cache.get("numbers", "session")
+        assert len(calls) == 2
+
+    async def test_prewarm_marks_cache_warm(self, test_engine):
+        """Prewarming loads every key and flips the warm flag."""
+        cache = CatalogCache(ttl_seconds=60)
+
+        @cache.register("answer")
+        async def load_answer(db_session):
+            return 42
+
+        assert not cache.warm
+        await cache.prewarm(async_sessionmaker(test_engine))
+
+        assert cache.warm
+        assert await cache.get("answer", None) == 42
+
+    async def test_categories_endpoint_uses_cache(self, async_client: AsyncClient, test_sequences, assert_max_queries):
+        """Repeated category requests run no SQL."""
+        first = await async_client.get("/api/v1/sequences/categories")
+        with assert_max_queries(0):
+            second = await async_client.get("/api/v1/sequences/categories")
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert sum(first.json()["by_duration"].values()) == len(test_sequences)
+
+
+class TestReadiness:
+    """Tests for readiness checks."""
+
+    async def test_cold_cache_not_ready(self, test_engine, monkeypatch):
+        """A worker with a cold catalog cache is not ready."""
+        monkeypatch.setattr(catalog_cache, "warm", False)
+
+        report = await readiness(test_engine, lag_ms=0.0)
+
+        assert report["status"] == NOT_READY
+        assert report["checks"]["database"]["status"] == READY
+        assert report["checks"]["catalog_cache"]["warm"] is False
+
+    async def test_redis_down_is_degraded(self, test_engine, monkeypatch):
+        """Redis being unavailable degrades readiness without failing it."""
+        from app.services.token_blacklist import token_blacklist
+
+        async def no_redis():
+            return None
+
+        monkeypatch.setattr(catalog_cache, "warm", True)
+        monkeypatch.setattr(token_blacklist, "ping", no_redis)
+
+        report = await readiness(test_engine, lag_ms=0.0)
+
+        assert report["status"] == DEGRADED
+        assert report["checks"]["redis"]["status"] == DEGRADED
+
+    async def test_shutting_down_not_ready(self, test_engine, monkeypatch):
+        """Draining workers report not ready."""
+        monkeypatch.setattr(catalog_cache, "warm", True)
+        monkeypatch.setattr(health_state, "shutting_down", True)
+
+        report = await readiness(test_engine, lag_ms=0.0)
+
+        assert report["status"] == NOT_READY
+
+
+class TestHealthEndpoints:
+    """Tests for /health/live and /health/ready."""
+
+    async def test_liveness(self, async_client: AsyncClient):
+        """Liveness is always cheap and OK."""
+        response = await async_client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    async def test_readiness_returns_503_until_warm(self, async_client: AsyncClient, test_engine, monkeypatch):
+        """Readiness fails with 503 until the catalog cache is warm."""
+        monkeypatch.setattr(main, "engine", test_engine)
+        monkeypatch.setattr(catalog_cache, "warm", False)
+
+        cold = await async_client.get("/health/ready")
+        monkeypatch.setattr(catalog_cache, "warm", True)
+        warm = await async_client.get("/health/ready")
+
+        assert cold.status_code == 503
+        assert cold.json()["status"] == NOT_READY
+        assert warm.status_code == 200
+        assert warm.json()["status"] in (READY, DEGRADED)
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_database_session, get_read_only_session
+from app.main import app
 from app.models.user import User
 from app.models.sequence import Sequence
 from app.models.practice_session import PracticeSession, CompletionStatus
@@ -311,6 +313,33 @@ class TestStatsEndpoint:
         assert data["sessions_last_30_days"] == 0
         assert data["most_practiced_sequences"] == []
 
+    @pytest.mark.asyncio
+    async def test_get_stats_uses_one_read_only_session(
+        self,
+        async_client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        user_token_headers: dict
+    ):
+        """Authentication shares the endpoint's read-only session."""
+        opened = []
+
+        async def read_only_session():
+            opened.append(db_session)
+            yield db_session
+
+        async def read_write_session():
+            raise AssertionError("read-only endpoint opened a read-write session")
+            yield  # pragma: no cover
+
+        app.dependency_overrides[get_read_only_session] = read_only_session
+        app.dependency_overrides[get_database_session] = read_write_session
+
+        response = await async_client.get("/api/v1/stats", headers=user_token_headers)
+
+        assert response.status_code == 200
+        assert len(opened) == 1
+
     @pytest.mark.asyncio
     async def test_get_stats_comprehensive(
         self,
@@ -0,0 +1,146 @@
+"""
+Tests for responsive image derivatives and their manifest.
+"""
+import re
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from app.core.config import Settings, settings
+from app.services.cdn_service import CDNService
+from app.services.image_manifest import ImageManifest, image_manifest
+from app.services.image_processing import generate_responsive_images, supported_derivative_formats
+
+
+@pytest.fixture
+def source_image(tmp_path):
+    """A 1000x500 JPEG source image."""
+    path = tmp_path / "warrior.jpg"
+    Image.new("RGB", (1000, 500), (10, 120, 200)).save(path, format="JPEG")
+    return path
+
+
+@pytest.fixture
+def manifest_dir(tmp_path, monkeypatch):
+    """Point the global manifest at a temporary uploads directory."""
+    monkeypatch.setattr(settings, "upload_directory", str(tmp_path))
+    image_manifest.clear()
+    yield tmp_path / "images" / "derivatives"
+    image_manifest.clear()
+
+
+class TestGenerateResponsiveImages:
+    """Tests for generate_responsive_images."""
+
+    def test_widths_and_formats(self, source_image, tmp_path):
+        """Each width up to the source width is encoded in each format."""
+        output_dir = tmp_path / "out"
+
+        variants = generate_responsive_images(str(source_image), str(output_dir), [320, 640, 1280], ["webp", "jpeg"])
+
+        assert sorted((v["width"], v["format"]) for v in variants) == [
+            (320, "jpeg"), (320, "webp"), (640, "jpeg"), (640, "webp"),
+        ]
+        for variant in variants:
+            assert re.fullmatch(r"warrior-\d+w-[0-9a-f]{12}\.(webp|jpg)", variant["file"])
+            assert variant["height"] == variant["width"] // 2
+            with Image.open(output_dir / variant["file"]) as image:
+                assert image.size == (variant["width"], variant["height"])
+
+    def test_never_upscales(self, source_image, tmp_path):
+        """A source narrower than every width gets one variant at its own size."""
+        variants = generate_responsive_images(str(source_image), str(tmp_path / "out"), [1920], ["jpeg"])
+
+        assert [(v["width"], v["height"]) for v in variants] == [(1000, 500)]
+
+    def test_unknown_formats_filtered(self):
+        """Unsupported format names are dropped."""
+        assert supported_derivative_formats(["gif", "jpeg"]) == ["jpeg"]
+
+
+class TestImageManifest:
+    """Tests for ImageManifest lookups."""
+
+    def test_best_fit(self, tmp_path):
+        """The smallest variant covering the request wins, else the largest."""
+        manifest = ImageManifest(tmp_path)
+        manifest.record("poses/warrior.jpg", [
+            {"file": "a-320.jpg", "width": 320, "height": 160, "format": "jpeg", "size": 1},
+            {"file": "a-640.jpg", "width": 640, "height": 320, "format": "jpeg", "size": 2},
+            {"file": "a-640.webp", "width": 640, "height": 320, "format": "webp", "size": 1},
+        ])
+
+        assert manifest.best_fit("poses/warrior.jpg", width=300)["file"] == "a-320.jpg"
+        assert manifest.best_fit("poses/warrior.jpg", height=200)["file"] == "a-640.jpg"
+        assert manifest.best_fit("poses/warrior.jpg", width=2000)["file"] == "a-640.jpg"
+        assert manifest.best_fit("poses/warrior.jpg", image_format="webp")["file"] == "a-640.webp"
+        assert manifest.best_fit("poses/other.jpg") is None
+
+    def test_entries_persist(self, tmp_path):
+        """A new manifest instance loads entries recorded by another."""
+        variant = {"file": "a-320.jpg", "width": 320, "height": 160, "format": "jpeg", "size": 1}
+        ImageManifest(tmp_path).record("poses/warrior.jpg", [variant])
+
+        manifest = ImageManifest(tmp_path)
+        assert manifest.load() == 1
+        assert manifest.variants("poses/warrior.jpg") == [variant]
+
+    def test_lookups_never_read_files(self, tmp_path, monkeypatch):
+        """Hits and misses are answered from memory; refreshes pick up other workers' changes."""
+        variant = {"file": "a-320.jpg", "width": 320, "height": 160, "format": "jpeg", "size": 1}
+        manifest = ImageManifest(tmp_path)
+        manifest.load()
+        other_worker = ImageManifest(tmp_path)
+        other_worker.record("poses/warrior.jpg", [variant])
+
+        def no_reads(*args, **kwargs):
+            raise AssertionError("manifest file read during lookup")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(Path, "read_text", no_reads)
+            patch.setattr(Path, "is_file", no_reads)
+            assert manifest.variants("poses/warrior.jpg") == []
+            assert manifest.variants("poses/tree.jpg") == []
+
+        manifest.load()
+        assert manifest.variants("poses/warrior.jpg") == [variant]
+
+        other_worker.remove("poses/warrior.jpg")
+        manifest.load()
+        assert manifest.variants("poses/warrior.jpg") == []
+
+
+class TestCDNDerivatives:
+    """Tests for CDNService derivative resolution."""
+
+    def test_resolves_derivative(self, manifest_dir, source_image, monkeypatch):
+        """URLs point at the best derivative when one exists."""
+        monkeypatch.setattr(settings, "cdn_enabled", False)
+        variants = generate_responsive_images(str(source_image), str(manifest_dir), [320, 640], ["jpeg"])
+        image_manifest.record("poses/warrior.jpg", variants)
+        cdn = CDNService()
+
+        thumbnail = cdn.get_thumbnail_url("/poses/warrior.jpg", width=200)
+        full = cdn.get_image_url("poses/warrior.jpg")
+
+        assert re.fullmatch(r"/images/derivatives/warrior-320w-[0-9a-f]{12}\.jpg", thumbnail)
+        assert re.fullmatch(r"/images/derivatives/warrior-640w-[0-9a-f]{12}\.jpg", full)
+        assert cdn.get_image_srcset("poses/warrior.jpg").endswith(" 640w")
+
+    def test_falls_back_to_source(self, manifest_dir, monkeypatch):
+        """Images without derivatives keep their source URL."""
+        monkeypatch.setattr(settings, "cdn_enabled", True)
+        monkeypatch.setattr(settings, "cdn_base_url", "https://cdn.example.com")
+
+        url = CDNService().get_thumbnail_url("poses/tree.jpg", width=200)
+
+        assert url == "https://cdn.example.com/images/poses/tree.jpg"
+
+
+def test_derivative_settings_parsing():
+    """Derivative widths and formats parse from comma-separated strings."""
+    parsed = Settings(image_derivative_widths="640, 320,,640", image_derivative_formats="WebP, jpeg")
+
+    assert parsed.image_derivative_widths_list == [320, 640]
+    assert parsed.image_derivative_formats_list == ["webp", "jpeg"]
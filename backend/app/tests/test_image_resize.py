@@ -0,0 +1,169 @@
+"""
+Tests for on-demand image resizing and its disk cache.
+"""
+import asyncio
+import threading
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+from app.core.config import settings
+from app.services import image_resize, upload_service
+from app.services.image_resize import DiskLRUCache
+
+
+@pytest.fixture
+async def content_images(tmp_path, monkeypatch):
+    """Serve content from a temporary directory with one 800x400 image."""
+    images_dir = tmp_path / "content" / "images" / "poses"
+    images_dir.mkdir(parents=True)
+    Image.new("RGB", (800, 400), (200, 80, 20)).save(images_dir / "warrior.jpg", format="JPEG")
+    monkeypatch.setattr(settings, "content_directory", str(tmp_path / "content"))
+    monkeypatch.setattr(image_resize, "resize_cache", DiskLRUCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024))
+    yield tmp_path
+    await upload_service.shutdown_image_pool()
+
+
+class TestDiskLRUCache:
+    """Tests for DiskLRUCache."""
+
+    async def test_concurrent_misses_share_one_call(self, tmp_path):
+        """A burst of requests for one name produces it once."""
+        cache = DiskLRUCache(tmp_path, max_bytes=1024)
+        calls = 0
+
+        async def produce() -> bytes:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return b"data"
+
+        paths = await asyncio.gather(*(cache.get_or_create("a.jpeg", produce) for _ in range(50)))
+
+        assert calls == 1
+        assert set(paths) == {tmp_path / "a.jpeg"}
+        assert (tmp_path / "a.jpeg").read_bytes() == b"data"
+
+    async def test_evicts_least_recently_used(self, tmp_path):
+        """Past the size budget, the least recently used file is removed."""
+        cache = DiskLRUCache(tmp_path, max_bytes=25)
+
+        async def ten_bytes() -> bytes:
+            return b"x" * 10
+
+        await cache.get_or_create("a", ten_bytes)
+        await cache.get_or_create("b", ten_bytes)
+        assert await cache.lookup("a") is not None  # a is now more recent than b
+        await cache.get_or_create("c", ten_bytes)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "c"]
+        assert cache.total_bytes == 20
+
+    async def test_file_evicted_before_read_is_produced_again(self, tmp_path, monkeypatch):
+        """A file removed between lookup and read (e.g. by another worker) is re-encoded."""
+        cache = DiskLRUCache(tmp_path, max_bytes=1024)
+        calls = 0
+
+        async def produce() -> bytes:
+            nonlocal calls
+            calls += 1
+            return b"data"
+
+        get_or_create = cache.get_or_create
+
+        async def evicted_after_lookup(name, produce):
+            path = await get_or_create(name, produce)
+            if calls == 1:
+                path.unlink()
+            return path
+
+        monkeypatch.setattr(cache, "get_or_create", evicted_after_lookup)
+
+        assert await cache.read_or_create("a.jpeg", produce) == b"data"
+        assert calls == 2
+        assert cache.total_bytes == 4
+
+    async def test_existing_files_loaded_off_the_event_loop(self, tmp_path, monkeypatch):
+        """The first lookup scans the directory in a worker thread."""
+        (tmp_path / "old.jpeg").write_bytes(b"12345")
+        cache = DiskLRUCache(tmp_path, max_bytes=1024)
+        loop_thread = threading.get_ident()
+        scan = cache._scan
+        scanned_in = []
+        monkeypatch.setattr(cache, "_scan", lambda: scanned_in.append(threading.get_ident()) or scan())
+
+        assert await cache.lookup("old.jpeg") == tmp_path / "old.jpeg"
+        assert cache.total_bytes == 5
+        assert scanned_in and scanned_in[0] != loop_thread
+
+    async def test_failures_propagate_and_are_retried(self, tmp_path):
+        """A failed produce call raises for every waiter and is not cached."""
+        cache = DiskLRUCache(tmp_path, max_bytes=1024)
+
+        async def fail() -> bytes:
+            raise RuntimeError("encoder crashed")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_create("a", fail)
+
+        async def succeed() -> bytes:
+            return b"ok"
+
+        assert (await cache.get_or_create("a", succeed)).read_bytes() == b"ok"
+
+
+class TestResizeEndpoint:
+    """Tests for GET /images/resize/{path}."""
+
+    async def test_resizes_and_caches(self, async_client: AsyncClient, content_images):
+        """The variant fits the box, revalidates, and is encoded once."""
+        url = "/images/resize/poses/warrior.jpg?w=320&fmt=webp"
+        first = await async_client.get(url)
+        second = await async_client.get(url)
+
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "image/webp"
+        assert first.headers["cache-control"] == "public, no-cache"
+        assert first.content == second.content
+        assert len(list((content_images / "cache").iterdir())) == 1
+
+        cached = next((content_images / "cache").iterdir())
+        with Image.open(cached) as image:
+            assert image.size == (320, 160)
+
+    async def test_parameters_snap_to_configured_variants(self, async_client: AsyncClient, content_images):
+        """Arbitrary w and q values share the nearest configured variant."""
+        for query in ("w=200", "w=250&q=81", "w=320&q=82"):
+            response = await async_client.get(f"/images/resize/poses/warrior.jpg?{query}")
+            assert response.status_code == 200
+
+        assert len(list((content_images / "cache").iterdir())) == 1
+        assert (await async_client.get("/images/resize/poses/warrior.jpg?w=320&q=5")).status_code == 400
+        assert (await async_client.get("/images/resize/poses/warrior.jpg?w=320&q=100")).status_code == 400
+
+    async def test_etag_follows_source(self, async_client: AsyncClient, content_images):
+        """A current copy gets 304; editing the source changes the ETag."""
+        url = "/images/resize/poses/warrior.jpg?w=320"
+        etag = (await async_client.get(url)).headers["etag"]
+
+        not_modified = await async_client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+
+        source = content_images / "content" / "images" / "poses" / "warrior.jpg"
+        Image.new("RGB", (640, 640), (20, 80, 200)).save(source, format="JPEG")
+        changed = await async_client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    async def test_path_traversal_rejected(self, async_client: AsyncClient, content_images):
+        """Paths outside content/images are not found."""
+        response = await async_client.get("/images/resize/..%2F..%2Fsecret.jpg?w=100")
+
+        assert response.status_code == 404
+
+    async def test_invalid_parameters(self, async_client: AsyncClient, content_images):
+        """Missing dimensions and unknown formats are rejected."""
+        assert (await async_client.get("/images/resize/poses/warrior.jpg")).status_code == 400
+        assert (await async_client.get("/images/resize/poses/warrior.jpg?w=100&fmt=gif")).status_code == 400
+        assert (await async_client.get("/images/resize/poses/warrior.jpg?w=99999")).status_code == 400
@@ -0,0 +1,91 @@
+"""
+Tests for the batched logging pipeline.
+"""
+import io
+import logging
+
+import pytest
+import structlog
+
+from app.core.config import Settings
+from app.core.logging_config import BatchingLogHandler, EventSampler
+
+
+def make_record(message: str) -> logging.LogRecord:
+    """Create a plain stdlib log record."""
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestBatchingLogHandler:
+    """Tests for BatchingLogHandler."""
+
+    def test_writes_records_in_order(self):
+        """Queued records are written by the background thread on close."""
+        stream = io.StringIO()
+        handler = BatchingLogHandler(stream=stream)
+
+        for index in range(5):
+            handler.emit(make_record(f"line {index}"))
+        handler.close()
+
+        assert stream.getvalue().splitlines() == [f"line {index}" for index in range(5)]
+
+    def test_drops_and_reports_when_full(self):
+        """A full queue drops records and reports the drop count."""
+        stream = io.StringIO()
+        handler = BatchingLogHandler(stream=stream, max_queue_size=2, start=False)
+
+        for index in range(5):
+            handler.emit(make_record(f"line {index}"))
+        assert handler.dropped == 3
+
+        handler.start()
+        handler.close()
+
+        lines = stream.getvalue().splitlines()
+        assert lines[:2] == ["line 0", "line 1"]
+        assert "Log events dropped" in lines[2]
+        assert "3 since last report" in lines[2]
+
+
+class TestEventSampler:
+    """Tests for EventSampler."""
+
+    def test_unsampled_events_pass_through(self):
+        """Events without a rate are untouched."""
+        sampler = EventSampler({"Poses listed": 0.0})
+
+        event = sampler(None, "info", {"event": "Pose retrieved"})
+
+        assert event == {"event": "Pose retrieved"}
+
+    def test_zero_rate_drops(self):
+        """A rate of 0 drops every event."""
+        sampler = EventSampler({"Poses listed": 0.0})
+
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "Poses listed"})
+        assert sampler.sampled_out == 1
+
+    def test_full_rate_keeps_and_tags(self):
+        """Kept events carry their sample rate."""
+        sampler = EventSampler({"Poses listed": 1.0})
+
+        event = sampler(None, "info", {"event": "Poses listed"})
+
+        assert event["sample_rate"] == 1.0
+
+    def test_warnings_never_sampled(self):
+        """Warnings and errors are always kept."""
+        sampler = EventSampler({"Poses listed": 0.0})
+
+        event = sampler(None, "warning", {"event": "Poses listed"})
+
+        assert event == {"event": "Poses listed"}
+
+
+def test_sample_rates_setting_parsing():
+    """LOG_SAMPLE_RATES parses into an event -> rate map."""
+    settings = Settings(log_sample_rates="Poses listed=0.1, Sequences listed = 0.5,")
+
+    assert settings.log_sample_rates_map == {"Poses listed": 0.1, "Sequences listed": 0.5}
@@ -0,0 +1,66 @@
+"""
+Tests for the event loop watchdog.
+"""
+import asyncio
+import time
+
+from app.core import loop_watchdog as loop_watchdog_module
+from app.core.loop_watchdog import EventLoopWatchdog
+
+
+class RecordingLogger:
+    """Collects warning events instead of logging them."""
+
+    def __init__(self):
+        self.warnings = []
+
+    def info(self, event, **kwargs):
+        pass
+
+    def warning(self, event, **kwargs):
+        self.warnings.append((event, kwargs))
+
+
+def block_the_loop(seconds: float) -> None:
+    """Synchronous call that holds the event loop."""
+    time.sleep(seconds)
+
+
+class TestEventLoopWatchdog:
+    """Tests for EventLoopWatchdog."""
+
+    async def test_reports_stall_with_blocking_stack(self, monkeypatch):
+        """A blocking call is reported once, with its stack and task."""
+        recorder = RecordingLogger()
+        monkeypatch.setattr(loop_watchdog_module, "logger", recorder)
+        watchdog = EventLoopWatchdog(interval_seconds=0.01, stall_threshold_seconds=0.05)
+
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.03)
+            block_the_loop(0.3)
+            await asyncio.sleep(0.03)
+        finally:
+            await watchdog.stop()
+
+        assert watchdog.stalls == 1
+        event, fields = recorder.warnings[0]
+        assert event == "Event loop stall detected"
+        assert fields["stalled_ms"] >= 50
+        assert "block_the_loop" in fields["stack"]
+        assert fields["coroutine"].endswith("test_reports_stall_with_blocking_stack")
+
+    async def test_idle_loop_has_no_stalls(self, monkeypatch):
+        """An idle loop records small lag and no stalls."""
+        recorder = RecordingLogger()
+        monkeypatch.setattr(loop_watchdog_module, "logger", recorder)
+        watchdog = EventLoopWatchdog(interval_seconds=0.01, stall_threshold_seconds=0.2)
+
+        watchdog.start()
+        assert watchdog.running
+        await asyncio.sleep(0.1)
+        await watchdog.stop()
+
+        assert not watchdog.running
+        assert watchdog.stalls == 0
+        assert recorder.warnings == []
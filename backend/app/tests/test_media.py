@@ -0,0 +1,215 @@
+"""
+Tests for media serving and the asset manifest.
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.api.responses import ZEROCOPY_EXTENSION, MediaFileResponse
+from app.core.config import settings
+from app.services import asset_manifest as asset_manifest_module
+from app.services.asset_manifest import AssetManifest
+from app.services.cdn_service import CDNService
+
+AUDIO = bytes(range(256)) * 64  # 16KB
+
+
+@pytest.fixture
+def content_dir(tmp_path, monkeypatch):
+    """Content directory with one audio file, one image and a text file, and a built manifest."""
+    (tmp_path / "audio" / "poses").mkdir(parents=True)
+    (tmp_path / "audio" / "poses" / "boat-pose.mp3").write_bytes(AUDIO)
+    (tmp_path / "images" / "poses").mkdir(parents=True)
+    (tmp_path / "images" / "poses" / "tree.jpg").write_bytes(b"\xff\xd8 not really a jpeg")
+    (tmp_path / "images" / "notes.txt").write_text("namaste " * 500)
+
+    monkeypatch.setattr(settings, "content_directory", str(tmp_path))
+    manifest = AssetManifest(tmp_path)
+    manifest.build(precompress=True)
+    monkeypatch.setattr(asset_manifest_module, "asset_manifest", manifest)
+    monkeypatch.setattr("app.api.v1.endpoints.media.asset_manifest", manifest)
+    return tmp_path
+
+
+class TestAssetManifest:
+    """Tests for AssetManifest."""
+
+    def test_hashed_paths_resolve(self, content_dir):
+        """Hashed paths map back to the logical path only with the current hash."""
+        manifest = AssetManifest(content_dir)
+        manifest.build()
+
+        hashed = manifest.hashed_path("audio/poses/boat-pose.mp3")
+
+        assert hashed.startswith("audio/poses/boat-pose.") and hashed.endswith(".mp3")
+        assert manifest.resolve(hashed) == ("audio/poses/boat-pose.mp3", True)
+        assert manifest.resolve("audio/poses/boat-pose.000000000000.mp3")[1] is False
+
+    def test_save_and_load(self, content_dir):
+        """A saved manifest loads into a new instance."""
+        built = AssetManifest(content_dir)
+        built.build()
+        built.save()
+
+        loaded = AssetManifest(content_dir)
+
+        assert loaded.load()
+        assert loaded.assets == built.assets
+
+    def test_changed_files_get_plain_paths(self, content_dir):
+        """Assets changed since the build are not given hashed paths."""
+        manifest = AssetManifest(content_dir)
+        manifest.build()
+        (content_dir / "images" / "poses" / "tree.jpg").write_bytes(b"changed")
+
+        assert manifest.hashed_path("images/poses/tree.jpg") is None
+        assert manifest.hashed_path("audio/poses/boat-pose.mp3") is not None
+
+    def test_stale_entries_ignored(self, content_dir):
+        """Entries for files changed since the build are not used."""
+        manifest = AssetManifest(content_dir)
+        manifest.build()
+        path = content_dir / "images" / "poses" / "tree.jpg"
+        path.write_bytes(b"changed")
+
+        assert manifest.entry("images/poses/tree.jpg", path.stat()) is None
+
+
+class TestMediaServing:
+    """Tests for the /images and /audio routes."""
+
+    async def test_range_request(self, async_client: AsyncClient, content_dir):
+        """Byte ranges return 206 with the requested slice."""
+        response = await async_client.get("/audio/poses/boat-pose.mp3", headers={"Range": "bytes=100-199"})
+
+        assert response.status_code == 206
+        assert response.content == AUDIO[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(AUDIO)}"
+        assert response.headers["content-type"] == "audio/mpeg"
+
+    async def test_etag_and_revalidation(self, async_client: AsyncClient, content_dir):
+        """Plain URLs carry the manifest ETag, must revalidate, and return 304 when unchanged."""
+        response = await async_client.get("/audio/poses/boat-pose.mp3")
+        etag = response.headers["etag"]
+
+        assert response.content == AUDIO
+        manifest = AssetManifest(content_dir)
+        manifest.build()
+        assert etag == f'"{manifest.entry("audio/poses/boat-pose.mp3")["sha256"][:32]}"'
+        assert response.headers["cache-control"] == "public, no-cache"
+
+        cached = await async_client.get("/audio/poses/boat-pose.mp3", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    async def test_hashed_url_is_immutable(self, async_client: AsyncClient, content_dir):
+        """Content-hashed URLs are served with immutable caching."""
+        manifest = AssetManifest(content_dir)
+        manifest.build()
+
+        response = await async_client.get("/" + manifest.hashed_path("images/poses/tree.jpg"))
+
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+
+    async def test_stale_hashed_url_revalidates(self, async_client: AsyncClient, content_dir):
+        """A hashed URL for a file changed since the build is not immutable."""
+        hashed = asset_manifest_module.asset_manifest.hashed_path("images/poses/tree.jpg")
+        (content_dir / "images" / "poses" / "tree.jpg").write_bytes(b"changed")
+
+        response = await async_client.get("/" + hashed)
+
+        assert response.content == b"changed"
+        assert response.headers["cache-control"] == "public, no-cache"
+
+    async def test_dotfiles_not_served(self, async_client: AsyncClient, content_dir):
+        """Internal dotfiles in media directories are 404."""
+        (content_dir / "audio" / ".audio-cache.json").write_text("{}")
+        (content_dir / "audio" / "poses" / ".tts-journal.jsonl").write_text("{}")
+
+        assert (await async_client.get("/audio/.audio-cache.json")).status_code == 404
+        assert (await async_client.get("/audio/poses/.tts-journal.jsonl")).status_code == 404
+
+    async def test_precompressed_variant(self, async_client: AsyncClient, content_dir):
+        """Clients accepting gzip get the stored .gz variant."""
+        response = await async_client.get("/images/notes.txt", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) == (content_dir / "images" / "notes.txt.gz").stat().st_size
+        assert response.text == "namaste " * 500
+
+        identity = await async_client.get("/images/notes.txt", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] != response.headers["etag"]
+
+    async def test_missing_and_traversal(self, async_client: AsyncClient, content_dir):
+        """Unknown files and paths outside the media directory are 404."""
+        assert (await async_client.get("/audio/poses/missing.mp3")).status_code == 404
+        assert (await async_client.get("/audio/..%2Fimages%2Fnotes.txt")).status_code == 404
+
+
+class TestCDNServiceURLs:
+    """Tests for content-hashed URLs from CDNService."""
+
+    @pytest.fixture(autouse=True)
+    def use_manifest(self, content_dir, monkeypatch):
+        """Point CDNService at the fixture's manifest."""
+        monkeypatch.setattr("app.services.cdn_service.asset_manifest", asset_manifest_module.asset_manifest)
+        monkeypatch.setattr(settings, "cdn_enabled", True)
+        monkeypatch.setattr(settings, "cdn_base_url", "https://cdn.example.com")
+
+    def test_manifest_assets_get_hashed_urls(self):
+        """Images and other assets in the manifest get hashed URLs."""
+        cdn = CDNService()
+        digest = asset_manifest_module.asset_manifest.entry("audio/poses/boat-pose.mp3")["sha256"][:12]
+
+        assert cdn.get_asset_url("/poses/boat-pose.mp3", "audio") == (
+            f"https://cdn.example.com/audio/poses/boat-pose.{digest}.mp3"
+        )
+        assert cdn.get_image_url("poses/tree.jpg").startswith("https://cdn.example.com/images/poses/tree.")
+        assert cdn.get_asset_size("poses/boat-pose.mp3", "audio") == len(AUDIO)
+
+    def test_unknown_assets_keep_plain_urls(self):
+        """Assets missing from the manifest are not versioned."""
+        cdn = CDNService()
+
+        assert cdn.get_video_url("tutorials/flow.mp4") == "https://cdn.example.com/videos/tutorials/flow.mp4"
+        assert cdn.get_asset_size("tutorials/flow.mp4", "videos") is None
+
+
+async def test_manifest_read_by_prepare_not_lookups(content_dir):
+    """Lookups never read the manifest file; prepare() loads it once."""
+    built = AssetManifest(content_dir)
+    built.build()
+    built.save()
+    manifest = AssetManifest(content_dir)
+
+    assert manifest.hashed_path("images/poses/tree.jpg") is None
+    await manifest.prepare()
+    assert manifest.hashed_path("images/poses/tree.jpg") == built.hashed_path("images/poses/tree.jpg")
+
+
+async def test_zerocopy_send(tmp_path):
+    """With the zero-copy extension, the body is handed over as a file and offset."""
+    path = tmp_path / "clip.mp3"
+    path.write_bytes(AUDIO)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"range", b"bytes=10-19")],
+        "extensions": {ZEROCOPY_EXTENSION: {}},
+        "asgi": {"spec_version": "2.4"},
+    }
+    messages = []
+
+    async def send(message):
+        if message["type"] == ZEROCOPY_EXTENSION:
+            file_object = message["file"]
+            file_object.seek(message["offset"])
+            message = {**message, "data": file_object.read(message["count"])}
+        messages.append(message)
+
+    await MediaFileResponse(path)(scope, None, send)
+
+    assert messages[0]["status"] == 206
+    assert messages[1]["data"] == AUDIO[10:20]
@@ -0,0 +1,72 @@
+"""
+Tests for the metrics registry and /metrics endpoint.
+"""
+from app.core.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry rendering and aggregation."""
+
+    def test_counter_rendering(self):
+        """Counters render with HELP, TYPE and labelled samples."""
+        registry = MetricsRegistry()
+        counter = registry.counter("cache_requests_total", "Cache lookups", ("cache", "result"))
+
+        counter.inc(cache="poses", result="hit")
+        counter.inc(2, cache="poses", result="hit")
+
+        text = registry.render()
+        assert "# HELP cache_requests_total Cache lookups" in text
+        assert "# TYPE cache_requests_total counter" in text
+        assert 'cache_requests_total{cache="poses",result="hit"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets are cumulative and end with +Inf."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+        histogram.observe(0.05, route="/a")
+        histogram.observe(0.5, route="/a")
+        histogram.observe(5.0, route="/a")
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{route="/a"} 3' in text
+        assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+    def test_label_values_are_escaped(self):
+        """Quotes in label values are escaped."""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("name",))
+
+        counter.inc(name='say "hi"')
+
+        assert 'events_total{name="say \\"hi\\""} 1' in registry.render()
+
+    def test_multiprocess_merge(self, tmp_path):
+        """Snapshots from several workers are summed."""
+        worker_a = MetricsRegistry(multiproc_dir=str(tmp_path))
+        worker_a.counter("requests_total", "Requests").inc(3)
+        worker_a.write_snapshot()
+
+        # Simulate a second worker by renaming the first worker's snapshot
+        (tmp_path / next(tmp_path.glob("metrics_*.json")).name).rename(tmp_path / "metrics_999999.json")
+
+        worker_b = MetricsRegistry(multiproc_dir=str(tmp_path))
+        worker_b.counter("requests_total", "Requests").inc(4)
+
+        assert "requests_total 7" in worker_b.render()
+
+
+async def test_metrics_endpoint_uses_route_template(async_client, test_pose):
+    """/metrics reports request latency labelled by route template."""
+    await async_client.get(f"/api/v1/poses/{test_pose.pose_id}")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'route="/api/v1/poses/{pose_id}"' in response.text
+    assert "http_requests_in_flight" in response.text
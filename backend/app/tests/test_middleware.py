@@ -0,0 +1,67 @@
+"""
+Tests for the ASGI request logging and security headers middleware.
+"""
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from app.middleware.request_logging import RequestLoggingMiddleware
+from app.middleware.security_headers import SecurityHeadersMiddleware, build_security_headers
+
+
+def build_app(environment: str = "development") -> FastAPI:
+    """Create a minimal app wrapped in both middleware layers."""
+    test_app = FastAPI()
+
+    @test_app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @test_app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f"chunk-{index}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    test_app.add_middleware(SecurityHeadersMiddleware, environment=environment)
+    test_app.add_middleware(RequestLoggingMiddleware)
+    return test_app
+
+
+class TestSecurityHeadersMiddleware:
+    """Tests for SecurityHeadersMiddleware."""
+
+    async def test_headers_added(self):
+        """Security headers are present on JSON responses."""
+        async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as client:
+            response = await client.get("/ok")
+
+        assert response.status_code == 200
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert "unsafe-eval" in response.headers["Content-Security-Policy"]
+        assert "Strict-Transport-Security" not in response.headers
+
+    async def test_production_headers(self):
+        """Production adds HSTS and a strict CSP."""
+        async with AsyncClient(transport=ASGITransport(app=build_app("production")), base_url="http://test") as client:
+            response = await client.get("/ok")
+
+        assert response.headers["Strict-Transport-Security"] == "max-age=31536000; includeSubDomains"
+        assert "unsafe-inline" not in response.headers["Content-Security-Policy"]
+
+    async def test_streaming_passthrough(self):
+        """Streaming responses keep their body and get headers."""
+        async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as client:
+            response = await client.get("/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_headers_are_not_duplicated(self):
+        """Each security header name appears once."""
+        names = [name for name, _ in build_security_headers("production")]
+
+        assert len(names) == len(set(names))
@@ -0,0 +1,98 @@
+"""
+Tests for per-request SQL statistics, slow query fingerprints and query budgets.
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import QueryBudgetExceeded, QueryStats, fingerprint_statement
+from app.middleware.request_logging import RequestLoggingMiddleware
+
+
+class TestFingerprintStatement:
+    """Tests for fingerprint_statement."""
+
+    def test_literals_and_in_lists_normalized(self):
+        """Statements differing only in literals share a fingerprint."""
+        first, normalized = fingerprint_statement("SELECT * FROM poses WHERE id = 1 AND name IN (?, ?, ?)")
+        second, _ = fingerprint_statement("SELECT *  FROM poses\nWHERE id = 42 AND name IN (?)")
+
+        assert first == second
+        assert normalized == "SELECT * FROM poses WHERE id = ? AND name IN (...)"
+
+    def test_positional_placeholders_kept(self):
+        """asyncpg-style $n placeholders are not treated as literals."""
+        _, normalized = fingerprint_statement("SELECT * FROM poses WHERE id = $1 LIMIT 10")
+
+        assert normalized == "SELECT * FROM poses WHERE id = $1 LIMIT ?"
+
+
+def test_query_stats_propagate_to_parent():
+    """Recording on a child scope also counts on its parents."""
+    parent = QueryStats()
+    child = QueryStats(parent=parent)
+
+    child.record(2.5)
+    child.record(1.5)
+
+    assert (child.count, child.duration_ms) == (2, 4.0)
+    assert (parent.count, parent.duration_ms) == (2, 4.0)
+
+
+async def test_slow_query_logged_with_fingerprint(monkeypatch, db_session):
+    """Statements over the threshold are logged normalized, with the engine label."""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    logged = []
+    monkeypatch.setattr(database.logger, "warning", lambda event, **fields: logged.append((event, fields)))
+
+    await db_session.execute(text("SELECT 42"))
+
+    event, fields = logged[-1]
+    assert event == "Slow query"
+    assert fields["statement"] == "SELECT ?"
+    assert fields["engine"] == "test"
+    assert fields["fingerprint"] == fingerprint_statement("SELECT 42")[0]
+
+
+class TestRequestQueryStats:
+    """Tests for query stats collected by RequestLoggingMiddleware."""
+
+    async def test_server_timing_header(self, async_client: AsyncClient, test_pose):
+        """Responses report DB time and statement count in Server-Timing."""
+        response = await async_client.get(f"/api/v1/poses/{test_pose.pose_id}")
+
+        assert response.status_code == 200
+        server_timing = response.headers["Server-Timing"]
+        assert server_timing.startswith("db;dur=")
+        assert "queries" in server_timing
+        assert "app;dur=" in server_timing
+
+    async def test_assert_max_queries(self, async_client: AsyncClient, test_poses, assert_max_queries):
+        """Listing poses stays within a small, fixed number of statements."""
+        with assert_max_queries(5) as stats:
+            response = await async_client.get("/api/v1/poses")
+
+        assert response.status_code == 200
+        assert stats.count >= 1
+
+    async def test_strict_budget_raises(self, monkeypatch, db_session):
+        """Strict mode fails the request when the budget is exceeded."""
+        monkeypatch.setattr(settings, "query_budget_per_request", 1)
+        monkeypatch.setattr(settings, "query_budget_strict", True)
+
+        test_app = FastAPI()
+
+        @test_app.get("/chatty")
+        async def chatty():
+            for _ in range(3):
+                await db_session.execute(text("SELECT 1"))
+            return {"ok": True}
+
+        test_app.add_middleware(RequestLoggingMiddleware)
+
+        async with AsyncClient(transport=ASGITransport(app=test_app), base_url="http://test") as client:
+            with pytest.raises(QueryBudgetExceeded):
+                await client.get("/chatty")
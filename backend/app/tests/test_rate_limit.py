@@ -0,0 +1,122 @@
+"""
+Tests for the GCRA rate limiting engine.
+"""
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient, ASGITransport
+
+from app.core.rate_limit import (
+    Limiter,
+    MemoryRateLimitStore,
+    RateLimit,
+    setup_rate_limiting,
+)
+
+
+class TestMemoryRateLimitStore:
+    """Tests for the in-process GCRA store."""
+
+    async def test_allows_burst_then_denies(self):
+        """A fresh bucket allows `limit` requests, then denies."""
+        store = MemoryRateLimitStore()
+        rate = RateLimit(limit=3, period=60)
+
+        results = [await store.hit("client", rate) for _ in range(4)]
+
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert [result.remaining for result in results[:3]] == [2, 1, 0]
+
+    async def test_denied_request_reports_retry_after(self):
+        """Retry-After on denial is roughly one emission interval."""
+        store = MemoryRateLimitStore()
+        rate = RateLimit(limit=2, period=60)
+
+        await store.hit("client", rate)
+        await store.hit("client", rate)
+        result = await store.hit("client", rate)
+
+        assert not result.allowed
+        assert 29 < result.retry_after <= 30
+
+    async def test_keys_are_independent(self):
+        """Buckets for different keys do not interfere."""
+        store = MemoryRateLimitStore()
+        rate = RateLimit(limit=1, period=60)
+
+        assert (await store.hit("a", rate)).allowed
+        assert (await store.hit("b", rate)).allowed
+        assert not (await store.hit("a", rate)).allowed
+
+    async def test_custom_burst(self):
+        """Burst smaller than limit restricts back-to-back requests."""
+        store = MemoryRateLimitStore()
+        rate = RateLimit(limit=10, period=60, burst=2)
+
+        results = [await store.hit("client", rate) for _ in range(3)]
+
+        assert [result.allowed for result in results] == [True, True, False]
+
+
+@pytest.fixture
+def limited_app():
+    """Minimal app with a 2-per-minute limited route."""
+    test_app = FastAPI()
+    test_limiter = Limiter()
+    setup_rate_limiting(test_app)
+
+    @test_app.get("/limited")
+    @test_limiter.limit(RateLimit(limit=2, period=60), scope="test", error_message="Slow down")
+    async def limited(request: Request):
+        return {"ok": True}
+
+    @test_app.get("/unlimited")
+    async def unlimited():
+        return {"ok": True}
+
+    return test_app
+
+
+class TestRateLimitDecorator:
+    """Tests for the route decorator and response headers."""
+
+    async def test_ratelimit_headers_on_success(self, limited_app):
+        """Allowed responses carry RateLimit-* headers."""
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            response = await client.get("/limited")
+
+        assert response.status_code == 200
+        assert response.headers["RateLimit-Limit"] == "2"
+        assert response.headers["RateLimit-Remaining"] == "1"
+        assert response.headers["RateLimit-Policy"] == "2;w=60"
+        assert "RateLimit-Reset" in response.headers
+
+    async def test_429_when_exceeded(self, limited_app):
+        """Exceeding the limit returns 429 with Retry-After."""
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            await client.get("/limited")
+            await client.get("/limited")
+            response = await client.get("/limited")
+
+        assert response.status_code == 429
+        data = response.json()
+        assert data["error"] == "rate_limit_exceeded"
+        assert data["detail"] == "Slow down"
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.headers["RateLimit-Remaining"] == "0"
+
+    async def test_no_headers_on_unlimited_route(self, limited_app):
+        """Routes without a decorator have no RateLimit-* headers."""
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            response = await client.get("/unlimited")
+
+        assert response.status_code == 200
+        assert "RateLimit-Limit" not in response.headers
+
+    def test_requires_request_parameter(self):
+        """Decorating a handler without a request parameter fails fast."""
+        test_limiter = Limiter()
+
+        with pytest.raises(TypeError):
+            @test_limiter.limit(RateLimit(limit=1, period=60), scope="test")
+            async def handler():
+                return None
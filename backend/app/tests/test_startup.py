@@ -0,0 +1,52 @@
+"""
+Tests for startup profiling and deferred imports.
+"""
+import asyncio
+import subprocess
+import sys
+
+from app.core.startup import StartupProfiler
+
+
+class TestStartupProfiler:
+    """Tests for StartupProfiler."""
+
+    async def test_concurrent_phases_recorded(self):
+        """Each awaited step is recorded as its own phase."""
+        profiler = StartupProfiler()
+
+        with profiler.phase("init"):
+            results = await asyncio.gather(
+                profiler.run("first", asyncio.sleep(0.01, result=1)),
+                profiler.run("second", asyncio.sleep(0.01, result=2)),
+            )
+
+        assert results == [1, 2]
+        assert set(profiler.phases) == {"first", "second", "init"}
+        assert profiler.phases["first"] >= 10
+        # Concurrent steps overlap, so init is not their sum
+        assert profiler.phases["init"] < profiler.phases["first"] + profiler.phases["second"]
+        assert profiler.total_ms >= profiler.phases["init"]
+
+
+def test_heavy_optional_modules_not_imported_at_startup():
+    """Importing the app does not pull in Sentry, Jinja2, aiosmtplib or Pillow."""
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('sentry_sdk', 'jinja2', 'aiosmtplib', 'PIL') if m in sys.modules), file=sys.stderr)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stderr.strip().splitlines()[-1] == "[]"
+
+
+def test_imports_phase_measured_from_package_import():
+    """The imports phase starts when the app package is imported, before app.main's imports."""
+    code = (
+        "import sys, app, app.main; "
+        "profiler = app.main.startup_profiler; "
+        "print(profiler.started_ns == app.IMPORT_STARTED_NS, profiler.phases['imports'] > 0, file=sys.stderr)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stderr.strip().splitlines()[-1] == "True True"
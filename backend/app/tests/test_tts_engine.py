@@ -0,0 +1,431 @@
+"""
+Tests for the TTS generation engine, rate limiter and provider adapters.
+"""
+import json
+import time
+
+import httpx
+import pytest
+
+from app.services.tts import (
+    AudioCache,
+    ElevenLabsProvider,
+    FakeProvider,
+    JobJournal,
+    ReplicateProvider,
+    RetryableTTSError,
+    TokenBucket,
+    TTSEngine,
+    TTSError,
+    TTSJob,
+    TTSRequest,
+)
+from app.services.tts.scripts import (
+    MAX_HOLD_SECONDS,
+    format_hold,
+    format_pose_script,
+    format_sequence_script,
+    hold_phrases,
+    hold_vocabulary,
+)
+
+
+def make_jobs(tmp_path, count=5):
+    return [
+        TTSJob(
+            key=f"poses/pose-{index}.mp3",
+            request=TTSRequest(text=f"Pose {index}. <#1.0#> Breathe.", voice_id="Calm_Woman"),
+            output_path=tmp_path / "poses" / f"pose-{index}.mp3",
+        )
+        for index in range(count)
+    ]
+
+
+class TestTTSRequest:
+    """Tests for request fingerprints."""
+
+    def test_fingerprint_changes_with_settings(self):
+        request = TTSRequest(text="Hello", voice_id="Calm_Woman", speed=0.8)
+        assert request.fingerprint("replicate") == TTSRequest("Hello", "Calm_Woman", speed=0.8).fingerprint("replicate")
+        assert request.fingerprint("replicate") != TTSRequest("Hello", "Calm_Woman", speed=0.9).fingerprint("replicate")
+        assert request.fingerprint("replicate") != request.fingerprint("elevenlabs")
+
+
+class TestTokenBucket:
+    """Tests for the rate limiter."""
+
+    async def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        # Two tokens are free; the other two refill at 50/s
+        assert 0.03 <= time.monotonic() - started < 0.5
+
+    async def test_pause_holds_callers(self):
+        bucket = TokenBucket(rate=1000, capacity=10)
+        bucket.pause(0.1)
+        started = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - started >= 0.09
+
+
+class TestTTSEngine:
+    """Tests for concurrent generation, retries and resume."""
+
+    async def test_generates_all_jobs(self, tmp_path):
+        provider = FakeProvider()
+        engine = TTSEngine(provider, concurrency=3)
+        jobs = make_jobs(tmp_path)
+
+        report = await engine.run(jobs)
+
+        assert report.generated == 5
+        assert report.failed == []
+        for job in jobs:
+            assert job.output_path.read_bytes().startswith(b"FAKE-TTS")
+
+    async def test_runs_jobs_concurrently(self, tmp_path):
+        provider = FakeProvider(latency=0.1)
+        engine = TTSEngine(provider, concurrency=5)
+
+        report = await engine.run(make_jobs(tmp_path))
+
+        assert report.generated == 5
+        assert report.elapsed < 0.4
+
+    async def test_retries_transient_failures(self, tmp_path):
+        provider = FakeProvider(failures=2)
+        engine = TTSEngine(provider, concurrency=1, backoff_base=0.01)
+
+        report = await engine.run(make_jobs(tmp_path, count=1))
+
+        assert report.generated == 1
+        assert report.retries == 2
+        assert provider.calls == 3
+
+    async def test_gives_up_after_max_attempts(self, tmp_path):
+        provider = FakeProvider(failures=100)
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        engine = TTSEngine(provider, concurrency=1, journal=journal, max_attempts=3, backoff_base=0.01)
+
+        report = await engine.run(make_jobs(tmp_path, count=1))
+
+        assert report.failed == ["poses/pose-0.mp3"]
+        assert provider.calls == 3
+        assert journal.load() == {}
+
+    async def test_does_not_retry_permanent_errors(self, tmp_path):
+        class BrokenProvider(FakeProvider):
+            async def synthesize(self, client, request, limiter):
+                self.calls += 1
+                raise TTSError("Invalid voice")
+
+        provider = BrokenProvider()
+        report = await TTSEngine(provider).run(make_jobs(tmp_path, count=2))
+
+        assert len(report.failed) == 2
+        assert provider.calls == 2
+
+    async def test_resume_skips_completed_jobs(self, tmp_path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        jobs = make_jobs(tmp_path)
+        await TTSEngine(FakeProvider(), journal=journal).run(jobs[:3])
+
+        provider = FakeProvider()
+        report = await TTSEngine(provider, journal=journal).run(jobs, resume=True)
+
+        assert report.skipped == 3
+        assert report.generated == 2
+        assert provider.calls == 2
+
+    async def test_resume_regenerates_changed_or_missing(self, tmp_path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        jobs = make_jobs(tmp_path, count=2)
+        await TTSEngine(FakeProvider(), journal=journal).run(jobs)
+
+        jobs[0].output_path.unlink()
+        jobs[1] = TTSJob(jobs[1].key, TTSRequest("Edited script", "Calm_Woman"), jobs[1].output_path)
+        report = await TTSEngine(FakeProvider(), journal=journal).run(jobs, resume=True)
+
+        assert report.skipped == 0
+        assert report.generated == 2
+
+    async def test_without_resume_journal_is_reset(self, tmp_path):
+        journal = JobJournal(tmp_path / "journal.jsonl")
+        jobs = make_jobs(tmp_path, count=2)
+        await TTSEngine(FakeProvider(), journal=journal).run(jobs)
+
+        report = await TTSEngine(FakeProvider(), journal=journal).run(jobs)
+
+        assert report.skipped == 0
+        assert report.generated == 2
+
+    async def test_journal_ignores_torn_lines(self, tmp_path):
+        path = tmp_path / "journal.jsonl"
+        path.write_text(json.dumps({"key": "a", "fingerprint": "x", "status": "done"}) + "\n{\"key\": \"b\"")
+
+        assert JobJournal(path).load() == {"a": "x"}
+
+    async def test_progress_callback(self, tmp_path):
+        seen = []
+        engine = TTSEngine(FakeProvider(), on_progress=lambda job, status, report: seen.append((job.key, status)))
+
+        await engine.run(make_jobs(tmp_path, count=2))
+
+        assert sorted(seen) == [("poses/pose-0.mp3", "done"), ("poses/pose-1.mp3", "done")]
+
+
+class TestAudioCache:
+    """Tests for the script-hash clip cache."""
+
+    async def test_unchanged_clips_are_not_regenerated(self, tmp_path):
+        cache = AudioCache(tmp_path)
+        jobs = make_jobs(tmp_path)
+        await TTSEngine(FakeProvider(), cache=cache).run(jobs)
+
+        provider = FakeProvider()
+        report = await TTSEngine(provider, cache=AudioCache(tmp_path)).run(jobs)
+
+        assert report.skipped == 5
+        assert provider.calls == 0
+
+    async def test_changed_settings_regenerate(self, tmp_path):
+        jobs = make_jobs(tmp_path, count=2)
+        await TTSEngine(FakeProvider(), cache=AudioCache(tmp_path)).run(jobs)
+
+        jobs[0] = TTSJob(jobs[0].key, TTSRequest(jobs[0].request.text, "Calm_Woman", speed=0.8), jobs[0].output_path)
+        provider = FakeProvider()
+        report = await TTSEngine(provider, cache=AudioCache(tmp_path)).run(jobs)
+
+        assert report.generated == 1
+        assert report.skipped == 1
+
+    async def test_force_regenerates_and_records(self, tmp_path):
+        cache = AudioCache(tmp_path)
+        jobs = make_jobs(tmp_path, count=3)
+        await TTSEngine(FakeProvider(), cache=cache).run(jobs)
+
+        class NewTakeProvider(FakeProvider):
+            async def synthesize(self, client, request, limiter):
+                return b"new take " + await super().synthesize(client, request, limiter)
+
+        forced = NewTakeProvider()
+        await TTSEngine(forced, cache=cache, force=True).run(jobs)
+        assert forced.calls == 3
+
+        # The new takes are recorded, so a normal run doesn't pay for them again
+        provider = FakeProvider()
+        report = await TTSEngine(provider, cache=AudioCache(tmp_path)).run(jobs)
+        assert provider.calls == 0
+        assert report.skipped == 3
+
+    async def test_truncated_clip_is_regenerated(self, tmp_path):
+        jobs = make_jobs(tmp_path, count=1)
+        await TTSEngine(FakeProvider(), cache=AudioCache(tmp_path)).run(jobs)
+        jobs[0].output_path.write_bytes(b"x")
+
+        report = await TTSEngine(FakeProvider(), cache=AudioCache(tmp_path)).run(jobs)
+
+        assert report.generated == 1
+
+    async def test_collect_garbage_removes_orphans_only(self, tmp_path):
+        cache = AudioCache(tmp_path)
+        jobs = make_jobs(tmp_path, count=3)
+        await TTSEngine(FakeProvider(), cache=cache).run(jobs)
+        unmanaged = tmp_path / "poses" / "voice-test.mp3"
+        unmanaged.write_bytes(b"keep")
+
+        removed = cache.collect_garbage([job.output_path for job in jobs[:2]])
+
+        assert removed == ["poses/pose-2.mp3"]
+        assert not jobs[2].output_path.exists()
+        assert jobs[0].output_path.exists()
+        assert unmanaged.exists()
+        assert "poses/pose-2.mp3" not in AudioCache(tmp_path).entries
+
+    async def test_collect_garbage_dry_run(self, tmp_path):
+        cache = AudioCache(tmp_path)
+        jobs = make_jobs(tmp_path, count=2)
+        await TTSEngine(FakeProvider(), cache=cache).run(jobs)
+
+        assert cache.collect_garbage([], dry_run=True) == ["poses/pose-0.mp3", "poses/pose-1.mp3"]
+        assert all(job.output_path.exists() for job in jobs)
+
+
+class TestReplicateProvider:
+    """Tests for the Replicate adapter against a mock transport."""
+
+    async def test_polls_until_succeeded(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.method == "POST":
+                body = json.loads(request.content)
+                assert body["input"]["speed"] == 0.8
+                assert body["input"]["voice_id"] == "Calm_Woman"
+                assert request.headers["authorization"] == "Bearer token"
+                return httpx.Response(201, json={"id": "abc", "status": "processing"})
+            if request.url.path == "/v1/predictions/abc":
+                return httpx.Response(200, json={
+                    "id": "abc", "status": "succeeded", "output": "https://cdn.example.com/out.mp3",
+                })
+            return httpx.Response(200, content=b"MP3DATA")
+
+        provider = ReplicateProvider("token")
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            audio = await provider.synthesize(
+                client, TTSRequest("Hello", "Calm_Woman", speed=0.8, pitch=-2, emotion="calm"), TokenBucket(1000, 10)
+            )
+
+        assert audio == b"MP3DATA"
+        assert calls[-1] == ("GET", "/out.mp3")
+
+    async def test_rate_limit_is_retryable(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": "7"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(RetryableTTSError) as error:
+                await ReplicateProvider("token").synthesize(client, TTSRequest("Hi", "Calm_Woman"), TokenBucket(1000, 10))
+
+        assert error.value.retry_after == 7
+
+    async def test_bad_request_is_not_retryable(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(422, json={"detail": "invalid voice"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(TTSError) as error:
+                await ReplicateProvider("token").synthesize(client, TTSRequest("Hi", "Nope"), TokenBucket(1000, 10))
+
+        assert not isinstance(error.value, RetryableTTSError)
+
+
+class TestElevenLabsProvider:
+    """Tests for the ElevenLabs adapter."""
+
+    async def test_converts_pause_markers(self):
+        sent = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.update(json.loads(request.content))
+            sent["path"] = request.url.path
+            return httpx.Response(200, content=b"MP3")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            audio = await ElevenLabsProvider("key").synthesize(
+                client, TTSRequest("Inhale. <#1.5#> Exhale.", "voice3"), TokenBucket(1000, 10)
+            )
+
+        assert audio == b"MP3"
+        assert sent["path"] == "/v1/text-to-speech/voice3"
+        assert sent["text"] == 'Inhale. <break time="1.5s" /> Exhale.'
+        assert "speed" not in sent["voice_settings"]
+
+
+class TestScripts:
+    """Tests for narration script formatting."""
+
+    def test_pose_script(self):
+        script = format_pose_script({
+            "name_english": "Mountain Pose",
+            "name_sanskrit": "Tadasana",
+            "entry_instructions": ["Stand tall."],
+            "exit_instructions": None,
+            "holding_cues": None,
+            "breathing_pattern": None,
+            "has_side_variation": False,
+        })
+        assert script == "Mountain Pose, or in Sanskrit, Tadasana. <#1.5#> To enter this pose. <#0.8#> Stand tall. <#1.2#>"
+
+    def test_sequence_script_includes_hold_times(self):
+        script = format_sequence_script({
+            "name": "Morning Flow",
+            "description": None,
+            "difficulty_level": "beginner",
+            "duration_minutes": 10,
+            "focus_area": "Flexibility",
+            "poses": [{"name_english": "Mountain Pose", "name_sanskrit": None, "duration": 90}],
+        })
+        assert "Let's begin with Mountain Pose" in script
+        assert "1 minute and 30 seconds" in script
+        assert script.endswith("Namaste.")
+
+    def test_hold_vocabulary_covers_every_hold(self):
+        vocabulary = set(hold_vocabulary())
+
+        assert format_hold(61) == "Hold this pose for 1 minute and 1 second."
+        assert all(set(hold_phrases(seconds)) <= vocabulary for seconds in range(10, MAX_HOLD_SECONDS + 1))
+
+
+class TestGenerateAudioScript:
+    """Tests for scripts/generate_audio.py."""
+
+    POSE = {
+        "name_english": "Mountain Pose",
+        "name_sanskrit": "Tadasana",
+        "entry_instructions": ["Stand tall."],
+        "exit_instructions": None,
+        "holding_cues": None,
+        "breathing_pattern": None,
+        "has_side_variation": False,
+    }
+    SEQUENCE = {
+        "name": "Morning Flow",
+        "description": None,
+        "difficulty_level": "beginner",
+        "duration_minutes": 10,
+        "focus_area": "Flexibility",
+        "poses": [{"name_english": "Mountain Pose", "name_sanskrit": None, "duration": 60}],
+    }
+
+    @pytest.fixture
+    def script(self, tmp_path, monkeypatch):
+        """The script with a stand-in content/audio and database."""
+        from scripts import generate_audio
+
+        audio_dir = tmp_path / "content" / "audio"
+        (audio_dir / "poses").mkdir(parents=True)
+        (audio_dir / "poses" / "mountain-pose-calm.mp3").write_bytes(b"real audio")
+        monkeypatch.setattr(generate_audio, "AUDIO_DIR", audio_dir)
+
+        async def poses():
+            return [self.POSE]
+
+        async def sequences():
+            return [self.SEQUENCE]
+
+        monkeypatch.setattr(generate_audio, "get_all_poses", poses)
+        monkeypatch.setattr(generate_audio, "get_all_sequences", sequences)
+        monkeypatch.setattr(generate_audio.tempfile, "tempdir", str(tmp_path))
+        return generate_audio
+
+    @staticmethod
+    def snapshot(directory):
+        return {path: path.read_bytes() for path in directory.rglob("*") if path.is_file()}
+
+    async def test_fake_provider_leaves_audio_dir_untouched(self, script, monkeypatch):
+        before = self.snapshot(script.AUDIO_DIR)
+        monkeypatch.setattr("sys.argv", ["generate_audio.py", "--provider", "fake", "--voices", "calm"])
+
+        assert await script.main()
+
+        assert self.snapshot(script.AUDIO_DIR) == before
+        outputs = list(script.AUDIO_DIR.parent.parent.glob("yogaflow-audio-*/poses/mountain-pose-calm.mp3"))
+        assert len(outputs) == 1
+        assert outputs[0].read_bytes().startswith(b"FAKE-TTS")
+
+    async def test_output_dir(self, script, tmp_path, monkeypatch):
+        output_dir = tmp_path / "out"
+        monkeypatch.setattr(
+            "sys.argv",
+            ["generate_audio.py", "--provider", "fake", "--voices", "calm", "--output-dir", str(output_dir)],
+        )
+
+        assert await script.main()
+
+        assert (output_dir / "poses" / "mountain-pose-calm.mp3").read_bytes().startswith(b"FAKE-TTS")
+        assert list(output_dir.glob("clips/*.mp3"))
+        assert (script.AUDIO_DIR / "poses" / "mountain-pose-calm.mp3").read_bytes() == b"real audio"
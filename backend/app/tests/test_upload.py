@@ -0,0 +1,143 @@
+"""
+Tests for the streaming upload pipeline.
+"""
+import asyncio
+import io
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from httpx import AsyncClient, ASGITransport
+from PIL import Image
+
+from app.api.routing import body_size_limited_route
+from app.core.config import settings
+from app.models.user import User
+from app.services import upload_service
+from app.services.image_manifest import image_manifest
+from app.services.upload_service import ImageUploadError, stream_to_file
+
+
+@pytest.fixture
+async def admin_token_headers(admin_user: User) -> dict:
+    """Generate authentication headers for admin user."""
+    from app.core.security import create_access_token
+
+    token_data = {"sub": admin_user.email, "user_id": admin_user.user_id}
+    return {"Authorization": f"Bearer {create_access_token(token_data)}"}
+
+
+@pytest.fixture
+async def upload_dir(tmp_path, monkeypatch):
+    """Store uploads in a temporary directory and stop the pool afterwards."""
+    monkeypatch.setattr(settings, "upload_directory", str(tmp_path))
+    yield tmp_path
+    await upload_service.shutdown_image_pool()
+
+
+def png_bytes(width: int, height: int) -> bytes:
+    """Encode a transparent PNG."""
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestImageUpload:
+    """Tests for POST /upload/image."""
+
+    async def test_original_stored_then_optimized(self, async_client: AsyncClient, admin_token_headers, upload_dir):
+        """The original is stored before responding; optimization follows."""
+        response = await async_client.post(
+            "/api/v1/upload/image",
+            files={"file": ("pose.png", png_bytes(64, 32), "image/png")},
+            headers=admin_token_headers,
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert (data["width"], data["height"], data["format"]) == (64, 32, "PNG")
+        assert (upload_dir / "images" / "originals" / data["filename"]).is_file()
+
+        await asyncio.wait(upload_service._pending_jobs, timeout=30)
+
+        optimized = upload_dir / "images" / data["filename"]
+        assert optimized.is_file()
+        with Image.open(optimized) as image:
+            assert image.mode == "RGB"
+
+        served = await async_client.get(f"/api/v1/upload/images/{data['filename']}")
+        assert served.status_code == 200
+        assert served.content == optimized.read_bytes()
+
+        variants = image_manifest.variants(f"uploads/{data['filename']}")
+        assert {variant["width"] for variant in variants} == {64}
+        assert all((upload_dir / "images" / "derivatives" / variant["file"]).is_file() for variant in variants)
+
+        # Derivatives come from the original, so WebP keeps the transparency
+        # the optimized JPEG-compatible copy flattened away
+        for variant in variants:
+            if variant["format"] == "webp":
+                with Image.open(upload_dir / "images" / "derivatives" / variant["file"]) as image:
+                    assert image.mode == "RGBA"
+
+    async def test_invalid_image_rejected(self, async_client: AsyncClient, admin_token_headers, upload_dir):
+        """Bytes that are not an image are rejected and not kept."""
+        response = await async_client.post(
+            "/api/v1/upload/image",
+            files={"file": ("pose.png", b"not an image", "image/png")},
+            headers=admin_token_headers,
+        )
+
+        assert response.status_code == 400
+        assert list((upload_dir / "images" / "originals").iterdir()) == []
+
+
+class TestStreamToFile:
+    """Tests for stream_to_file."""
+
+    async def test_size_enforced_while_streaming(self, tmp_path):
+        """Uploads over the limit fail once the limit is crossed."""
+        from starlette.datastructures import UploadFile
+
+        upload = UploadFile(io.BytesIO(b"x" * 5000), filename="big.jpg")
+
+        with pytest.raises(ImageUploadError):
+            await stream_to_file(upload, tmp_path / "big.jpg", max_size=4096)
+
+
+class TestBodySizeLimitedRoute:
+    """Tests for the body size limited route class."""
+
+    @pytest.fixture
+    def limited_app(self):
+        router = APIRouter(route_class=body_size_limited_route(100))
+
+        @router.post("/echo")
+        async def echo(request: Request):
+            return {"size": len(await request.body())}
+
+        test_app = FastAPI()
+        test_app.include_router(router)
+        return test_app
+
+    async def test_small_body_allowed(self, limited_app):
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            response = await client.post("/echo", content=b"x" * 100)
+
+        assert response.json() == {"size": 100}
+
+    async def test_large_body_rejected(self, limited_app):
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            response = await client.post("/echo", content=b"x" * 101)
+
+        assert response.status_code == 413
+
+    async def test_chunked_body_rejected(self, limited_app):
+        """Bodies without Content-Length are counted as they arrive."""
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * 60
+
+        async with AsyncClient(transport=ASGITransport(app=limited_app), base_url="http://test") as client:
+            response = await client.post("/echo", content=chunks())
+
+        assert response.status_code == 413
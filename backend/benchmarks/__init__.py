@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the YogaFlow API.
+
+Run from the backend directory; see benchmarks/README.md.
+"""
@@ -0,0 +1,233 @@
+"""
+Synthetic data for load tests: the full pose catalog, users, sequences and
+practice history at production-like volumes.
+
+Generated rows are marked (loadtest-*@example.com users, "Load Test Flow"
+sequences) so they can be replaced without touching other data. Poses are
+only loaded into an empty catalog. Everything is deterministic for a given
+seed, so runs against regenerated data stay comparable.
+
+Usage:
+    python -m benchmarks.dataset --users 1000 --sessions 100000 [--database-url URL] [--reset]
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import yaml
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.bulk_load import bulk_insert, bulk_insert_returning_keys
+from app.core.config import settings
+from app.core.database import Base, engine_options
+from app.core.security import hash_password
+from app.models import (
+    CompletionStatus,
+    DifficultyLevel,
+    ExperienceLevel,
+    FocusArea,
+    PracticeSession,
+    Pose,
+    Sequence,
+    SequencePose,
+    User,
+    YogaStyle,
+)
+from scripts.import_poses_auto import CATEGORY_MAP
+
+POSES_FILE = Path(__file__).resolve().parents[2] / "content" / "poses.yaml"
+
+USER_EMAIL_PATTERN = "loadtest-{}@example.com"
+SEQUENCE_NAME_PREFIX = "Load Test Flow"
+# Every generated user has this password, so scenarios can log in as any of them
+PASSWORD = "LoadTest-Passw0rd!"
+
+
+@dataclass
+class DatasetSize:
+    """How much data to generate."""
+
+    users: int = 1000
+    sessions: int = 100_000
+    sequences: int = 50
+    poses_per_sequence: tuple[int, int] = (8, 50)
+
+
+def catalog_rows() -> list[dict]:
+    """Pose rows from content/poses.yaml, mapped like the seed scripts."""
+    with open(POSES_FILE, encoding="utf-8") as poses_file:
+        poses = yaml.safe_load(poses_file)["poses"]
+    rows = []
+    for pose in poses:
+        category = CATEGORY_MAP.get(pose.get("category", "").lower())
+        if category is None:
+            continue
+        rows.append({
+            "name_english": pose["name_english"],
+            "name_sanskrit": pose.get("name_sanskrit"),
+            "category": category,
+            "difficulty_level": DifficultyLevel[pose.get("difficulty_level", "beginner").upper()],
+            "description": pose.get("description", ""),
+            "instructions": pose.get("instructions", []),
+            "benefits": "\n".join(f"• {benefit}" for benefit in pose.get("benefits", [])) or None,
+            "contraindications": "\n".join(f"• {item}" for item in pose.get("contraindications", [])) or None,
+            "target_areas": pose.get("target_areas", []),
+            "image_urls": ["https://placeholder.com/300"],
+        })
+    return rows
+
+
+def session_rows(size: DatasetSize, user_ids: list[int], sequence_ids: list[int], rng: random.Random) -> Iterator[dict]:
+    """Practice history spread over the last year, most of it completed."""
+    now = datetime.utcnow()
+    statuses = [CompletionStatus.COMPLETED, CompletionStatus.PARTIAL, CompletionStatus.ABANDONED]
+    for _ in range(size.sessions):
+        started_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        status = rng.choices(statuses, weights=(80, 15, 5))[0]
+        duration = rng.randrange(300, 3600)
+        yield {
+            "user_id": rng.choice(user_ids),
+            "sequence_id": rng.choice(sequence_ids) if rng.random() < 0.9 else None,
+            "started_at": started_at,
+            "completed_at": started_at + timedelta(seconds=duration) if status != CompletionStatus.ABANDONED else None,
+            "duration_seconds": duration,
+            "completion_status": status,
+        }
+
+
+async def reset_dataset(engine: AsyncEngine) -> None:
+    """Delete previously generated users, sequences and their sessions."""
+    async with engine.begin() as connection:
+        users = select(User.user_id).where(User.email.like(USER_EMAIL_PATTERN.format("%")))
+        sequences = select(Sequence.sequence_id).where(Sequence.name.like(f"{SEQUENCE_NAME_PREFIX}%"))
+        await connection.execute(delete(PracticeSession).where(PracticeSession.user_id.in_(users)))
+        await connection.execute(delete(PracticeSession).where(PracticeSession.sequence_id.in_(sequences)))
+        await connection.execute(delete(SequencePose).where(SequencePose.sequence_id.in_(sequences)))
+        await connection.execute(delete(Sequence).where(Sequence.sequence_id.in_(sequences)))
+        await connection.execute(delete(User).where(User.user_id.in_(users)))
+
+
+async def dataset_exists(engine: AsyncEngine) -> bool:
+    """Whether generated users are already present."""
+    async with engine.connect() as connection:
+        return bool(await connection.scalar(
+            select(func.count()).select_from(User).where(User.email == USER_EMAIL_PATTERN.format(0))
+        ))
+
+
+async def generate_dataset(engine: AsyncEngine, size: DatasetSize, seed: int = 42) -> dict:
+    """
+    Load the dataset.
+
+    Args:
+        engine: Target database
+        size: Row counts
+        seed: Random seed
+
+    Returns:
+        dict: Row counts per table
+    """
+    rng = random.Random(seed)
+    async with engine.begin() as connection:
+        pose_ids = list((await connection.execute(select(Pose.pose_id))).scalars())
+        if not pose_ids:
+            pose_ids = await bulk_insert_returning_keys(connection, Pose, catalog_rows())
+
+        # bcrypt is deliberately slow; hash once and share it
+        password_hash = hash_password(PASSWORD)
+        user_ids = await bulk_insert_returning_keys(connection, User, (
+            {
+                "email": USER_EMAIL_PATTERN.format(number),
+                "password_hash": password_hash,
+                "name": f"Load Test User {number}",
+                "experience_level": rng.choice(list(ExperienceLevel)),
+                "email_verified": True,
+            }
+            for number in range(size.users)
+        ))
+
+        sequence_rows = [
+            {
+                "name": f"{SEQUENCE_NAME_PREFIX} {number}",
+                "description": "Generated for load testing.",
+                "difficulty_level": rng.choice([level.value for level in DifficultyLevel]),
+                "duration_minutes": rng.choice([10, 15, 20, 30, 45, 60]),
+                "focus_area": rng.choice(list(FocusArea)),
+                "style": rng.choice(list(YogaStyle)),
+                "is_preset": True,
+            }
+            for number in range(size.sequences)
+        ]
+        sequence_ids = await bulk_insert_returning_keys(connection, Sequence, sequence_rows)
+        sequence_pose_count = await bulk_insert(connection, SequencePose, (
+            {
+                "sequence_id": sequence_id,
+                "pose_id": rng.choice(pose_ids),
+                "position_order": position,
+                "duration_seconds": rng.choice([30, 45, 60, 90]),
+            }
+            for sequence_id in sequence_ids
+            for position in range(1, rng.randint(*size.poses_per_sequence) + 1)
+        ))
+
+        session_count = await bulk_insert(connection, PracticeSession, session_rows(size, user_ids, sequence_ids, rng))
+
+    return {
+        "poses": len(pose_ids),
+        "users": len(user_ids),
+        "sequences": len(sequence_ids),
+        "sequence_poses": sequence_pose_count,
+        "practice_sessions": session_count,
+    }
+
+
+async def prepare_dataset(database_url: str, size: DatasetSize, reset: bool = False, seed: int = 42) -> None:
+    """Generate the dataset unless it exists (or regenerate it with reset)."""
+    engine = create_async_engine(database_url, **engine_options(database_url))
+    try:
+        # Alembic manages real schemas; this only matters for a fresh SQLite file
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        if reset:
+            await reset_dataset(engine)
+        elif await dataset_exists(engine):
+            print("Load test data already present (use --reset to regenerate)")
+            return
+        started = time.perf_counter()
+        counts = await generate_dataset(engine, size, seed)
+        print(f"Generated {counts} in {time.perf_counter() - started:.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Dataset size options, shared with the load test CLI."""
+    defaults = DatasetSize()
+    parser.add_argument("--users", type=int, default=defaults.users, help="Users to generate")
+    parser.add_argument("--sessions", type=int, default=defaults.sessions, help="Practice sessions to generate")
+    parser.add_argument("--sequences", type=int, default=defaults.sequences, help="Sequences to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+
+def dataset_size(args: argparse.Namespace) -> DatasetSize:
+    return DatasetSize(users=args.users, sessions=args.sessions, sequences=args.sequences)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate load test data")
+    add_dataset_arguments(parser)
+    parser.add_argument("--database-url", default=settings.database_url, help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--reset", action="store_true", help="Replace previously generated data")
+    args = parser.parse_args()
+
+    asyncio.run(prepare_dataset(args.database_url, dataset_size(args), reset=args.reset, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()
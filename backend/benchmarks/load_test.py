@@ -0,0 +1,269 @@
+"""
+Load test harness: throughput and latency of the API hot paths.
+
+Runs each scenario (see scenarios.py) for a fixed number of operations
+with concurrent workers, then reports requests per second and p50/p95/p99
+latency. Results are written as JSON and compared with a stored baseline,
+flagging scenarios whose p95 or throughput got worse than the tolerance.
+
+By default the app runs in-process (httpx ASGITransport, lifespan
+included, rate limiting off) against a generated SQLite database, which
+needs no setup. With --url it drives a running server instead; that server
+must use the same database and have rate limits raised (see README.md).
+
+Usage:
+    python -m benchmarks.load_test [--scenarios poses_list,login] [--requests 500] [--concurrency 10]
+    python -m benchmarks.load_test --save-baseline
+    python -m benchmarks.load_test --url http://localhost:8000 --database-url postgresql+asyncpg://... --generate
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+BENCHMARKS_DIRECTORY = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARKS_DIRECTORY / "baselines" / "load_test.json"
+RESULTS_DIRECTORY = BENCHMARKS_DIRECTORY / "results"
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./loadtest.db"
+
+# Metrics compared with the baseline, and whether higher is better
+COMPARED_METRICS = {"p95_ms": False, "rps": True}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Linear-interpolated percentile of sorted values."""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """
+    Summary statistics for one scenario.
+
+    Args:
+        latencies: Milliseconds per successful operation
+        errors: Failed operations
+        elapsed: Wall-clock seconds for the measured run
+
+    Returns:
+        dict: Counts, throughput and latency percentiles
+    """
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+async def run_scenario(client, context, scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    """
+    Run one scenario `requests` times across `concurrency` workers.
+
+    Args:
+        client: httpx client for the target
+        context: Scenario context
+        scenario: Scenario coroutine function
+        requests: Measured operations
+        concurrency: Concurrent workers
+        warmup: Unmeasured operations first (caches, connection pools)
+
+    Returns:
+        dict: Summary statistics
+    """
+    for _ in range(warmup):
+        try:
+            await scenario(client, context)
+        except Exception:
+            pass
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await scenario(client, context)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> tuple[list[str], bool]:
+    """
+    Compare scenario results with a baseline.
+
+    Args:
+        results: Current scenario summaries
+        baseline: Baseline scenario summaries
+        tolerance: Allowed relative change before flagging (0.15 = 15%)
+
+    Returns:
+        tuple[list[str], bool]: Report lines, and whether anything regressed
+    """
+    lines = []
+    regressed = False
+    for name, summary in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            lines.append(f"  {name:<24} (not in baseline)")
+            continue
+        changes = []
+        flags = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if not previous.get(metric):
+                continue
+            change = summary[metric] / previous[metric] - 1
+            changes.append(f"{metric} {change:+.1%}")
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                flags.append(metric)
+        if summary["errors"] > previous.get("errors", 0):
+            flags.append("errors")
+        regressed = regressed or bool(flags)
+        status = f"REGRESSION ({', '.join(flags)})" if flags else "ok"
+        lines.append(f"  {name:<24} {'  '.join(changes):<32} {status}")
+    return lines, regressed
+
+
+def print_results(results: dict) -> None:
+    print(f"\n  {'scenario':<24} {'requests':>8} {'errors':>6} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, summary in results.items():
+        print(
+            f"  {name:<24} {summary['requests']:>8} {summary['errors']:>6} {summary['rps']:>9.1f} "
+            f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f}"
+        )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIRECTORY
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Prepare data and the target, then run the selected scenarios."""
+    import httpx
+
+    from benchmarks.dataset import dataset_size, prepare_dataset
+    from benchmarks.scenarios import SCENARIOS, prepare_context
+
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (available: {', '.join(SCENARIOS)})")
+
+    if args.generate or not args.url:
+        await prepare_dataset(args.database_url, dataset_size(args), reset=args.reset, seed=args.seed)
+
+    async with AsyncExitStack() as stack:
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=60)
+        else:
+            from app.core.rate_limit import limiter
+            from app.main import app
+
+            limiter.enabled = False
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=60)
+        await stack.enter_async_context(client)
+
+        context = await prepare_context(client, args.users, logged_in=args.concurrency)
+        results = {}
+        for name in names:
+            print(f"Running {name}...", flush=True)
+            results[name] = await run_scenario(
+                client, context, SCENARIOS[name], args.requests, args.concurrency, args.warmup
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the API hot paths")
+    parser.add_argument("--url", help="Base URL of a running server (default: run the app in-process)")
+    parser.add_argument("--database-url", default=os.environ.get("LOADTEST_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="Database with the load test data (in-process: the app uses it too)")
+    parser.add_argument("--scenarios", help="Comma-separated scenarios to run (default: all)")
+    parser.add_argument("--requests", type=int, default=500, help="Measured operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent workers")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured operations per scenario")
+    parser.add_argument("--generate", action="store_true", help="Generate data before a --url run")
+    parser.add_argument("--reset", action="store_true", help="Regenerate data even if present")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Relative change flagged as a regression")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/load-<time>.json)")
+    known, _ = parser.parse_known_args()
+    if not known.url:
+        # The in-process app reads DATABASE_URL when its settings load, so
+        # it must be set before anything imports app modules
+        os.environ["DATABASE_URL"] = known.database_url
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from benchmarks.dataset import add_dataset_arguments
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_results(results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "target": args.url or "in-process",
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "dataset": {"users": args.users, "sessions": args.sessions, "sequences": args.sequences},
+        },
+        "scenarios": results,
+    }
+    output = args.output or RESULTS_DIRECTORY / f"load-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    regressed = False
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text())
+        print(f"\nCompared with baseline from {baseline['meta']['timestamp']} ({baseline['meta'].get('revision')}):")
+        lines, regressed = compare(results, baseline["scenarios"], args.tolerance)
+        print("\n".join(lines))
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
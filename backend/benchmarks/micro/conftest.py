@@ -0,0 +1,68 @@
+"""
+Fixtures for the microbenchmarks: in-memory models built from the real
+pose catalog, so nothing here needs a database.
+"""
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+from app.models import Pose, Sequence, SequencePose
+from benchmarks.dataset import catalog_rows
+
+SEQUENCE_LENGTH = 50
+TIMESTAMP = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="session")
+def catalog_poses() -> list[Pose]:
+    """Every pose in content/poses.yaml as a loaded-looking Pose."""
+    return [
+        Pose(pose_id=pose_id, created_at=TIMESTAMP, updated_at=TIMESTAMP, **row)
+        for pose_id, row in enumerate(catalog_rows(), start=1)
+    ]
+
+
+@pytest.fixture(scope="session")
+def long_sequence(catalog_poses) -> Sequence:
+    """A sequence of SEQUENCE_LENGTH poses with its relationships populated."""
+    sequence = Sequence(
+        sequence_id=1,
+        name="Benchmark Flow",
+        description="A long flow for benchmarking.",
+        difficulty_level="intermediate",
+        duration_minutes=60,
+        focus_area="flexibility",
+        style="vinyasa",
+        is_preset=True,
+        created_by=None,
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+    )
+    sequence.sequence_poses = [
+        SequencePose(
+            sequence_pose_id=position,
+            pose_id=pose.pose_id,
+            pose=pose,
+            position_order=position,
+            duration_seconds=60,
+        )
+        for position, pose in enumerate(
+            (catalog_poses[index % len(catalog_poses)] for index in range(SEQUENCE_LENGTH)), start=1
+        )
+    ]
+    return sequence
+
+
+def make_request(headers: dict[str, str], client_host: str = "10.0.0.1") -> Request:
+    """A bare Starlette request, as rate limit key functions receive it."""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/v1/poses",
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": (client_host, 54321),
+        "server": ("testserver", 80),
+        "scheme": "http",
+    })
@@ -0,0 +1,55 @@
+"""
+Per-request auth and rate limiting primitives.
+"""
+import pytest
+
+from app.core.rate_limit import get_identifier, get_ip_address
+from app.core.security import create_access_token, decode_token, hash_password, verify_password
+from benchmarks.dataset import PASSWORD
+from benchmarks.micro.conftest import make_request
+
+TOKEN_DATA = {"sub": "loadtest-0@example.com", "user_id": 1}
+
+
+@pytest.fixture(scope="module")
+def password_hash() -> str:
+    return hash_password(PASSWORD)
+
+
+class TestTokens:
+
+    def test_create_access_token(self, benchmark):
+        token = benchmark(create_access_token, TOKEN_DATA)
+        assert token.count(".") == 2
+
+    def test_decode_token(self, benchmark):
+        token = create_access_token(TOKEN_DATA)
+        payload = benchmark(decode_token, token)
+        assert payload["sub"] == TOKEN_DATA["sub"]
+
+
+class TestPasswords:
+
+    def test_verify_password(self, benchmark, password_hash):
+        # bcrypt is deliberately slow (BCRYPT_ROUNDS); a few rounds are enough
+        assert benchmark.pedantic(verify_password, args=(PASSWORD, password_hash), rounds=5, warmup_rounds=1)
+
+
+class TestRateLimitKeys:
+
+    def test_get_identifier_authenticated(self, benchmark):
+        request = make_request({})
+        request.state.user_id = 42
+        assert benchmark(get_identifier, request) == "user:42"
+
+    def test_get_identifier_forwarded(self, benchmark):
+        request = make_request({"X-Forwarded-For": "203.0.113.7, 10.0.0.2, 10.0.0.3"})
+        assert benchmark(get_identifier, request) == "203.0.113.7"
+
+    def test_get_identifier_client(self, benchmark):
+        request = make_request({"Authorization": "Bearer token", "Accept": "application/json"})
+        assert benchmark(get_identifier, request) == "10.0.0.1"
+
+    def test_get_ip_address_forwarded(self, benchmark):
+        request = make_request({"X-Forwarded-For": "203.0.113.7, 10.0.0.2"})
+        assert benchmark(get_ip_address, request) == "203.0.113.7"
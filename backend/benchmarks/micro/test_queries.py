@@ -0,0 +1,78 @@
+"""
+List endpoint query construction: filters, count query and pagination,
+plus the cache key SQLAlchemy computes for every execution.
+"""
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import SADeprecationWarning
+
+from app.api.v1.endpoints.poses import build_pose_list_query
+from app.api.v1.endpoints.sequences import build_sequence_list_query
+from app.models import DifficultyLevel, FocusArea, Pose, PoseCategory, Sequence, YogaStyle
+
+# target_area's JSON contains() warns on every build; the endpoint does the same
+pytestmark = pytest.mark.filterwarnings("ignore", category=SADeprecationWarning)
+
+POSE_FILTERS = {
+    "unfiltered": {},
+    "all_filters": {
+        "search": "warrior",
+        "category": PoseCategory.STANDING,
+        "difficulty": DifficultyLevel.BEGINNER,
+        "target_area": "legs",
+    },
+}
+
+SEQUENCE_FILTERS = {
+    "unfiltered": {},
+    "all_filters": {
+        "search": "flow",
+        "difficulty": DifficultyLevel.INTERMEDIATE,
+        "focus_area": FocusArea.STRENGTH,
+        "style": YogaStyle.VINYASA,
+        "min_duration": 15,
+        "max_duration": 45,
+        "preset_only": True,
+    },
+}
+
+
+def pose_list_statements(filters: dict):
+    """The statements list_poses executes for one page."""
+    query = build_pose_list_query(**filters)
+    count_query = select(func.count()).select_from(query.subquery())
+    return count_query, query.offset(20).limit(20).order_by(Pose.name_english)
+
+
+def sequence_list_statements(filters: dict):
+    """The statements list_sequences executes for one page."""
+    query = build_sequence_list_query(**filters)
+    count_query = select(func.count()).select_from(query.subquery())
+    return count_query, query.offset(20).limit(20).order_by(Sequence.name)
+
+
+def with_cache_keys(build, filters: dict):
+    statements = build(filters)
+    return [statement._generate_cache_key() for statement in statements]
+
+
+class TestPoseListQuery:
+
+    @pytest.mark.parametrize("filters", POSE_FILTERS.values(), ids=POSE_FILTERS.keys())
+    def test_pose_list(self, benchmark, filters):
+        assert len(benchmark(pose_list_statements, filters)) == 2
+
+    @pytest.mark.parametrize("filters", POSE_FILTERS.values(), ids=POSE_FILTERS.keys())
+    def test_pose_list_cache_key(self, benchmark, filters):
+        assert all(benchmark(with_cache_keys, pose_list_statements, filters))
+
+
+class TestSequenceListQuery:
+
+    @pytest.mark.parametrize("filters", SEQUENCE_FILTERS.values(), ids=SEQUENCE_FILTERS.keys())
+    def test_sequence_list(self, benchmark, filters):
+        assert len(benchmark(sequence_list_statements, filters)) == 2
+
+    @pytest.mark.parametrize("filters", SEQUENCE_FILTERS.values(), ids=SEQUENCE_FILTERS.keys())
+    def test_sequence_list_cache_key(self, benchmark, filters):
+        assert all(benchmark(with_cache_keys, sequence_list_statements, filters))
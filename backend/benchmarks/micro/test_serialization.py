@@ -0,0 +1,32 @@
+"""
+Response serialization: Pydantic validation from ORM objects.
+"""
+from app.api.v1.endpoints.sequences import build_sequence_response
+from app.schemas.pose import PoseResponse
+from benchmarks.micro.conftest import SEQUENCE_LENGTH
+
+
+class TestPoseSerialization:
+
+    def test_pose_catalog(self, benchmark, catalog_poses):
+        responses = benchmark(lambda: [PoseResponse.model_validate(pose) for pose in catalog_poses])
+        assert len(responses) == len(catalog_poses)
+
+    def test_pose_catalog_json(self, benchmark, catalog_poses):
+        """Validation plus JSON encoding, as a response is sent."""
+        def serialize():
+            return [PoseResponse.model_validate(pose).model_dump_json() for pose in catalog_poses]
+
+        assert len(benchmark(serialize)) == len(catalog_poses)
+
+
+class TestSequenceSerialization:
+
+    def test_sequence_detail(self, benchmark, long_sequence):
+        response = benchmark(build_sequence_response, long_sequence)
+        assert len(response.poses) == SEQUENCE_LENGTH
+        assert response.total_duration_seconds == SEQUENCE_LENGTH * 60
+
+    def test_sequence_detail_json(self, benchmark, long_sequence):
+        body = benchmark(lambda: build_sequence_response(long_sequence).model_dump_json())
+        assert body.startswith("{")
@@ -0,0 +1,138 @@
+"""
+Load test scenarios for the API hot paths.
+
+Each scenario is one user-level operation: usually a single request, but
+session start/complete is timed as the pair a client makes. Scenarios only
+talk HTTP, so they run the same against the in-process app and a server.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.dataset import PASSWORD, SEQUENCE_NAME_PREFIX, USER_EMAIL_PATTERN
+
+API = "/api/v1"
+
+SEARCH_TERMS = ["warrior", "pose", "dog", "twist", "tree", "bridge", "asana", "lotus"]
+
+
+class ScenarioError(Exception):
+    """A request in a scenario returned an unexpected status."""
+    pass
+
+
+@dataclass
+class ScenarioContext:
+    """
+    State shared by scenario runs: generated IDs and logged-in users.
+
+    Args:
+        users: Number of generated users
+        sequence_ids: Generated sequence IDs
+        tokens: Access tokens of pre-logged-in users
+    """
+
+    users: int
+    sequence_ids: list[int] = field(default_factory=list)
+    tokens: list[str] = field(default_factory=list)
+    rng: random.Random = field(default_factory=lambda: random.Random(7))
+
+    def auth_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+def check(response: httpx.Response, expected: int = 200) -> httpx.Response:
+    if response.status_code != expected:
+        raise ScenarioError(f"{response.request.method} {response.request.url.path}: {response.status_code}")
+    return response
+
+
+async def login(client: httpx.AsyncClient, number: int) -> str:
+    """Log in a generated user and return the access token."""
+    response = check(await client.post(
+        f"{API}/auth/login", json={"email": USER_EMAIL_PATTERN.format(number), "password": PASSWORD}
+    ))
+    return response.json()["tokens"]["access_token"]
+
+
+async def prepare_context(client: httpx.AsyncClient, users: int, logged_in: int) -> ScenarioContext:
+    """
+    Look up generated sequences and log in users for the authenticated scenarios.
+
+    Args:
+        client: Client for the target
+        users: Number of generated users
+        logged_in: How many distinct users to log in
+
+    Returns:
+        ScenarioContext: Context for scenario runs
+    """
+    context = ScenarioContext(users=users)
+    page = 1
+    while True:
+        response = check(await client.get(
+            f"{API}/sequences", params={"search": SEQUENCE_NAME_PREFIX, "page": page, "page_size": 100}
+        ))
+        body = response.json()
+        context.sequence_ids.extend(sequence["sequence_id"] for sequence in body["sequences"])
+        if page >= body["total_pages"]:
+            break
+        page += 1
+    if not context.sequence_ids:
+        raise ScenarioError("No generated sequences found; run with --generate first")
+
+    context.tokens = [await login(client, number) for number in range(min(users, logged_in))]
+    return context
+
+
+async def list_poses(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    check(await client.get(f"{API}/poses", params={"page": context.rng.randint(1, 4), "page_size": 20}))
+
+
+async def search_poses(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    check(await client.get(f"{API}/poses", params={"search": context.rng.choice(SEARCH_TERMS)}))
+
+
+async def sequence_detail(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    check(await client.get(f"{API}/sequences/{context.rng.choice(context.sequence_ids)}"))
+
+
+async def login_user(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    await login(client, context.rng.randrange(context.users))
+
+
+async def history_page(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    check(await client.get(
+        f"{API}/history", params={"page": context.rng.randint(1, 10), "page_size": 20}, headers=context.auth_headers()
+    ))
+
+
+async def practice_stats(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    check(await client.get(f"{API}/stats", headers=context.auth_headers()))
+
+
+async def session_start_complete(client: httpx.AsyncClient, context: ScenarioContext) -> None:
+    headers = context.auth_headers()
+    started = check(await client.post(
+        f"{API}/sessions/start", json={"sequence_id": context.rng.choice(context.sequence_ids)}, headers=headers
+    ), expected=201)
+    check(await client.post(
+        f"{API}/sessions/complete",
+        json={"session_id": started.json()["session_id"], "duration_seconds": 900},
+        headers=headers,
+    ))
+
+
+Scenario = Callable[[httpx.AsyncClient, ScenarioContext], Awaitable[None]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "poses_list": list_poses,
+    "poses_search": search_poses,
+    "sequence_detail": sequence_detail,
+    "login": login_user,
+    "history_page": history_page,
+    "stats": practice_stats,
+    "session_start_complete": session_start_complete,
+}
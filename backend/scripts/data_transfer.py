@@ -0,0 +1,231 @@
+"""
+Shared helpers for export_data.py and import_data.py.
+
+Exports are directories of one NDJSON file per table plus manifest.json.
+Each line is a JSON array of column values, in the column order listed in
+the manifest. Tables come from reflecting the database rather than from
+the models, so columns added by migrations but not mapped on a model
+(e.g. the pose instruction fields) are carried over too.
+"""
+import base64
+import json
+import sqlite3
+import time
+from datetime import date, datetime, time as time_of_day
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import MetaData, Table, types
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+# Batches committed by an import in progress, kept in the target database
+# (see import_data.py); dropped when the import completes
+PROGRESS_TABLE = "data_import_progress"
+
+# Schema and import bookkeeping, not data
+SKIP_TABLES = {"alembic_version", PROGRESS_TABLE}
+
+
+async def reflect_tables(connection: AsyncConnection) -> list[Table]:
+    """
+    Reflect every data table, parents before children.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        list[Table]: Tables in foreign key dependency order
+    """
+    metadata = MetaData()
+    await connection.run_sync(metadata.reflect)
+    return [table for table in metadata.sorted_tables if table.name not in SKIP_TABLES]
+
+
+def remapped_primary_key(table: Table) -> Optional[str]:
+    """
+    Name of the table's primary key if it is a single integer column.
+
+    Such keys are regenerated by the target database on import, and
+    foreign keys pointing at them are remapped.
+    """
+    columns = list(table.primary_key.columns)
+    if len(columns) == 1 and isinstance(columns[0].type, types.Integer):
+        return columns[0].name
+    return None
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a column value to a JSON-compatible value."""
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, memoryview)):
+        return base64.b64encode(bytes(value)).decode()
+    if hasattr(value, "name") and hasattr(value, "value"):
+        # Python enum from a model-typed column: stored by name
+        return value.name
+    return value
+
+
+def decode_value(value: Any, column_type: types.TypeEngine) -> Any:
+    """Convert a JSON value back to what the target column expects."""
+    if value is None:
+        return None
+    if isinstance(column_type, types.DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column_type, types.Date):
+        return date.fromisoformat(value)
+    if isinstance(column_type, types.Time):
+        return time_of_day.fromisoformat(value)
+    if isinstance(column_type, types.Numeric) and not isinstance(column_type, types.Float):
+        return Decimal(value)
+    if isinstance(column_type, types.LargeBinary):
+        return base64.b64decode(value)
+    if isinstance(column_type, types.Boolean) and isinstance(value, int):
+        # SQLite sources without a declared boolean type export 0/1
+        return bool(value)
+    return value
+
+
+def encode_row(row: Iterable[Any]) -> str:
+    """Serialize a row as one NDJSON line."""
+    return json.dumps([encode_value(value) for value in row], separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+class TransferState:
+    """
+    On-disk state of an import: old -> new primary keys and progress.
+
+    Kept in SQLite so the key map doesn't have to fit in memory and
+    survives a crash, which is what makes --resume possible. Each key
+    mapping records the batch it came from (the table's lines_done after
+    it), so a batch whose target transaction never committed can be undone.
+
+    Args:
+        path: State database file
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS id_map (
+                table_name TEXT NOT NULL,
+                old_id INTEGER NOT NULL,
+                new_id INTEGER NOT NULL,
+                lines_done INTEGER NOT NULL,
+                PRIMARY KEY (table_name, old_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS progress (
+                table_name TEXT PRIMARY KEY,
+                lines_done INTEGER NOT NULL,
+                finished INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+
+    def lookup(self, table_name: str, old_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Map old primary keys of a table to the new ones.
+
+        Args:
+            table_name: Referenced table
+            old_ids: Keys from the export
+
+        Returns:
+            dict[int, int]: Old -> new, for the keys that were imported
+        """
+        old_ids = list(set(old_ids))
+        mapping = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(old_ids), 900):
+            chunk = old_ids[start:start + 900]
+            placeholders = ",".join("?" * len(chunk))
+            mapping.update(self.connection.execute(
+                f"SELECT old_id, new_id FROM id_map WHERE table_name = ? AND old_id IN ({placeholders})",
+                [table_name, *chunk],
+            ).fetchall())
+        return mapping
+
+    def record_batch(self, table_name: str, pairs: list[tuple[int, int]], lines_done: int) -> None:
+        """
+        Record a batch: its key mappings and the lines consumed.
+
+        Called before the batch's target transaction commits; see rewind.
+
+        Args:
+            table_name: Imported table
+            pairs: (old_id, new_id) pairs
+            lines_done: Lines of the table's file imported so far
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO id_map VALUES (?, ?, ?, ?)",
+                [(table_name, old_id, new_id, lines_done) for old_id, new_id in pairs],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO progress (table_name, lines_done, finished) VALUES (?, ?, 0)",
+                (table_name, lines_done),
+            )
+
+    def rewind(self, table_name: str, lines_done: int) -> None:
+        """
+        Forget batches recorded past a point, whose transactions rolled back.
+
+        Args:
+            table_name: Imported table
+            lines_done: Lines of the table's file the target has committed
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM id_map WHERE table_name = ? AND lines_done > ?", (table_name, lines_done)
+            )
+            self.connection.execute(
+                "UPDATE progress SET lines_done = ?, finished = 0 WHERE table_name = ?", (lines_done, table_name)
+            )
+
+    def finish_table(self, table_name: str) -> None:
+        """Mark a table as fully imported."""
+        with self.connection:
+            self.connection.execute("UPDATE progress SET finished = 1 WHERE table_name = ?", (table_name,))
+
+    def progress(self, table_name: str) -> tuple[int, bool]:
+        """
+        Get a table's import progress.
+
+        Returns:
+            tuple[int, bool]: (lines imported, whether the table is finished)
+        """
+        row = self.connection.execute(
+            "SELECT lines_done, finished FROM progress WHERE table_name = ?", (table_name,)
+        ).fetchone()
+        return (row[0], bool(row[1])) if row else (0, False)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class Throughput:
+    """Row and byte counters with a rate summary."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.bytes = 0
+
+    def add(self, rows: int, size: int) -> None:
+        self.rows += rows
+        self.bytes += size
+
+    def summary(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        return (
+            f"{self.rows:,} rows in {elapsed:.1f}s "
+            f"({self.rows / elapsed:,.0f} rows/s, {self.bytes / 1024 / 1024 / elapsed:.1f}MB/s)"
+        )
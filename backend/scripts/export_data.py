@@ -1,209 +1,114 @@
 #!/usr/bin/env python3
 """
-Export data from SQLite database to JSON for migration to PostgreSQL.
-This script exports all user data, poses, sequences, and practice history.
+Export every table to a directory of NDJSON files, for moving data between
+databases (e.g. SQLite to PostgreSQL) with import_data.py.
+
+Rows are streamed with a server-side cursor and written as they arrive, so
+memory use stays flat however large the tables are. The directory holds
+one <table>.ndjson per table and a manifest.json listing the tables in
+dependency order with their columns and row counts.
 
 Usage:
-    python scripts/export_data.py [output_file]
+    python scripts/export_data.py <output_dir> [--database-url URL] [--batch-size N]
 
 Example:
-    python scripts/export_data.py data_export.json
+    python scripts/export_data.py exports/2024-06-01
+    python scripts/export_data.py exports/prod --database-url postgresql+asyncpg://...
 """
+import argparse
 import asyncio
 import json
+import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import get_session
-from app.models.user import User
-from app.models.pose import Pose
-from app.models.sequence import Sequence
-from app.models.session import PracticeSession
-from app.models.practice_history import PracticeHistory
-
-
-def serialize_datetime(obj: Any) -> Any:
-    """Convert datetime objects to ISO format strings."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
-
-
-async def export_users(session: AsyncSession) -> list[dict]:
-    """Export all users."""
-    print("Exporting users...")
-    result = await session.execute(select(User))
-    users = result.scalars().all()
-
-    user_data = []
-    for user in users:
-        user_data.append({
-            "id": user.id,
-            "email": user.email,
-            "username": user.username,
-            "hashed_password": user.hashed_password,
-            "is_active": user.is_active,
-            "is_superuser": user.is_superuser,
-            "created_at": serialize_datetime(user.created_at),
-            "updated_at": serialize_datetime(user.updated_at),
-        })
-
-    print(f"  Exported {len(user_data)} users")
-    return user_data
-
-
-async def export_poses(session: AsyncSession) -> list[dict]:
-    """Export all poses."""
-    print("Exporting poses...")
-    result = await session.execute(select(Pose))
-    poses = result.scalars().all()
-
-    pose_data = []
-    for pose in poses:
-        pose_data.append({
-            "id": pose.id,
-            "name": pose.name,
-            "sanskrit_name": pose.sanskrit_name,
-            "description": pose.description,
-            "difficulty": pose.difficulty,
-            "category": pose.category,
-            "benefits": pose.benefits,
-            "instructions": pose.instructions,
-            "contraindications": pose.contraindications,
-            "duration_seconds": pose.duration_seconds,
-            "image_url": pose.image_url,
-            "video_url": pose.video_url,
-            "is_active": pose.is_active,
-            "created_at": serialize_datetime(pose.created_at),
-            "updated_at": serialize_datetime(pose.updated_at),
-        })
-
-    print(f"  Exported {len(pose_data)} poses")
-    return pose_data
-
-
-async def export_sequences(session: AsyncSession) -> list[dict]:
-    """Export all sequences with their poses."""
-    print("Exporting sequences...")
-    result = await session.execute(select(Sequence))
-    sequences = result.scalars().all()
-
-    sequence_data = []
-    for sequence in sequences:
-        sequence_data.append({
-            "id": sequence.id,
-            "name": sequence.name,
-            "description": sequence.description,
-            "difficulty": sequence.difficulty,
-            "duration_minutes": sequence.duration_minutes,
-            "category": sequence.category,
-            "is_active": sequence.is_active,
-            "created_by_id": sequence.created_by_id,
-            "created_at": serialize_datetime(sequence.created_at),
-            "updated_at": serialize_datetime(sequence.updated_at),
-            "pose_ids": [pose.id for pose in sequence.poses] if sequence.poses else [],
-        })
-
-    print(f"  Exported {len(sequence_data)} sequences")
-    return sequence_data
-
-
-async def export_practice_sessions(session: AsyncSession) -> list[dict]:
-    """Export all practice sessions."""
-    print("Exporting practice sessions...")
-    result = await session.execute(select(PracticeSession))
-    sessions = result.scalars().all()
-
-    session_data = []
-    for practice_session in sessions:
-        session_data.append({
-            "id": practice_session.id,
-            "user_id": practice_session.user_id,
-            "sequence_id": practice_session.sequence_id,
-            "started_at": serialize_datetime(practice_session.started_at),
-            "ended_at": serialize_datetime(practice_session.ended_at),
-            "status": practice_session.status,
-            "duration_minutes": practice_session.duration_minutes,
-            "notes": practice_session.notes,
-            "created_at": serialize_datetime(practice_session.created_at),
-        })
-
-    print(f"  Exported {len(session_data)} practice sessions")
-    return session_data
-
-
-async def export_practice_history(session: AsyncSession) -> list[dict]:
-    """Export all practice history records."""
-    print("Exporting practice history...")
-    result = await session.execute(select(PracticeHistory))
-    history_records = result.scalars().all()
-
-    history_data = []
-    for record in history_records:
-        history_data.append({
-            "id": record.id,
-            "user_id": record.user_id,
-            "session_id": record.session_id,
-            "pose_id": record.pose_id,
-            "completed": record.completed,
-            "duration_seconds": record.duration_seconds,
-            "notes": record.notes,
-            "created_at": serialize_datetime(record.created_at),
-        })
-
-    print(f"  Exported {len(history_data)} practice history records")
-    return history_data
-
-
-async def export_all_data(output_file: str = "data_export.json"):
-    """Export all data from database to JSON file."""
-    print(f"\n=== Starting Data Export ===\n")
-    print(f"Output file: {output_file}\n")
-
-    async for session in get_session():
-        try:
-            # Export all data
-            export_data = {
-                "export_timestamp": datetime.utcnow().isoformat(),
-                "users": await export_users(session),
-                "poses": await export_poses(session),
-                "sequences": await export_sequences(session),
-                "practice_sessions": await export_practice_sessions(session),
-                "practice_history": await export_practice_history(session),
-            }
-
-            # Write to file
-            print(f"\nWriting data to {output_file}...")
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-
-            # Summary
-            print(f"\n=== Export Complete ===\n")
-            print(f"Total users: {len(export_data['users'])}")
-            print(f"Total poses: {len(export_data['poses'])}")
-            print(f"Total sequences: {len(export_data['sequences'])}")
-            print(f"Total practice sessions: {len(export_data['practice_sessions'])}")
-            print(f"Total practice history: {len(export_data['practice_history'])}")
-            print(f"\nExport saved to: {output_file}")
-
-            break  # Only need one session
-
-        except Exception as error:
-            print(f"\nError during export: {error}")
-            raise
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+from app.core.database import engine_options
+from scripts.data_transfer import FORMAT_VERSION, MANIFEST_NAME, Throughput, encode_row, reflect_tables
+
+
+async def export_table(connection: AsyncConnection, table: Table, output_dir: Path, batch_size: int) -> dict:
+    """
+    Stream one table to <output_dir>/<table>.ndjson.
+
+    Args:
+        connection: Source connection
+        table: Reflected table
+        output_dir: Export directory
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        dict: Manifest entry for the table
+    """
+    path = output_dir / f"{table.name}.ndjson"
+    temp_path = path.with_name(f".{path.name}.tmp")
+    throughput = Throughput()
+
+    # Ordered by primary key so the file (and a resumed import) is deterministic
+    statement = select(table).order_by(*table.primary_key.columns).execution_options(yield_per=batch_size)
+    result = await connection.stream(statement)
+    with open(temp_path, "w", encoding="utf-8") as output:
+        async for rows in result.partitions():
+            lines = "".join(encode_row(row) for row in rows)
+            output.write(lines)
+            throughput.add(len(rows), len(lines))
+    os.replace(temp_path, path)
+
+    print(f"  {table.name}: {throughput.summary()}")
+    return {
+        "name": table.name,
+        "file": path.name,
+        "columns": [column.name for column in table.columns],
+        "primary_key": [column.name for column in table.primary_key.columns],
+        "rows": throughput.rows,
+    }
+
+
+async def export_all_data(output_dir: Path, database_url: str, batch_size: int) -> None:
+    """Export every table and write the manifest."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    source = create_async_engine(database_url, **engine_options(database_url))
+    print(f"\n=== Exporting {source.url.render_as_string(hide_password=True)} to {output_dir} ===\n")
+
+    total = Throughput()
+    try:
+        async with source.connect() as connection:
+            tables = await reflect_tables(connection)
+            entries = []
+            for table in tables:
+                entry = await export_table(connection, table, output_dir, batch_size)
+                total.add(entry["rows"], (output_dir / entry["file"]).stat().st_size)
+                entries.append(entry)
+    finally:
+        await source.dispose()
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "source_dialect": source.dialect.name,
+        "tables": entries,
+    }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    print(f"\n=== Export Complete: {len(entries)} tables, {total.summary()} ===\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export all tables as NDJSON")
+    parser.add_argument("output_dir", type=Path, help="Directory to write the export to")
+    parser.add_argument("--database-url", default=settings.database_url, help="Source database (default: DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows fetched per round trip")
+    args = parser.parse_args()
+
+    asyncio.run(export_all_data(args.output_dir, args.database_url, args.batch_size))
 
 
 if __name__ == "__main__":
-    # Get output file from command line or use default
-    output_file = sys.argv[1] if len(sys.argv) > 1 else "data_export.json"
-
-    # Run export
-    asyncio.run(export_all_data(output_file))
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Generate TTS narration for yoga poses and sequences.
+
+Replaces generate_pose_audio.py, generate_sequence_audio.py,
+generate_poses_elevenlabs.py and regenerate_missing_audio.py with one
+engine (app.services.tts): a bounded pool of concurrent workers sharing a
+pooled HTTP client, a per-provider rate limiter, retries with exponential
+backoff, and a journal so an interrupted run can be resumed.
+
+Clips are cached by a hash of their script and voice settings (see
+content/audio/.audio-cache.json): a clip is only regenerated when its
+script, voice, speed, pitch, emotion or provider changed.
+
+Sequence tracks are not synthesized whole: each sentence of the intro,
+pose transitions and outro is a clip under content/audio/clips, shared
+between sequences, and tracks are assembled from them with silence for
+pauses and pose holds (app.services.tts.assembly). Hold times are spoken
+from number/unit phrase clips, so changing them needs no new synthesis.
+
+Voices:
+- calm:   Replicate MiniMax Speech-02-HD, Calm_Woman  -> <slug>-calm.mp3
+- wise:   Replicate MiniMax Speech-02-HD, Wise_Woman  -> <slug>-wise.mp3
+- voice3: ElevenLabs voice3                           -> <slug>.mp3
+
+API keys are read from REPLICATE_API_TOKEN / ELEVENLABS_API_KEY.
+
+Usage:
+    python scripts/generate_audio.py                       # poses + sequences, calm and wise
+    python scripts/generate_audio.py --voices voice3 --kind poses --missing
+    python scripts/generate_audio.py --resume              # continue an interrupted run
+    python scripts/generate_audio.py --provider fake       # dry run into a temp dir, no API calls
+    python scripts/generate_audio.py --output-dir /tmp/audio  # write somewhere other than content/audio
+    python scripts/generate_audio.py --adopt               # record existing clips as current
+    python scripts/generate_audio.py --gc                  # delete clips no pose/sequence uses
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.services.tts import AudioCache, JobJournal, TTSEngine, TTSJob, get_provider
+from app.services.tts.assembly import MissingClipsError, SequenceAssembler
+from app.services.tts.mp3 import MP3FormatError
+from app.services.tts.scripts import format_pose_script, slugify
+from app.services.tts.voices import VOICES, Voice
+
+# Output directory
+AUDIO_DIR = Path(__file__).parent.parent.parent / "content" / "audio"
+JOURNAL_NAME = ".tts-journal.jsonl"
+
+
+async def get_all_poses() -> list[dict]:
+    """Fetch all poses with instructions from database."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text("""
+                SELECT
+                    pose_id,
+                    name_english,
+                    name_sanskrit,
+                    entry_instructions,
+                    exit_instructions,
+                    holding_cues,
+                    breathing_pattern,
+                    has_side_variation
+                FROM poses
+                WHERE entry_instructions IS NOT NULL
+                ORDER BY pose_id
+            """)
+        )
+        return [dict(row._mapping) for row in result]
+
+
+async def get_all_sequences() -> list[dict]:
+    """Fetch all sequences with their poses in order (two queries, not one per sequence)."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text("""
+                SELECT
+                    sequence_id,
+                    name,
+                    description,
+                    difficulty_level,
+                    duration_minutes,
+                    focus_area
+                FROM sequences
+                ORDER BY sequence_id
+            """)
+        )
+        sequences = {row.sequence_id: {**row._mapping, "poses": []} for row in result}
+
+        result = await session.execute(
+            text("""
+                SELECT
+                    sp.sequence_id,
+                    p.name_english,
+                    p.name_sanskrit,
+                    sp.duration_seconds AS duration
+                FROM sequence_poses sp
+                JOIN poses p ON sp.pose_id = p.pose_id
+                ORDER BY sp.sequence_id, sp.position_order
+            """)
+        )
+        for row in result:
+            if row.sequence_id in sequences:
+                sequences[row.sequence_id]["poses"].append(dict(row._mapping))
+
+        return list(sequences.values())
+
+
+def build_pose_jobs(poses: list[dict], voices: list[Voice], audio_dir: Path = AUDIO_DIR) -> list[TTSJob]:
+    """
+    Build one pose narration job per (pose, voice).
+
+    Args:
+        poses: Poses with instructions
+        voices: Narration voices
+        audio_dir: Audio output directory
+
+    Returns:
+        list[TTSJob]: Jobs keyed 'poses/<filename>'
+    """
+    jobs = []
+    for voice in voices:
+        for pose in poses:
+            filename = voice.filename(slugify(pose["name_english"]))
+            jobs.append(TTSJob(
+                key=f"poses/{filename}",
+                request=voice.request(format_pose_script(pose)),
+                output_path=audio_dir / "poses" / filename,
+            ))
+    return jobs
+
+
+def live_paths(poses: list[dict], sequences: list[dict], assembler: SequenceAssembler) -> list[Path]:
+    """Every file any voice produces for the current content, for --gc."""
+    paths = [job.output_path for job in build_pose_jobs(poses, list(VOICES.values()), assembler.root)]
+    for voice in VOICES.values():
+        paths += [job.output_path for job in assembler.clip_jobs(sequences, voice)]
+        paths += [assembler.output_path(sequence, voice) for sequence in sequences]
+    return paths
+
+
+async def main() -> bool:
+    """Main execution."""
+    parser = argparse.ArgumentParser(description="Generate TTS narration for poses and sequences")
+    parser.add_argument("--voices", default="calm,wise", help=f"Comma-separated voices ({', '.join(VOICES)})")
+    parser.add_argument("--kind", choices=["poses", "sequences", "all"], default="all")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Only these poses/sequences (English names)")
+    parser.add_argument("--missing", action="store_true", help="Only generate clips whose file doesn't exist")
+    parser.add_argument("--provider", help="Override the voices' provider (e.g. 'fake' for a dry run)")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="Audio directory to write (default: content/audio; a new temp directory with --provider fake)",
+    )
+    parser.add_argument("--concurrency", type=int, help="Concurrent requests (default: provider's default)")
+    parser.add_argument("--resume", action="store_true", help="Skip jobs completed by a previous run")
+    parser.add_argument("--journal", type=Path, help=f"Job journal for --resume (default: <output dir>/{JOURNAL_NAME})")
+    parser.add_argument("--force", action="store_true", help="Regenerate clips even if their script is unchanged")
+    parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help="Record existing pose clips as generated from the current scripts, without calling any API",
+    )
+    parser.add_argument("--gc", action="store_true", help="Delete cached clips no pose or sequence produces")
+    args = parser.parse_args()
+
+    voice_names = [name.strip() for name in args.voices.split(",") if name.strip()]
+    unknown = [name for name in voice_names if name not in VOICES]
+    if unknown:
+        parser.error(f"Unknown voices: {', '.join(unknown)}")
+
+    print("=" * 80)
+    print("YogaFlow Audio Generation")
+    print("=" * 80)
+
+    # Fake clips are not audio: never let them replace real ones
+    audio_dir = args.output_dir
+    if audio_dir is None:
+        audio_dir = Path(tempfile.mkdtemp(prefix="yogaflow-audio-")) if args.provider == "fake" else AUDIO_DIR
+    journal = args.journal or audio_dir / JOURNAL_NAME
+    print(f"Output: {audio_dir}")
+
+    cache = AudioCache(audio_dir)
+    assembler = SequenceAssembler(audio_dir, cache=cache)
+
+    print("Fetching poses and sequences from database...")
+    all_poses = await get_all_poses()
+    all_sequences = await get_all_sequences()
+
+    if args.gc:
+        removed = cache.collect_garbage(live_paths(all_poses, all_sequences, assembler))
+        print(f"🗑️  Removed {len(removed)} orphaned clips")
+        for name in removed:
+            print(f"   {name}")
+        return True
+
+    poses = all_poses if args.kind in ("poses", "all") else []
+    sequences = all_sequences if args.kind in ("sequences", "all") else []
+    if args.only:
+        wanted = {name.lower() for name in args.only}
+        poses = [pose for pose in poses if pose["name_english"].lower() in wanted]
+        sequences = [sequence for sequence in sequences if sequence["name"].lower() in wanted]
+
+    # Group voices by provider so each provider gets its own rate limiter and pool
+    by_provider: dict[str, list[Voice]] = {}
+    for voice_name in voice_names:
+        voice = VOICES[voice_name]
+        by_provider.setdefault(args.provider or voice.provider, []).append(voice)
+
+    all_ok = True
+    for provider_name, voices in by_provider.items():
+        # Pose narration, plus the sentence clips sequence tracks are assembled from
+        jobs = build_pose_jobs(poses, voices, audio_dir)
+        for voice in voices:
+            jobs += assembler.clip_jobs(sequences, voice)
+        if args.missing:
+            jobs = [job for job in jobs if not job.output_path.exists()]
+
+        if args.adopt:
+            adopted = 0
+            for job in jobs:
+                if job.key.startswith("poses/") and job.output_path.exists():
+                    cache.record(job.output_path, job.request.fingerprint(provider_name))
+                    adopted += 1
+            print(f"\n📌 {provider_name}: recorded {adopted} existing clips as current")
+            continue
+
+        provider = get_provider(provider_name)
+        total = len(jobs)
+        print(f"\n📢 {provider_name}: {total} clips ({', '.join(voice.name for voice in voices)})")
+
+        def report_progress(job, status, report):
+            finished = report.generated + len(report.failed)
+            mark = "✓" if status == "done" else "✗"
+            print(f"  [{finished}/{total - report.skipped}] {mark} {job.key}")
+
+        journal_path = journal.with_name(f"{journal.stem}-{provider_name}{journal.suffix}")
+        engine = TTSEngine(
+            provider,
+            concurrency=args.concurrency,
+            journal=JobJournal(journal_path),
+            cache=cache,
+            force=args.force,
+            on_progress=report_progress,
+        )
+        report = await engine.run(jobs, resume=args.resume)
+
+        print(f"\n   Generated: {report.generated} | Unchanged: {report.skipped} | Retries: {report.retries}")
+        print(f"   Time: {report.elapsed:.1f}s | {report.throughput:.2f} clips/s")
+        if report.failed:
+            all_ok = False
+            print(f"   ❌ Failed ({len(report.failed)}): {', '.join(report.failed)}")
+            print("   Rerun with --resume to retry only the failed clips")
+
+        if provider_name == "fake":
+            if sequences:
+                print("   Sequence assembly skipped: fake clips are not MP3 audio")
+            continue
+
+        # Sequence tracks are assembled locally from the clips: no TTS calls
+        assembled = 0
+        for voice in voices:
+            for sequence in sequences:
+                try:
+                    assembled += assembler.assemble(sequence, voice, force=args.force)
+                except (MissingClipsError, MP3FormatError) as error:
+                    all_ok = False
+                    print(f"   ❌ {sequence['name']} ({voice.name}): {error}")
+        if sequences:
+            print(f"   Assembled {assembled} sequence tracks ({len(sequences) * len(voices) - assembled} unchanged)")
+
+    print()
+    print("=" * 80)
+    print(f"{'✅' if all_ok else '⚠️ '} Audio generation complete!")
+    print(f"   Location: {audio_dir}")
+    print("=" * 80)
+    return all_ok
+
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)
@@ -1,344 +1,292 @@
 #!/usr/bin/env python3
 """
-Import data from JSON export into PostgreSQL database.
-This script imports all user data, poses, sequences, and practice history.
+Import an export_data.py directory into a database.
+
+Tables are loaded parent-first in batches, each bulk loaded (COPY on
+PostgreSQL, see app.core.bulk_load) and committed on its own. Integer primary keys are assigned by
+the target database; the old -> new mapping is kept in an on-disk SQLite
+file in the export directory and used to rewrite foreign keys, so memory
+use doesn't grow with the size of the data. Rows whose unique key (e.g.
+users.email) already exists in the target are mapped to the existing row
+instead of being inserted again.
+
+The same file records how far each table got. After a failure, rerun with
+--resume to continue from the last committed batch. Each batch also
+records its table's progress in a bookkeeping table in the target
+(data_import_progress), in the same transaction as its rows, and writes the
+state file just before committing. If the import stops between the two,
+resume sees the target behind the state file and forgets that batch's key
+mappings, so no batch is inserted twice. The bookkeeping table is dropped
+when the import completes.
 
 Usage:
-    python scripts/import_data.py <input_file>
+    python scripts/import_data.py <input_dir> [--database-url URL] [--batch-size N] [--resume]
 
 Example:
-    python scripts/import_data.py data_export.json
+    python scripts/import_data.py exports/2024-06-01
+    python scripts/import_data.py exports/prod --database-url postgresql+asyncpg://... --resume
 """
+import argparse
 import asyncio
 import json
 import sys
-from datetime import datetime
+from itertools import islice
 from pathlib import Path
+from typing import Iterator
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.database import get_session
-from app.models.user import User
-from app.models.pose import Pose
-from app.models.sequence import Sequence
-from app.models.session import PracticeSession
-from app.models.practice_history import PracticeHistory
-
-
-def parse_datetime(date_str: str | None) -> datetime | None:
-    """Parse ISO format datetime string."""
-    if not date_str:
-        return None
-    return datetime.fromisoformat(date_str)
-
-
-async def import_users(session: AsyncSession, users_data: list[dict]) -> dict[int, int]:
-    """Import users and return mapping of old ID to new ID."""
-    print(f"Importing {len(users_data)} users...")
-    id_mapping = {}
-
-    for user_data in users_data:
-        old_id = user_data["id"]
-
-        # Check if user already exists
-        result = await session.execute(
-            select(User).where(User.email == user_data["email"])
-        )
-        existing_user = result.scalar_one_or_none()
-
-        if existing_user:
-            print(f"  User {user_data['email']} already exists, skipping")
-            id_mapping[old_id] = existing_user.id
-            continue
-
-        # Create new user
-        user = User(
-            email=user_data["email"],
-            username=user_data["username"],
-            hashed_password=user_data["hashed_password"],
-            is_active=user_data["is_active"],
-            is_superuser=user_data.get("is_superuser", False),
-        )
-
-        # Set timestamps if available
-        if user_data.get("created_at"):
-            user.created_at = parse_datetime(user_data["created_at"])
-        if user_data.get("updated_at"):
-            user.updated_at = parse_datetime(user_data["updated_at"])
-
-        session.add(user)
-        await session.flush()  # Get ID without committing
-
-        id_mapping[old_id] = user.id
-
-    await session.commit()
-    print(f"  Imported {len(id_mapping)} users")
-    return id_mapping
-
-
-async def import_poses(session: AsyncSession, poses_data: list[dict]) -> dict[int, int]:
-    """Import poses and return mapping of old ID to new ID."""
-    print(f"Importing {len(poses_data)} poses...")
-    id_mapping = {}
-
-    for pose_data in poses_data:
-        old_id = pose_data["id"]
-
-        # Check if pose already exists
-        result = await session.execute(
-            select(Pose).where(Pose.name == pose_data["name"])
-        )
-        existing_pose = result.scalar_one_or_none()
-
-        if existing_pose:
-            print(f"  Pose {pose_data['name']} already exists, skipping")
-            id_mapping[old_id] = existing_pose.id
-            continue
-
-        # Create new pose
-        pose = Pose(
-            name=pose_data["name"],
-            sanskrit_name=pose_data.get("sanskrit_name"),
-            description=pose_data.get("description"),
-            difficulty=pose_data.get("difficulty"),
-            category=pose_data.get("category"),
-            benefits=pose_data.get("benefits"),
-            instructions=pose_data.get("instructions"),
-            contraindications=pose_data.get("contraindications"),
-            duration_seconds=pose_data.get("duration_seconds"),
-            image_url=pose_data.get("image_url"),
-            video_url=pose_data.get("video_url"),
-            is_active=pose_data.get("is_active", True),
-        )
-
-        # Set timestamps if available
-        if pose_data.get("created_at"):
-            pose.created_at = parse_datetime(pose_data["created_at"])
-        if pose_data.get("updated_at"):
-            pose.updated_at = parse_datetime(pose_data["updated_at"])
-
-        session.add(pose)
-        await session.flush()
-
-        id_mapping[old_id] = pose.id
-
-    await session.commit()
-    print(f"  Imported {len(id_mapping)} poses")
-    return id_mapping
-
-
-async def import_sequences(
-    session: AsyncSession,
-    sequences_data: list[dict],
-    user_id_mapping: dict[int, int],
-    pose_id_mapping: dict[int, int],
-) -> dict[int, int]:
-    """Import sequences and return mapping of old ID to new ID."""
-    print(f"Importing {len(sequences_data)} sequences...")
-    id_mapping = {}
-
-    for sequence_data in sequences_data:
-        old_id = sequence_data["id"]
-
-        # Map user ID
-        old_user_id = sequence_data.get("created_by_id")
-        new_user_id = user_id_mapping.get(old_user_id) if old_user_id else None
-
-        # Create new sequence
-        sequence = Sequence(
-            name=sequence_data["name"],
-            description=sequence_data.get("description"),
-            difficulty=sequence_data.get("difficulty"),
-            duration_minutes=sequence_data.get("duration_minutes"),
-            category=sequence_data.get("category"),
-            is_active=sequence_data.get("is_active", True),
-            created_by_id=new_user_id,
-        )
-
-        # Set timestamps if available
-        if sequence_data.get("created_at"):
-            sequence.created_at = parse_datetime(sequence_data["created_at"])
-        if sequence_data.get("updated_at"):
-            sequence.updated_at = parse_datetime(sequence_data["updated_at"])
-
-        session.add(sequence)
-        await session.flush()
-
-        # Add poses to sequence
-        if sequence_data.get("pose_ids"):
-            for old_pose_id in sequence_data["pose_ids"]:
-                new_pose_id = pose_id_mapping.get(old_pose_id)
-                if new_pose_id:
-                    result = await session.execute(
-                        select(Pose).where(Pose.id == new_pose_id)
-                    )
-                    pose = result.scalar_one_or_none()
-                    if pose:
-                        sequence.poses.append(pose)
-
-        id_mapping[old_id] = sequence.id
-
-    await session.commit()
-    print(f"  Imported {len(id_mapping)} sequences")
-    return id_mapping
-
-
-async def import_practice_sessions(
-    session: AsyncSession,
-    sessions_data: list[dict],
-    user_id_mapping: dict[int, int],
-    sequence_id_mapping: dict[int, int],
-) -> dict[int, int]:
-    """Import practice sessions and return mapping of old ID to new ID."""
-    print(f"Importing {len(sessions_data)} practice sessions...")
-    id_mapping = {}
-
-    for session_data in sessions_data:
-        old_id = session_data["id"]
-
-        # Map user and sequence IDs
-        old_user_id = session_data["user_id"]
-        old_sequence_id = session_data.get("sequence_id")
-
-        new_user_id = user_id_mapping.get(old_user_id)
-        new_sequence_id = sequence_id_mapping.get(old_sequence_id) if old_sequence_id else None
-
-        if not new_user_id:
-            print(f"  Skipping session {old_id}: user not found")
-            continue
-
-        # Create new practice session
-        practice_session = PracticeSession(
-            user_id=new_user_id,
-            sequence_id=new_sequence_id,
-            started_at=parse_datetime(session_data.get("started_at")),
-            ended_at=parse_datetime(session_data.get("ended_at")),
-            status=session_data.get("status", "completed"),
-            duration_minutes=session_data.get("duration_minutes"),
-            notes=session_data.get("notes"),
-        )
-
-        # Set timestamps if available
-        if session_data.get("created_at"):
-            practice_session.created_at = parse_datetime(session_data["created_at"])
-
-        session.add(practice_session)
-        await session.flush()
-
-        id_mapping[old_id] = practice_session.id
-
-    await session.commit()
-    print(f"  Imported {len(id_mapping)} practice sessions")
-    return id_mapping
-
-
-async def import_practice_history(
-    session: AsyncSession,
-    history_data: list[dict],
-    user_id_mapping: dict[int, int],
-    session_id_mapping: dict[int, int],
-    pose_id_mapping: dict[int, int],
-):
-    """Import practice history records."""
-    print(f"Importing {len(history_data)} practice history records...")
-    imported = 0
-
-    for record_data in history_data:
-        # Map IDs
-        old_user_id = record_data["user_id"]
-        old_session_id = record_data.get("session_id")
-        old_pose_id = record_data.get("pose_id")
-
-        new_user_id = user_id_mapping.get(old_user_id)
-        new_session_id = session_id_mapping.get(old_session_id) if old_session_id else None
-        new_pose_id = pose_id_mapping.get(old_pose_id) if old_pose_id else None
-
-        if not new_user_id:
-            continue
-
-        # Create new practice history record
-        history = PracticeHistory(
-            user_id=new_user_id,
-            session_id=new_session_id,
-            pose_id=new_pose_id,
-            completed=record_data.get("completed", True),
-            duration_seconds=record_data.get("duration_seconds"),
-            notes=record_data.get("notes"),
-        )
-
-        # Set timestamps if available
-        if record_data.get("created_at"):
-            history.created_at = parse_datetime(record_data["created_at"])
-
-        session.add(history)
-        imported += 1
-
-    await session.commit()
-    print(f"  Imported {imported} practice history records")
-
-
-async def import_all_data(input_file: str):
-    """Import all data from JSON file into database."""
-    print(f"\n=== Starting Data Import ===\n")
-    print(f"Input file: {input_file}\n")
-
-    # Read data file
-    print("Reading data file...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Export timestamp: {data['export_timestamp']}\n")
-
-    async for db_session in get_session():
-        try:
-            # Import in order (to maintain relationships)
-            user_mapping = await import_users(db_session, data["users"])
-            pose_mapping = await import_poses(db_session, data["poses"])
-            sequence_mapping = await import_sequences(
-                db_session, data["sequences"], user_mapping, pose_mapping
+from sqlalchemy import Column, Integer, MetaData, String, Table, UniqueConstraint, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from app.core.bulk_load import bulk_insert, bulk_insert_returning_keys
+from app.core.config import settings
+from app.core.database import engine_options
+from scripts.data_transfer import (
+    FORMAT_VERSION,
+    MANIFEST_NAME,
+    PROGRESS_TABLE,
+    Throughput,
+    TransferState,
+    decode_value,
+    reflect_tables,
+    remapped_primary_key,
+)
+
+STATE_FILE = ".import-state.sqlite"
+
+# Lines of each table's file committed to the target
+progress_table = Table(
+    PROGRESS_TABLE,
+    MetaData(),
+    Column("table_name", String(255), primary_key=True),
+    Column("lines_done", Integer, nullable=False),
+)
+
+
+def read_batches(path: Path, skip: int, batch_size: int) -> Iterator[tuple[list[list], int]]:
+    """
+    Read an NDJSON file in batches.
+
+    Args:
+        path: Table file
+        skip: Lines already imported
+        batch_size: Lines per batch
+
+    Yields:
+        tuple[list[list], int]: Rows of the batch and their size in bytes
+    """
+    with open(path, encoding="utf-8") as ndjson:
+        for _ in islice(ndjson, skip):
+            pass
+        while True:
+            lines = list(islice(ndjson, batch_size))
+            if not lines:
+                return
+            yield [json.loads(line) for line in lines], sum(len(line) for line in lines)
+
+
+class TableImporter:
+    """
+    Load one table's rows, remapping keys through the transfer state.
+
+    Args:
+        target: Target database engine
+        table: Reflected target table
+        columns: Column names in the export file, in line order
+        state: Key map and progress
+        imported_tables: Tables in this import (only their keys are remapped)
+    """
+
+    def __init__(self, target: AsyncEngine, table: Table, columns: list[str], state: TransferState, imported_tables: set[str]):
+        self.target = target
+        self.table = table
+        self.state = state
+        self.primary_key = remapped_primary_key(table)
+        # (position in line, column) for every exported column the target has
+        self.columns = [(index, table.c[name]) for index, name in enumerate(columns) if name in table.c]
+        self.dropped = [name for name in columns if name not in table.c]
+
+        self.foreign_keys = {}
+        for column in table.columns:
+            for foreign_key in column.foreign_keys:
+                parent = foreign_key.column.table
+                if parent.name in imported_tables and remapped_primary_key(parent) == foreign_key.column.name:
+                    self.foreign_keys[column.name] = parent.name
+
+        # Single-column unique keys identify rows that already exist in the target
+        self.unique_columns = []
+        if self.primary_key:
+            unique_sets = [
+                [column.name for column in constraint.columns]
+                for constraint in table.constraints if isinstance(constraint, UniqueConstraint)
+            ] + [[column.name for column in index.columns] for index in table.indexes if index.unique]
+            self.unique_columns = sorted({names[0] for names in unique_sets if len(names) == 1})
+
+        self.skipped = 0
+        self.existing = 0
+
+    def decode(self, line: list) -> dict:
+        return {column.name: decode_value(line[index], column.type) for index, column in self.columns}
+
+    def remap(self, rows: list[dict]) -> list[dict]:
+        """Rewrite foreign keys to new IDs; drop rows whose required parent is missing."""
+        for name, parent in self.foreign_keys.items():
+            mapping = self.state.lookup(parent, (row[name] for row in rows if row[name] is not None))
+            nullable = self.table.c[name].nullable
+            kept = []
+            for row in rows:
+                old_id = row[name]
+                if old_id is not None:
+                    if old_id in mapping:
+                        row[name] = mapping[old_id]
+                    elif nullable:
+                        row[name] = None
+                    else:
+                        self.skipped += 1
+                        continue
+                kept.append(row)
+            rows = kept
+        return rows
+
+    async def import_batch(self, lines: list[list], lines_done: int) -> int:
+        """
+        Insert one batch in its own transaction, recording its progress.
+
+        Args:
+            lines: Decoded NDJSON lines
+            lines_done: Lines of the table's file imported, counting this batch
+
+        Returns:
+            int: Rows inserted
+        """
+        rows = self.remap([self.decode(line) for line in lines])
+        async with self.target.begin() as connection:
+            if self.primary_key is None:
+                inserted, pairs = await bulk_insert(connection, self.table, rows), []
+            else:
+                inserted, pairs = await self._insert_mapped(connection, rows)
+
+            await connection.execute(delete(progress_table).where(progress_table.c.table_name == self.table.name))
+            await connection.execute(insert(progress_table).values(table_name=self.table.name, lines_done=lines_done))
+            # Written before the commit: if the commit doesn't happen, resume
+            # finds the target behind the state file and rewinds it
+            self.state.record_batch(self.table.name, pairs, lines_done)
+        return inserted
+
+    async def _insert_mapped(self, connection: AsyncConnection, rows: list[dict]) -> tuple[int, list[tuple[int, int]]]:
+        """Insert rows with new primary keys; returns the count and (old, new) key pairs."""
+        pairs = []
+        for name in self.unique_columns:
+            values = [row[name] for row in rows if row[name] is not None]
+            if not values:
+                continue
+            result = await connection.execute(
+                select(self.table.c[name], self.table.c[self.primary_key]).where(self.table.c[name].in_(values))
             )
-            session_mapping = await import_practice_sessions(
-                db_session, data["practice_sessions"], user_mapping, sequence_mapping
-            )
-            await import_practice_history(
-                db_session,
-                data["practice_history"],
-                user_mapping,
-                session_mapping,
-                pose_mapping,
-            )
-
-            # Summary
-            print(f"\n=== Import Complete ===\n")
-            print(f"Users: {len(user_mapping)}")
-            print(f"Poses: {len(pose_mapping)}")
-            print(f"Sequences: {len(sequence_mapping)}")
-            print(f"Practice sessions: {len(session_mapping)}")
-            print(f"Practice history: {len(data['practice_history'])}")
-
-            break  # Only need one session
-
-        except Exception as error:
-            print(f"\nError during import: {error}")
-            await db_session.rollback()
-            raise
-
-
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/import_data.py <input_file>")
-        print("Example: python scripts/import_data.py data_export.json")
+            existing = dict(result.all())
+            if existing:
+                matched = [row for row in rows if row[name] in existing]
+                pairs.extend((row[self.primary_key], existing[row[name]]) for row in matched)
+                self.existing += len(matched)
+                rows = [row for row in rows if row[name] not in existing]
+
+        if rows:
+            old_ids = [row.pop(self.primary_key) for row in rows]
+            new_ids = await bulk_insert_returning_keys(connection, self.table, rows)
+            pairs.extend(zip(old_ids, new_ids))
+        return len(rows), pairs
+
+
+async def import_all_data(input_dir: Path, database_url: str, batch_size: int, resume: bool) -> None:
+    """Import every table listed in the manifest."""
+    manifest = json.loads((input_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported export format version {manifest.get('version')}")
+    entries = {entry["name"]: entry for entry in manifest["tables"]}
+
+    state_path = input_dir / STATE_FILE
+    if not resume:
+        for path in input_dir.glob(f"{STATE_FILE}*"):
+            path.unlink()
+    state = TransferState(state_path)
+
+    target = create_async_engine(database_url, **engine_options(database_url))
+    print(f"\n=== Importing {input_dir} into {target.url.render_as_string(hide_password=True)} ===\n")
+    print(f"Export timestamp: {manifest['exported_at']} ({manifest['source_dialect']})\n")
+
+    total = Throughput()
+    try:
+        async with target.begin() as connection:
+            if not resume:
+                await connection.run_sync(progress_table.drop, checkfirst=True)
+            await connection.run_sync(progress_table.create, checkfirst=True)
+            committed = dict((await connection.execute(select(progress_table))).all())
+            tables = [table for table in await reflect_tables(connection) if table.name in entries]
+        for name in sorted(set(entries) - {table.name for table in tables}):
+            print(f"  {name}: not in target database, skipped")
+
+        imported_tables = {table.name for table in tables}
+        for table in tables:
+            entry = entries[table.name]
+            lines_done, finished = state.progress(table.name)
+            if finished:
+                print(f"  {table.name}: already imported")
+                continue
+            committed_lines = committed.get(table.name, 0)
+            if lines_done > committed_lines:
+                # The last recorded batch's transaction never committed
+                state.rewind(table.name, committed_lines)
+                lines_done = committed_lines
+            elif lines_done < committed_lines:
+                raise RuntimeError(
+                    f"{table.name}: the target has {committed_lines} lines committed but {STATE_FILE} "
+                    f"records {lines_done}; start over without --resume"
+                )
+
+            importer = TableImporter(target, table, entry["columns"], state, imported_tables)
+            if importer.dropped:
+                print(f"  {table.name}: columns not in target, dropped: {', '.join(importer.dropped)}")
+
+            throughput = Throughput()
+            for lines, size in read_batches(input_dir / entry["file"], lines_done, batch_size):
+                lines_done += len(lines)
+                inserted = await importer.import_batch(lines, lines_done)
+                throughput.add(inserted, size)
+                total.add(inserted, size)
+            state.finish_table(table.name)
+
+            notes = [
+                f"{count} {label}" for count, label in
+                ((importer.existing, "already present"), (importer.skipped, "skipped for missing parents"))
+                if count
+            ]
+            print(f"  {table.name}: {throughput.summary()}" + (f"; {', '.join(notes)}" if notes else ""))
+
+        async with target.begin() as connection:
+            await connection.run_sync(progress_table.drop, checkfirst=True)
+    finally:
+        state.close()
+        await target.dispose()
+
+    print(f"\n=== Import Complete: {total.summary()} ===\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import an NDJSON export")
+    parser.add_argument("input_dir", type=Path, help="Directory written by export_data.py")
+    parser.add_argument("--database-url", default=settings.database_url, help="Target database (default: DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk load and commit")
+    parser.add_argument("--resume", action="store_true", help="Continue a failed import instead of starting over")
+    args = parser.parse_args()
+
+    if not (args.input_dir / MANIFEST_NAME).is_file():
+        print(f"Error: {args.input_dir / MANIFEST_NAME} not found")
         sys.exit(1)
 
-    input_file = sys.argv[1]
+    asyncio.run(import_all_data(args.input_dir, args.database_url, args.batch_size, args.resume))
 
-    if not Path(input_file).exists():
-        print(f"Error: File not found: {input_file}")
-        sys.exit(1)
 
-    # Run import
-    asyncio.run(import_all_data(input_file))
+if __name__ == "__main__":
+    main()
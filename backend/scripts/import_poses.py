@@ -14,6 +14,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
+from app.core.bulk_load import bulk_insert
 from app.core.database import AsyncSessionLocal, init_database
 from app.models.pose import Pose, PoseCategory, DifficultyLevel
 
@@ -69,6 +70,7 @@ async def import_poses():
                 return
 
         # Import poses
+        pose_rows = []
         imported_count = 0
         skipped_count = 0
 
@@ -99,8 +101,8 @@ async def import_poses():
                 contraindications = pose_data.get("contraindications", [])
                 contraindications_text = "\n".join(f"• {item}" for item in contraindications) if contraindications else None
 
-                # Create pose object
-                pose = Pose(
+                # Column values for the bulk load
+                pose = dict(
                     name_english=pose_data.get("name_english"),
                     name_sanskrit=pose_data.get("name_sanskrit"),
                     category=category,
@@ -113,17 +115,18 @@ async def import_poses():
                     image_urls=["https://placeholder.com/300"]  # Placeholder until we have real images
                 )
 
-                session.add(pose)
+                pose_rows.append(pose)
                 imported_count += 1
-                print(f"✓ Imported: {pose.name_english} ({pose.name_sanskrit})")
+                print(f"✓ Imported: {pose['name_english']} ({pose['name_sanskrit']})")
 
             except Exception as error:
                 print(f"✗ Error importing pose '{pose_data.get('name_english', 'Unknown')}': {error}")
                 skipped_count += 1
                 continue
 
-        # Commit all poses
+        # Load and commit all poses in one round trip
         try:
+            await bulk_insert(await session.connection(), Pose, pose_rows)
             await session.commit()
             print(f"\n{'='*60}")
             print(f"Import complete!")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Build pose image assets: optimized JPEGs and square thumbnails.
+
+Replaces optimize_pose_images.py and generate_thumbnails.py:
+- PNG pose images are converted to JPEG at the highest quality (95 down to
+  85) that fits under 200KB, found by binary search on in-memory encodes.
+  The PNG is deleted afterwards unless --keep-png is given.
+- Every pose image gets a 400x400 center-cropped JPEG thumbnail at 80%.
+
+Images are processed in parallel worker processes, each decoding its image
+once for both outputs. A manifest of input content hashes lets reruns skip
+images whose input, settings and outputs are unchanged.
+
+Usage:
+    python scripts/build_assets.py [--workers N] [--force] [--keep-png]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image
+
+# Directories
+IMAGES_DIR = Path(__file__).parent.parent / "content" / "images"
+POSES_DIR = IMAGES_DIR / "poses"
+THUMBNAILS_DIR = IMAGES_DIR / "thumbnails"
+MANIFEST_PATH = IMAGES_DIR / ".asset-manifest.json"
+
+# Pose image settings
+MAX_QUALITY = 95  # High quality for near-lossless
+MIN_QUALITY = 85  # Don't go below this quality
+MAX_SIZE = 200 * 1024  # 200KB in bytes
+
+# Thumbnail settings
+THUMBNAIL_SIZE = (400, 400)
+THUMBNAIL_QUALITY = 80
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+# Changing any of these invalidates every manifest entry
+SETTINGS = {
+    "max_quality": MAX_QUALITY,
+    "min_quality": MIN_QUALITY,
+    "max_size": MAX_SIZE,
+    "thumbnail_size": THUMBNAIL_SIZE,
+    "thumbnail_quality": THUMBNAIL_QUALITY,
+}
+
+
+def settings_fingerprint() -> str:
+    """Hash of the output settings, stored with each manifest entry."""
+    return hashlib.sha256(json.dumps(SETTINGS, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def to_rgb(img: Image.Image) -> Image.Image:
+    """Flatten transparency onto white and convert to RGB."""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def encode_jpeg(img: Image.Image, quality: int) -> bytes:
+    """Encode an image as optimized JPEG in memory."""
+    output = io.BytesIO()
+    img.save(output, 'JPEG', quality=quality, optimize=True)
+    return output.getvalue()
+
+
+def encode_under_size(img: Image.Image) -> tuple[bytes, int]:
+    """
+    Encode at the highest quality in [MIN_QUALITY, MAX_QUALITY] that fits MAX_SIZE.
+
+    JPEG size grows with quality, so the quality is binary searched; nothing
+    touches disk. Falls back to MIN_QUALITY if no quality fits.
+
+    Returns:
+        Tuple of (jpeg_bytes, quality)
+    """
+    best = encode_jpeg(img, MAX_QUALITY)
+    if len(best) <= MAX_SIZE:
+        return best, MAX_QUALITY
+
+    low, high = MIN_QUALITY, MAX_QUALITY - 1
+    best, best_quality = None, MIN_QUALITY
+    while low <= high:
+        quality = (low + high) // 2
+        data = encode_jpeg(img, quality)
+        if len(data) <= MAX_SIZE:
+            best, best_quality = data, quality
+            low = quality + 1
+        else:
+            high = quality - 1
+
+    if best is None:
+        return encode_jpeg(img, MIN_QUALITY), MIN_QUALITY
+    return best, best_quality
+
+
+def make_thumbnail(img: Image.Image) -> bytes:
+    """Center-crop to a square and resize to THUMBNAIL_SIZE."""
+    width, height = img.size
+    min_dim = min(width, height)
+    left = (width - min_dim) // 2
+    top = (height - min_dim) // 2
+    square = img.crop((left, top, left + min_dim, top + min_dim))
+    # reducing_gap downsamples cheaply before the final LANCZOS pass
+    thumbnail = square.resize(THUMBNAIL_SIZE, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return encode_jpeg(thumbnail, THUMBNAIL_QUALITY)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename so readers never see partial files."""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def build_image(input_path: str, keep_png: bool) -> dict:
+    """
+    Build the outputs for one pose image. Runs in a worker process.
+
+    Returns:
+        dict: Input and output byte counts, quality and output paths
+    """
+    source = Path(input_path)
+    raw = source.read_bytes()
+    # Decoded from memory, so there is no file handle to close
+    img = to_rgb(Image.open(io.BytesIO(raw)))
+
+    result = {"input_bytes": len(raw), "output_bytes": 0, "outputs": [], "quality": None}
+
+    if source.suffix.lower() == '.png':
+        data, quality = encode_under_size(img)
+        pose_path = source.with_suffix('.jpg')
+        write_atomic(pose_path, data)
+        result["quality"] = quality
+        result["output_bytes"] += len(data)
+        result["outputs"].append(str(pose_path))
+        result["pose_sha256"] = hashlib.sha256(data).hexdigest()
+
+    thumbnail = make_thumbnail(img)
+    thumbnail_path = THUMBNAILS_DIR / f"{source.stem}.jpg"
+    write_atomic(thumbnail_path, thumbnail)
+    result["output_bytes"] += len(thumbnail)
+    result["outputs"].append(str(thumbnail_path))
+
+    if source.suffix.lower() == '.png' and not keep_png:
+        source.unlink()
+
+    return result
+
+
+def load_manifest() -> dict:
+    """Load the manifest of previously built inputs."""
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def find_inputs() -> list[Path]:
+    """Pose images to build. A PNG takes precedence over a JPEG with the same stem."""
+    files = [f for f in POSES_DIR.iterdir() if f.is_file() and f.suffix.lower() in IMAGE_EXTENSIONS]
+    png_stems = {f.stem for f in files if f.suffix.lower() == '.png'}
+    return sorted(f for f in files if f.suffix.lower() == '.png' or f.stem not in png_stems)
+
+
+def is_current(entry: dict, digest: str, fingerprint: str) -> bool:
+    """Whether a manifest entry matches the input and its outputs still exist."""
+    return (
+        entry.get("sha256") == digest
+        and entry.get("settings") == fingerprint
+        and all(Path(IMAGES_DIR / output).exists() for output in entry.get("outputs", []))
+    )
+
+
+def main():
+    """Build assets for every changed pose image."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every image, ignoring the manifest")
+    parser.add_argument("--keep-png", action="store_true", help="Keep PNG sources after converting to JPEG")
+    args = parser.parse_args()
+
+    THUMBNAILS_DIR.mkdir(parents=True, exist_ok=True)
+    inputs = find_inputs()
+    if not inputs:
+        print(f"No images found in {POSES_DIR}")
+        sys.exit(1)
+
+    fingerprint = settings_fingerprint()
+    manifest = {} if args.force else load_manifest()
+    started = time.perf_counter()
+
+    pending = {}
+    for path in inputs:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if not is_current(manifest.get(path.name, {}), digest, fingerprint):
+            pending[path] = digest
+    skipped = len(inputs) - len(pending)
+
+    print(f"Found {len(inputs)} images in {POSES_DIR}")
+    print(f"Building {len(pending)} ({skipped} unchanged) with {args.workers} workers\n")
+
+    built = 0
+    failed = 0
+    input_bytes = 0
+    output_bytes = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(build_image, str(path), args.keep_png): path for path in pending}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                print(f"  ✗ {path.name}: {error}")
+                failed += 1
+                continue
+
+            outputs = [str(Path(output).relative_to(IMAGES_DIR)) for output in result["outputs"]]
+            if path.suffix.lower() == '.png':
+                # The JPEG is a pose image in its own right on the next run
+                pose_output, thumbnail_output = outputs
+                manifest[f"{path.stem}.jpg"] = {
+                    "sha256": result["pose_sha256"], "settings": fingerprint, "outputs": [thumbnail_output],
+                }
+                if args.keep_png:
+                    manifest[path.name] = {"sha256": pending[path], "settings": fingerprint, "outputs": outputs}
+            else:
+                manifest[path.name] = {"sha256": pending[path], "settings": fingerprint, "outputs": outputs}
+
+            built += 1
+            input_bytes += result["input_bytes"]
+            output_bytes += result["output_bytes"]
+            quality = f" (JPEG quality {result['quality']})" if result["quality"] else ""
+            print(f"  ✓ {path.name}{quality}")
+
+    # Drop entries for images that no longer exist
+    existing = {path.name for path in POSES_DIR.iterdir()}
+    manifest = {name: entry for name, entry in manifest.items() if name in existing}
+    write_atomic(MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode())
+
+    elapsed = max(time.perf_counter() - started, 1e-6)
+    megabytes_in = input_bytes / 1024 / 1024
+    print(f"\n{'='*60}")
+    print(f"Complete! Built {built}, skipped {skipped} unchanged")
+    if failed > 0:
+        print(f"Failed: {failed}")
+    print(f"Time: {elapsed:.2f}s | {built / elapsed:.1f} images/s | {megabytes_in / elapsed:.1f}MB/s read")
+    print(f"Read {megabytes_in:.1f}MB, wrote {output_bytes / 1024 / 1024:.1f}MB")
+    print(f"{'='*60}")
+
+    if failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()